@@ -0,0 +1,106 @@
+"""Compare the batched AnomalyEngine against the original per-column loop,
+and re-counting under many thresholds with and without the sorted index.
+
+Usage: python benchmarks/bench_anomaly_engine.py [rows] [columns]
+"""
+import os
+import re
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.column_profile import profile_columns
+from src.anomaly_engine import AnomalyEngine
+from src.config import VerificationConfig
+
+def legacy_count_anomalies(df, numeric_cols):
+    """The pre-engine per-column anomaly loop from QualityCheck, without the debug output."""
+    max_anomalies_per_col = int(len(df) * 0.01)
+    results = {}
+    for col in numeric_cols:
+        invalid_values = df[col].apply(lambda x: isinstance(x, str) and pd.isna(pd.to_numeric(x, errors="coerce")))
+        counts = {"non_numeric": min(int(invalid_values.sum()), max_anomalies_per_col),
+                  "negative": 0, "range": 0, "outlier": 0, "skipped": False}
+        results[col] = counts
+        price_col = pd.to_numeric(df[col], errors="coerce").dropna()
+        if len(price_col) == 0:
+            continue
+        unique_count = pd.Series(price_col).nunique()
+        std_val = price_col.std() if len(price_col) > 1 else 0
+        is_constant = np.allclose(price_col, price_col.iloc[0], rtol=1e-5, atol=1e-8)
+        if unique_count <= 2 or std_val < 1e-2 or is_constant or len(price_col) < 20 or (col in ['Work Pressure', 'Job Satisfaction'] and std_val < 0.1):
+            counts["skipped"] = True
+            continue
+        mean_val = price_col.mean()
+        is_pca_like = (abs(mean_val) < 0.1 and 0.5 < std_val < 2.0) or bool(re.match(r"V\d+", col))
+        is_non_negative = price_col.min() >= 0
+        transformed_col = np.log1p(price_col) if col.lower() == "amount" else price_col
+        q1, q3 = transformed_col.quantile([0.25, 0.75])
+        iqr = q3 - q1
+        iqr_multiplier = 20.0 if is_pca_like else 6.0 if col.lower() == "amount" else 4.0
+        lower_bound = q1 - iqr_multiplier * iqr
+        upper_bound = q3 + iqr_multiplier * iqr
+        counts["range"] = min(int(len(transformed_col[(transformed_col < lower_bound) | (transformed_col > upper_bound)])), max_anomalies_per_col)
+        if not (is_pca_like or is_non_negative):
+            counts["negative"] = min(int(len(price_col[price_col < 0])), max_anomalies_per_col)
+        median = transformed_col.median()
+        mad = np.median(np.abs(transformed_col - median))
+        if mad == 0:
+            mad = std_val or 1
+        z_scores = 0.6745 * (transformed_col - median) / mad
+        z_threshold = 50.0 if is_pca_like else 12.0 if col.lower() == "amount" else 8.0
+        counts["outlier"] = min(int(len(transformed_col[abs(z_scores) > z_threshold])), max_anomalies_per_col)
+    return results
+
+def make_wide_frame(rows, columns, seed=0):
+    rng = np.random.default_rng(seed)
+    data = {f"V{i}": rng.standard_t(3, rows) for i in range(1, columns - 1)}
+    data["Amount"] = np.round(rng.lognormal(3, 1.5, rows), 2)
+    data["Class"] = (rng.random(rows) < 0.002).astype(int)
+    return pd.DataFrame(data)
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    columns = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    df = make_wide_frame(rows, columns)
+
+    start = time.perf_counter()
+    legacy = legacy_count_anomalies(df, list(df.columns))
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    profiles = profile_columns(df)
+    profile_time = time.perf_counter() - start
+    start = time.perf_counter()
+    batched = AnomalyEngine().count_anomalies(profiles, list(df.columns), len(df))
+    engine_time = time.perf_counter() - start
+
+    assert batched == legacy, "batched counts differ from the per-column loop"
+    print(f"{rows} rows x {columns} numeric columns")
+    print(f"  per-column loop : {legacy_time:.3f}s")
+    print(f"  column profiles : {profile_time:.3f}s")
+    print(f"  anomaly engine  : {engine_time:.3f}s ({legacy_time / engine_time:.1f}x faster)")
+
+    # Re-counting under many thresholds: a scan per config vs binary searches in the sorted index
+    engine = AnomalyEngine()
+    configs = [VerificationConfig(iqr_multiplier_pca=k, mad_threshold_pca=4 * k) for k in np.linspace(2, 30, 50)]
+    start = time.perf_counter()
+    scanned = engine.prepare(profiles, list(df.columns), len(df))
+    prepare_time = time.perf_counter() - start
+    start = time.perf_counter()
+    scan_counts = [engine.count(scanned, config) for config in configs]
+    scan_time = time.perf_counter() - start
+    start = time.perf_counter()
+    index = engine.prepare(profiles, list(df.columns), len(df), index=True)
+    index_time = time.perf_counter() - start
+    start = time.perf_counter()
+    index_counts = [engine.count(index, config) for config in configs]
+    search_time = time.perf_counter() - start
+    assert index_counts == scan_counts, "indexed counts differ from scanned counts"
+    print(f"  {len(configs)} configs, scanned: prepare {prepare_time:.3f}s + {scan_time / len(configs) * 1000:.1f}ms per config")
+    print(f"  {len(configs)} configs, indexed: prepare {index_time:.3f}s + {search_time / len(configs) * 1000:.2f}ms per config")
+
+if __name__ == "__main__":
+    main()
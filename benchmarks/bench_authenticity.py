@@ -0,0 +1,51 @@
+"""Lookup latency of the persistent AuthenticityIndex at scale.
+
+Usage: python benchmarks/bench_authenticity.py [datasets]
+
+Registers N random fingerprints in a temporary on-disk index, then times
+lookups of registered (hit) and unseen (miss) fingerprints. Misses are
+mostly answered by the Bloom filter without touching SQLite.
+"""
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.authenticity import AuthenticityIndex
+
+def random_hashes(count, rng):
+    raw = rng.integers(0, 256, size=(count, 32), dtype=np.uint8)
+    return ["0x" + row.tobytes().hex() for row in raw]
+
+def time_lookups(index, hashes):
+    start = time.perf_counter()
+    found = sum(index.contains(dataset_hash) for dataset_hash in hashes)
+    return (time.perf_counter() - start) / len(hashes) * 1e6, found
+
+def main():
+    datasets = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        index = AuthenticityIndex(os.path.join(tmp, "fingerprints.db"))
+        start = time.perf_counter()
+        registered = []
+        for offset in range(0, datasets, 100_000):
+            batch = random_hashes(min(100_000, datasets - offset), rng)
+            index.add_many(batch)
+            registered.extend(batch[:2000])
+        print(f"registered {datasets:,} fingerprints in {time.perf_counter() - start:.1f}s")
+
+        hit_us, hits = time_lookups(index, registered[:20_000])
+        miss_us, false_hits = time_lookups(index, random_hashes(20_000, rng))
+        start = time.perf_counter()
+        for dataset_hash in random_hashes(2_000, rng):
+            index.add(dataset_hash)
+        add_us = (time.perf_counter() - start) / 2_000 * 1e6
+        print(f"  lookup hit  : {hit_us:6.1f} us  ({hits} found)")
+        print(f"  lookup miss : {miss_us:6.1f} us  ({false_hits} false hits)")
+        print(f"  add         : {add_us:6.1f} us")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Compare BiasCheck's batched statistics with per-column ones on a wide dataset.
+
+Usage: python benchmarks/bench_bias_check.py [rows] [columns]
+
+"per-column check" is the original df-based loop (value_counts, nunique
+and skew one column at a time). The profiled variants time check_bias on
+fresh column profiles, with the skewness and top-value counts it needs
+computed per column ("unbatched") or batched (fill_skews and bincount
+over factorized codes). The outputs of all three must be equal.
+"""
+import os
+import re
+import sys
+import time
+import numpy as np
+import pandas as pd
+from scipy.stats import skew
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.bias_check import BiasCheck
+from src.column_profile import profile_columns
+
+def make_frame(rows, columns, seed=0):
+    """Half float columns (some PCA-like V*), a quarter integer scores, a quarter low-cardinality text."""
+    rng = np.random.default_rng(seed)
+    data = {}
+    for i in range(columns):
+        kind = i % 4
+        if kind in (0, 1):
+            name = f"V{i}" if kind == 0 else f"float{i}"
+            data[name] = rng.standard_t(5, rows) * (1 if kind == 0 else 40)
+        elif kind == 2:
+            data[f"score{i}"] = rng.integers(0, 100, rows)
+        else:
+            data[f"label{i}"] = rng.choice([f"level-{v}" for v in range(12)], rows).astype(object)
+    return pd.DataFrame(data)
+
+def legacy_check_bias(df):
+    """The original per-column BiasCheck, without its debug output."""
+    bias_score = 0
+    categorical_cols = [col for col in df if df[col].dtype == "category" or
+                        (df[col].dtype == "object" and df[col].nunique() / len(df[col].dropna()) < 0.1)]
+    numeric_cols = [col for col in df if pd.api.types.is_numeric_dtype(df[col]) and
+                    pd.Series(df[col]).nunique() > 2 and df[col].std() > 1e-3 and len(df[col].dropna()) >= 20]
+    cat_bias = cat_count = 0
+    for col in categorical_cols:
+        value_counts = df[col].value_counts(normalize=True)
+        if len(value_counts) > 1:
+            cat_bias += value_counts.max()
+            cat_count += 1
+    if cat_count > 0:
+        cat_bias /= cat_count
+        bias_score += 0.5 * cat_bias
+    num_bias = num_count = 0
+    for col in numeric_cols:
+        data = pd.to_numeric(df[col], errors="coerce").dropna()
+        if len(data) > 0:
+            is_pca_like = abs(data.mean()) < 0.1 and 0.5 < data.std() < 2.0
+            skewness = abs(skew(data, nan_policy="omit"))
+            if not np.isnan(skewness):
+                num_bias += min(skewness / (5.0 if is_pca_like else 3.0), 1)
+                num_count += 1
+    if num_count > 0:
+        num_bias /= num_count
+        bias_score += 0.5 * num_bias
+    bias_score = min(max(bias_score, 0), 1)
+    bias = "Balanced" if bias_score < 0.5 else "Imbalanced"
+    diversity = col_count = 0
+    for col in df:
+        unique_count = df[col].nunique()
+        total_count = len(df[col].dropna())
+        if total_count > 0:
+            is_pca_like = bool(re.match(r"V\d+", col)) or (col in numeric_cols and abs(df[col].mean()) < 0.1 and 0.5 < df[col].std() < 2.0)
+            expected_unique = min(total_count, 5 if col in categorical_cols or df[col].nunique() <= 2 else total_count)
+            diversity += min(unique_count / expected_unique, 0.7 if is_pca_like else 1.0)
+            col_count += 1
+    return bias, bias_score, diversity / col_count if col_count > 0 else 0
+
+def fill_per_column(profiles):
+    """The skew and top-value counts one column at a time, as before batching.
+
+    Like the old profiles, every numeric column gets its skew; top-value
+    counts were already lazy, so only categorical columns get those.
+    """
+    for profile in profiles.values():
+        if profile.count > 0:
+            profile.__dict__["skew"] = skew(profile.numeric, nan_policy="omit")
+        if profile.is_category or profile.is_low_cardinality:
+            counts = profile._series.value_counts()
+            profile.__dict__["top_frequency"] = int(counts.max()) if len(counts) else 0
+
+def timed(func, prepare=lambda: None, repeat=3):
+    """Best time of func(prepare()) over repeat runs (prepare is not timed), and its last result."""
+    best = None
+    for _ in range(repeat):
+        argument = prepare()
+        start = time.perf_counter()
+        result = func(argument)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    columns = int(sys.argv[2]) if len(sys.argv) > 2 else 400
+    df = make_frame(rows, columns)
+    bias_check = BiasCheck()
+    legacy_time, legacy = timed(lambda _: legacy_check_bias(df))
+    profile_time, _ = timed(lambda _: profile_columns(df))
+    unbatched_time, unbatched = timed(lambda profiles: (fill_per_column(profiles), bias_check.check_bias(df, profiles))[1],
+                                      lambda: profile_columns(df))
+    batched_time, batched = timed(lambda profiles: bias_check.check_bias(df, profiles), lambda: profile_columns(df))
+    print(f"{rows} rows x {columns} columns")
+    print(f"  per-column check      : {legacy_time:.3f}s")
+    print(f"  column profiles       : {profile_time:.3f}s (shared with the other checks)")
+    print(f"  bias from profiles    : {unbatched_time:.3f}s unbatched, {batched_time:.3f}s batched "
+          f"({unbatched_time / batched_time:.1f}x)")
+    print(f"  identical outputs     : {legacy == unbatched == batched}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Compare duplicate-row counting: DataFrame.duplicated, sorted 64-bit row keys, and the HyperLogLog estimate.
+
+Usage: python benchmarks/bench_duplicates.py [rows] [columns]
+
+Each method runs in a fresh process so its peak RSS growth is its own.
+"""
+import json
+import os
+import subprocess
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.sketches import DuplicateCounter, count_repeats, hash_rows, row_keys
+
+def make_frame(rows, columns, seed=0):
+    """Wide mixed frame: integer ids, floats, low-cardinality strings, about 5% repeated rows."""
+    rng = np.random.default_rng(seed)
+    unique_rows = rows - rows // 20
+    data = {}
+    for i in range(columns):
+        kind = i % 3
+        if kind == 0:
+            data[f"int{i}"] = rng.integers(0, 1_000_000, unique_rows)
+        elif kind == 1:
+            data[f"float{i}"] = rng.normal(size=unique_rows).round(3)
+        else:
+            data[f"str{i}"] = rng.choice([f"value-{v}" for v in range(50)], unique_rows).astype(object)
+    df = pd.DataFrame(data)
+    return pd.concat([df, df.iloc[rng.integers(0, unique_rows, rows - unique_rows)]], ignore_index=True)
+
+def peak_kb():
+    with open("/proc/self/status") as status:
+        return next(int(line.split()[1]) for line in status if line.startswith("VmHWM"))
+
+def reset_peak():
+    """Reset the peak RSS to the current RSS (Linux), so building the frame does not count."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+def run_method(method, rows, columns):
+    df = make_frame(rows, columns)
+    reset_peak()
+    baseline = peak_kb()
+    start = time.perf_counter()
+    if method == "pandas":
+        duplicates, error = int(df.duplicated().sum()), 0
+    elif method == "row keys":
+        duplicates, error = count_repeats(row_keys(df)), 0
+    else:
+        # As the streaming verifier does: hash 100k-row chunks into a fixed-size sketch
+        counter = DuplicateCounter(approximate=True)
+        for start_row in range(0, len(df), 100_000):
+            counter.update(hash_rows(df.iloc[start_row:start_row + 100_000]))
+        duplicates, error = counter.count(), counter.error()
+    return {"seconds": time.perf_counter() - start, "peak_mb": (peak_kb() - baseline) / 1024,
+            "duplicates": duplicates, "error": error}
+
+def main():
+    if sys.argv[1:2] == ["--method"]:
+        print(json.dumps(run_method(sys.argv[2], int(sys.argv[3]), int(sys.argv[4]))))
+        return
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    columns = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+    print(f"{rows} rows x {columns} columns")
+    for method in ["pandas", "row keys", "hyperloglog"]:
+        output = subprocess.run([sys.executable, os.path.abspath(__file__), "--method", method, str(rows), str(columns)],
+                                capture_output=True, text=True, check=True).stdout
+        result = json.loads(output)
+        error = f" ± {result['error']}" if result["error"] else ""
+        print(f"  {method:12s} {result['seconds']:7.3f}s  peak +{result['peak_mb']:6.0f}MB  "
+              f"{result['duplicates']} duplicates{error}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Parse time and peak memory of pandas' readers vs src.ingest, per file format.
+
+Usage: python benchmarks/bench_ingest.py [rows]
+
+Each measurement runs in a fresh interpreter so the peak resident set
+size (VmHWM, Linux only) belongs to that one read; "peak" is reported net
+of the interpreter's footprint after importing pandas and pyarrow.
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+MEASURE = """
+import json, sys, time
+import pandas as pd, pyarrow
+sys.path.insert(0, {root!r})
+from src.ingest import load_frame
+def peak_kb():
+    with open("/proc/self/status") as status:
+        return next(int(line.split()[1]) for line in status if line.startswith("VmHWM"))
+baseline = peak_kb()
+start = time.perf_counter()
+if {reader!r} == "ingest":
+    df = load_frame({path!r})
+elif {fmt!r} == "csv":
+    df = pd.read_csv({path!r})
+elif {fmt!r} == "jsonl":
+    df = pd.read_json({path!r}, lines=True)
+elif {fmt!r} == "parquet":
+    df = pd.read_parquet({path!r})
+else:
+    df = pd.read_feather({path!r})
+elapsed = time.perf_counter() - start
+peak = peak_kb() - baseline
+print(json.dumps({{"seconds": elapsed, "peak_kb": peak, "frame_kb": int(df.memory_usage(deep=True).sum() // 1024)}}))
+"""
+
+def make_frame(rows):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({f"V{i}": rng.normal(size=rows) for i in range(1, 21)})
+    df["Amount"] = rng.lognormal(3, 1, rows).round(2)
+    df["Class"] = rng.integers(0, 2, rows)
+    df["Region"] = rng.choice(["north", "south", "east", "west"], rows)
+    df["Email"] = [f"user{i}@example.com" for i in range(rows)]
+    return df
+
+def measure(reader, fmt, path):
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    code = MEASURE.format(root=root, reader=reader, fmt=fmt, path=path)
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    df = make_frame(rows)
+    with tempfile.TemporaryDirectory() as directory:
+        paths = {
+            "csv": os.path.join(directory, "data.csv"),
+            "jsonl": os.path.join(directory, "data.jsonl"),
+            "parquet": os.path.join(directory, "data.parquet"),
+            "feather": os.path.join(directory, "data.feather"),
+        }
+        df.to_csv(paths["csv"], index=False)
+        df.to_json(paths["jsonl"], orient="records", lines=True)
+        df.to_parquet(paths["parquet"], index=False)
+        df.to_feather(paths["feather"])
+        print(f"{rows} rows x {len(df.columns)} columns")
+        for fmt, path in paths.items():
+            size_mb = os.path.getsize(path) / 1e6
+            for reader in ["pandas", "ingest"]:
+                result = measure(reader, fmt, path)
+                print(f"  {fmt:8s} {size_mb:7.1f}MB  {reader:6s}: {result['seconds']:.3f}s  "
+                      f"peak +{result['peak_kb'] / 1024:.0f}MB  frame {result['frame_kb'] / 1024:.0f}MB")
+
+if __name__ == "__main__":
+    main()
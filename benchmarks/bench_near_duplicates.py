@@ -0,0 +1,63 @@
+"""Query latency of the MinHash/LSH NearDuplicateIndex with many indexed datasets.
+
+Usage: python benchmarks/bench_near_duplicates.py [datasets]
+
+Indexes N synthetic signature pairs (independent random signatures stand in
+for unrelated datasets) in a temporary on-disk index, then times queries
+for planted near-duplicates (a copy with some bins changed) and for unseen
+datasets, and compares against a linear scan over every signature.
+"""
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.near_duplicates import NUM_BINS, NearDuplicateIndex
+
+def random_signatures(rng):
+    return {kind: rng.integers(0, 2 ** 32, NUM_BINS, dtype=np.uint32) for kind in ["rows", "values"]}
+
+def perturb(signature, rng, similarity):
+    copy = signature.copy()
+    changed = rng.choice(NUM_BINS, int(round(NUM_BINS * (1 - similarity))), replace=False)
+    copy[changed] = rng.integers(0, 2 ** 32, len(changed), dtype=np.uint32)
+    return copy
+
+def main():
+    datasets = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        index = NearDuplicateIndex(os.path.join(tmp, "signatures.db"))
+        stored = []
+        start = time.perf_counter()
+        for offset in range(0, datasets, 10_000):
+            batch = [(f"0x{offset + i:064x}", random_signatures(rng), None) for i in range(min(10_000, datasets - offset))]
+            index.add_many(batch)
+            stored.extend(entry[1]["rows"] for entry in batch)
+        print(f"indexed {datasets:,} datasets in {time.perf_counter() - start:.1f}s")
+
+        targets = rng.choice(datasets, 200, replace=False)
+        queries = [{"rows": perturb(stored[target], rng, 0.85), "values": None} for target in targets]
+        start = time.perf_counter()
+        results = [index.query(query) for query in queries]
+        near_ms = (time.perf_counter() - start) / len(queries) * 1000
+        recall = np.mean([bool(result) and result[0]["datasetHash"] == f"0x{target:064x}"
+                          for result, target in zip(results, targets)])
+
+        start = time.perf_counter()
+        misses = [index.query(random_signatures(rng)) for _ in range(200)]
+        miss_ms = (time.perf_counter() - start) / 200 * 1000
+
+        matrix = np.vstack(stored)
+        start = time.perf_counter()
+        for query in queries[:20]:
+            (matrix == query["rows"]).mean(axis=1).argmax()
+        scan_ms = (time.perf_counter() - start) / 20 * 1000
+        print(f"  LSH query, near-duplicate (J~0.85): {near_ms:7.2f} ms  recall={recall:.2f}")
+        print(f"  LSH query, unseen dataset        : {miss_ms:7.2f} ms  false matches={sum(map(len, misses))}")
+        print(f"  linear scan (numpy, rows only)   : {scan_ms:7.2f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""End-to-end latency of Verifier with the sequential and the process-pool executor.
+
+Usage: python benchmarks/bench_parallel.py [rows] [--blank]
+
+The first process-pool run includes starting the workers, so it is reported
+separately from the warm runs. --blank swaps en_core_web_sm for an empty
+English pipeline with a small PERSON rule, for machines without the model.
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+import spacy
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from bench_anomaly_engine import make_wide_frame
+from bench_pii_detection import make_text_frame
+
+def blank_pipeline(*args, **kwargs):
+    nlp = spacy.blank("en")
+    nlp.add_pipe("entity_ruler").add_patterns(
+        [{"label": "PERSON", "pattern": [{"LOWER": name}, {"IS_TITLE": True}]} for name in ["john", "mary", "priya"]])
+    return nlp
+
+def make_mixed_frame(rows):
+    wide = make_wide_frame(rows, 20)
+    text = make_text_frame(rows)
+    return wide.join(text)
+
+def timed_verify(verifier, df, runs):
+    best = None
+    for _ in range(runs):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            report = verifier.verify_dataset(df, "bench")
+            elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, report["details"]["timings"]
+
+def main():
+    rows = int(next((arg for arg in sys.argv[1:] if arg.isdigit()), 50_000))
+    if "--blank" in sys.argv:
+        spacy.load = blank_pipeline
+    from src.verifier import Verifier
+    df = make_mixed_frame(rows)
+    print(f"{rows} rows x {len(df.columns)} columns")
+
+    sequential = Verifier()
+    elapsed, timings = timed_verify(sequential, df, 3)
+    print(f"  sequential            : {elapsed:.2f}s  stages={timings}")
+
+    parallel = Verifier(executor="process")
+    cold, _ = timed_verify(parallel, df, 1)
+    elapsed, timings = timed_verify(parallel, df, 3)
+    print(f"  process pool (cold)   : {cold:.2f}s")
+    print(f"  process pool (warm)   : {elapsed:.2f}s  stages={timings}")
+    parallel.close()
+
+if __name__ == "__main__":
+    main()
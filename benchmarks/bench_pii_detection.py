@@ -0,0 +1,74 @@
+"""Throughput of PIIDetection before and after batching/deduplication.
+
+Usage: python benchmarks/bench_pii_detection.py [rows] [--blank]
+
+--blank swaps en_core_web_sm for an empty English pipeline, which is only
+useful for checking the harness itself when the model is not installed.
+"""
+import os
+import re
+import sys
+import time
+import numpy as np
+import pandas as pd
+import spacy
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.pii_detection import PIIDetection
+
+def legacy_detect_pii(detector, df):
+    """The pre-batching per-cell loop from PIIDetection, without the debug output."""
+    from src.column_profile import profile_columns
+    nlp = detector.nlp
+    skip_cols = detector.skip_columns(df, profile_columns(df))
+    pii_values = set()
+    for col in df:
+        if col in skip_cols:
+            continue
+        for val in df[col].astype(str).str.strip():
+            if val.lower() in ["", "nan"] or val.isdigit() or len(val) < 3 or re.match(r"^[A-Za-z0-9-]{1,10}$", val):
+                continue
+            doc = nlp(val)
+            for ent in doc.ents:
+                if ent.label_ == "PERSON" and len(val.split()) <= 2:
+                    pii_values.add(val)
+            if re.search(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b", val):
+                pii_values.add(val)
+    return len(pii_values)
+
+def make_text_frame(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    first = np.array(["John", "Mary", "Alice", "Robert", "Priya", "Wei", "Fatima", "Carlos"])
+    letters = np.array(list("abcdefghijklmnopqrstuvwxyz"))
+    last = np.array(["".join(rng.choice(letters, 7)).capitalize() for _ in range(max(rows // 3, 1))])
+    notes = np.array(["called about the refund", "prefers email contact", "moved to the Delhi office", "no response yet"])
+    names = pd.Series(first[rng.integers(0, len(first), rows)]) + " " + pd.Series(last[rng.integers(0, len(last), rows)])
+    emails = pd.Series([f"user{i % (rows // 4 + 1)}@example.com" for i in range(rows)])
+    comments = pd.Series(notes[rng.integers(0, len(notes), rows)]) + " #" + pd.Series(rng.integers(0, rows // 2 + 1, rows)).astype(str)
+    return pd.DataFrame({"customer": names, "email": emails, "comment": comments})
+
+def main():
+    rows = int(next((arg for arg in sys.argv[1:] if arg.isdigit()), 20_000))
+    if "--blank" in sys.argv:
+        spacy.load = lambda *args, **kwargs: spacy.blank("en")
+    detector = PIIDetection()
+    if "--blank" in sys.argv:
+        detector.nlp.add_pipe("entity_ruler").add_patterns(
+            [{"label": "PERSON", "pattern": [{"LOWER": name}, {"IS_TITLE": True}]} for name in ["john", "mary", "priya"]])
+    df = make_text_frame(rows)
+    values = df.size
+
+    start = time.perf_counter()
+    legacy_count = legacy_detect_pii(detector, df)
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    _, count = detector.detect_pii(df)
+    batched_time = time.perf_counter() - start
+
+    print(f"{rows} rows x {len(df.columns)} text columns ({values} values)")
+    print(f"  per-cell nlp()        : {legacy_time:.2f}s, {values / legacy_time:,.0f} values/sec, pii_count={legacy_count}")
+    print(f"  dedup + nlp.pipe      : {batched_time:.2f}s, {values / batched_time:,.0f} values/sec, pii_count={count}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Throughput of the PII pre-screen (skip / email / needs-NER masks) per column, per value vs in bulk.
+
+Usage: python benchmarks/bench_pii_prescreen.py [rows]
+
+Each column holds `rows` (default 1,000,000) strings; the screen runs
+over its distinct values, as PIIDetection.scan_values sees them. The
+model itself is not run: only the rules that decide which values reach it.
+"""
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.pii_detection import _prescreen_python, prescreen
+
+def make_columns(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    first = np.array(["John", "Mary", "Alice", "Robert", "Priya", "Wei", "Fatima", "Carlos", "Zoë", "José"])
+    numbers = pd.Series(np.arange(rows)).astype(str)
+    notes = np.array(["called about the refund", "prefers email contact", "moved office", "no response yet"])
+    return {
+        "names": pd.Series(first[rng.integers(0, len(first), rows)]) + " " + numbers,
+        "emails": "user" + numbers + "@example.com",
+        "ids": "ID-" + pd.Series(rng.integers(0, 10**9, rows)).astype(str),
+        "notes": pd.Series(notes[rng.integers(0, len(notes), rows)]) + " #" + numbers,
+        "mixed": pd.Series(np.where(rng.random(rows) < 0.5, "Contact " + numbers,
+                                    "reach me at u" + numbers + "@mail.org please")),
+    }
+
+def legacy_prescreen(values):
+    skip, email, ner = (np.zeros(len(values), dtype=bool) for _ in range(3))
+    _prescreen_python(values, skip, email, ner)
+    return skip, email, ner
+
+def timed(func, values):
+    start = time.perf_counter()
+    masks = func(values)
+    return time.perf_counter() - start, masks
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    print(f"{rows:,} rows per column")
+    for name, column in make_columns(rows).items():
+        values = pd.unique(column.str.strip())
+        legacy_time, legacy_masks = timed(legacy_prescreen, values)
+        bulk_time, bulk_masks = timed(prescreen, values)
+        same = all(np.array_equal(a, b) for a, b in zip(legacy_masks, bulk_masks))
+        print(f"  {name:7s} {len(values):>9,} distinct  per value {legacy_time:6.3f}s "
+              f"({len(values) / legacy_time:>12,.0f}/s)  bulk {bulk_time:6.3f}s ({len(values) / bulk_time:>12,.0f}/s)  "
+              f"{legacy_time / bulk_time:4.1f}x  same={same}  needs NER {int(bulk_masks[2].sum()):,}")
+
+if __name__ == "__main__":
+    main()
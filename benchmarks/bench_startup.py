@@ -0,0 +1,73 @@
+"""Cold start of server.py: time until /health answers and until the models are loaded.
+
+Usage: python benchmarks/bench_startup.py [runs]
+
+Starts the development server in a fresh process per run and polls
+/health. "ready" is the first 200 response; "verifier" and "models" are
+the first responses reporting the background warm-up's progress: the
+verifier stack imported and built, then the spaCy pipeline loaded. The
+model download is disabled so a missing model does not turn into a
+network wait (the models column then stays empty).
+"""
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def poll_health(port, timeout=120):
+    """Yield the /health body of every successful poll."""
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1) as response:
+                yield json.loads(response.read())
+        except OSError:
+            pass
+        time.sleep(0.01)
+
+def measure():
+    port = free_port()
+    env = dict(os.environ, PORT=str(port), SPACY_MODEL_DOWNLOAD="0", PRELOAD_MODELS="1")
+    start = time.perf_counter()
+    server = subprocess.Popen([sys.executable, "server.py"], cwd=ROOT, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    ready = verifier = models = None
+    deadline = None
+    try:
+        for body in poll_health(port):
+            now = time.perf_counter() - start
+            if ready is None:
+                ready = now
+            if verifier is None and body.get("verifierLoaded"):
+                verifier = now
+                # Without the model installed the pipeline never loads; give it a moment to fail
+                deadline = now + 10
+            if body.get("modelsLoaded"):
+                models = now
+                break
+            if deadline is not None and now > deadline:
+                break
+    finally:
+        server.terminate()
+        server.wait()
+    return ready, verifier, models
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    for run in range(runs):
+        ready, verifier, models = measure()
+        models_text = f"{models:.2f}s" if models is not None else "not loaded"
+        print(f"  run {run + 1}: /health ready {ready:.2f}s, verifier {verifier:.2f}s, spaCy model {models_text}")
+
+if __name__ == "__main__":
+    main()
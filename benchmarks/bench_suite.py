@@ -0,0 +1,175 @@
+"""Throughput and peak memory of the verification pipeline on synthetic datasets, with a regression check.
+
+Usage: python benchmarks/bench_suite.py [--datasets creditcard,student_depression,faulty_sales]
+                                        [--rows 10000,100000] [--repeat 3] [--blank]
+                                        [--history benchmarks/history.json] [--threshold 0.2]
+                                        [--window 5] [--min-seconds 0.02] [--no-save]
+
+Every (dataset, rows) case runs in a fresh process: it generates the data
+(src/synthetic.py), then times Verifier.verify_dataset end to end and the
+column profiling, hash and each check on their own, keeping the best of
+--repeat runs. Peak memory is the growth of the process's peak RSS during
+a stage (the high-water mark is reset before each one). Uploads above
+PII_SAMPLE_ROWS rows get a sampled PII scan, as they do in the server.
+
+Results are appended to a JSON history. A stage whose rows/second falls
+more than --threshold below the median of its last --window recorded runs
+on the same host is reported as a regression and the script exits with
+status 1, so it can gate a CI job. Stages faster than --min-seconds are
+too noisy to compare and are left out of the check. --blank swaps
+en_core_web_sm for an empty English pipeline with a small PERSON rule;
+such runs are only compared with other --blank runs.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(ROOT)
+DEFAULT_HISTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "history.json")
+PII_SAMPLE_ROWS = int(os.environ.get('PII_SAMPLE_ROWS', 100000))
+
+def peak_kb():
+    with open("/proc/self/status") as status:
+        return next(int(line.split()[1]) for line in status if line.startswith("VmHWM"))
+
+def reset_peak():
+    """Reset the peak RSS to the current RSS (Linux); without it, peaks only ever grow."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+def measure(func, repeat):
+    """Best wall time of func() over repeat runs, and the largest peak RSS growth (KB) of any run."""
+    best, growth = None, 0
+    for _ in range(repeat):
+        reset_peak()
+        baseline = peak_kb()
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        growth = max(growth, peak_kb() - baseline)
+        best = elapsed if best is None else min(best, elapsed)
+    return best, growth
+
+def run_case(dataset, rows, repeat, blank):
+    """Benchmark one (dataset, rows) case in this process; returns {stage: measurements}."""
+    if blank:
+        import spacy
+        from bench_parallel import blank_pipeline
+        spacy.load = blank_pipeline
+    from src.column_profile import profile_columns
+    from src.synthetic import make_dataset
+    from src.utils import compute_hash
+    from src.verifier import Verifier
+
+    df = make_dataset(dataset, rows)
+    pii_mode = "sampled" if rows > PII_SAMPLE_ROWS else "exhaustive"
+    verifier = Verifier()
+    # Loads the spaCy pipeline, so the timed runs do not include it
+    verifier.pii_detection.scan(df.head(100), mode=pii_mode)
+    profiles = profile_columns(df)
+    stages = {
+        "verify_dataset": lambda: verifier.verify_dataset(df, dataset, pii_mode=pii_mode),
+        "profile": lambda: profile_columns(df),
+        "hash": lambda: compute_hash(df),
+        "quality": lambda: verifier.quality_check.check_quality(df, profiles),
+        "pii": lambda: verifier.pii_detection.scan(df, profiles, pii_mode),
+        "relevance": lambda: verifier.relevance_check.check_relevance(df, dataset, profiles),
+        "bias": lambda: verifier.bias_check.check_bias(df, profiles),
+    }
+    results = {}
+    for stage, func in stages.items():
+        seconds, growth = measure(func, repeat)
+        results[stage] = {"seconds": round(seconds, 4), "rows_per_second": round(rows / seconds, 1),
+                          "peak_rss_mb": round(growth / 1024, 1)}
+    return {"pii_mode": pii_mode, "columns": len(df.columns), "stages": results}
+
+def run_isolated(dataset, rows, repeat, blank):
+    command = [sys.executable, os.path.abspath(__file__), "--case", dataset, str(rows), "--repeat", str(repeat)]
+    if blank:
+        command.append("--blank")
+    completed = subprocess.run(command, cwd=ROOT, capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(f"{dataset} x {rows} failed:\n{completed.stderr[-2000:]}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def load_history(path):
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return json.load(f)
+
+def find_regressions(history, run, threshold, window, min_seconds):
+    """Stages of run whose throughput is more than threshold below the median of comparable past runs."""
+    comparable = [past for past in history if past["host"] == run["host"] and past["blank"] == run["blank"]]
+    regressions = []
+    for case, result in run["results"].items():
+        for stage, measured in result["stages"].items():
+            if measured["seconds"] < min_seconds:
+                continue
+            past = [entry["results"][case]["stages"][stage]["rows_per_second"] for entry in comparable
+                    if stage in entry["results"].get(case, {}).get("stages", {})][-window:]
+            if not past:
+                continue
+            baseline = statistics.median(past)
+            if measured["rows_per_second"] < baseline * (1 - threshold):
+                regressions.append((case, stage, measured["rows_per_second"], baseline))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--datasets", default="creditcard,student_depression,faulty_sales")
+    parser.add_argument("--rows", default="10000,100000")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--blank", action="store_true")
+    parser.add_argument("--history", default=DEFAULT_HISTORY)
+    parser.add_argument("--threshold", type=float, default=0.2)
+    parser.add_argument("--window", type=int, default=5)
+    parser.add_argument("--min-seconds", type=float, default=0.02)
+    parser.add_argument("--no-save", action="store_true")
+    parser.add_argument("--case", nargs=2, metavar=("DATASET", "ROWS"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        print(json.dumps(run_case(args.case[0], int(args.case[1]), args.repeat, args.blank)))
+        return
+
+    run = {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "commit": git_commit(), "host": platform.node(),
+           "python": platform.python_version(), "cpus": os.cpu_count(), "blank": args.blank, "results": {}}
+    for dataset in args.datasets.split(","):
+        for rows in [int(count) for count in args.rows.split(",")]:
+            case = f"{dataset}/{rows}"
+            result = run_isolated(dataset, rows, args.repeat, args.blank)
+            run["results"][case] = result
+            print(f"{case} ({result['columns']} columns, {result['pii_mode']} PII scan)")
+            for stage, measured in result["stages"].items():
+                print(f"  {stage:15s} {measured['seconds']:9.3f}s  {measured['rows_per_second']:12,.0f} rows/s  "
+                      f"peak +{measured['peak_rss_mb']:.0f}MB")
+
+    history = load_history(args.history)
+    regressions = find_regressions(history, run, args.threshold, args.window, args.min_seconds)
+    if not args.no_save:
+        with open(args.history, "w") as f:
+            json.dump(history + [run], f, indent=1)
+    for case, stage, measured, baseline in regressions:
+        print(f"REGRESSION {case} {stage}: {measured:,.0f} rows/s vs median {baseline:,.0f} rows/s")
+    if regressions:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Peak server memory while verifying uploads of increasing size.
+
+Usage: python benchmarks/bench_upload.py [sizes in MB, e.g. 10,40,160]
+
+Each size gets a fresh single-process server. A small upload first loads
+the verifier, then the large CSV is streamed to /api/verify from disk
+(the client never holds it in memory either). The report shows the
+server's peak RSS (VmHWM) growth caused by the large upload. With
+STREAMING_THRESHOLD_MB=1 the file is verified chunk by chunk; the upload
+itself is spooled to disk, so what still grows with the file is the
+streaming verifier's 8-byte-per-row hashes for exact duplicate counting.
+"""
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+SERVE = "import server; from werkzeug.serving import run_simple; run_simple('127.0.0.1', {port}, server.app, threaded=True)"
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def write_csv(path, megabytes):
+    rng = np.random.default_rng(0)
+    rows = 50_000
+    block = pd.DataFrame({"id": np.arange(rows), "amount": rng.lognormal(3, 1, rows).round(2),
+                          "region": rng.choice(["north", "south", "east"], rows),
+                          "score": rng.normal(size=rows)}).to_csv(index=False)
+    header, body = block.split("\n", 1)
+    with open(path, "w") as f:
+        f.write(header + "\n")
+        while f.tell() < megabytes * 1024 * 1024:
+            f.write(body)
+
+def peak_kb(pid):
+    with open(f"/proc/{pid}/status") as status:
+        return next(int(line.split()[1]) for line in status if line.startswith("VmHWM"))
+
+def upload(port, path):
+    """POST path as a multipart upload, streaming the body from disk."""
+    boundary = uuid.uuid4().hex
+    head = (f'--{boundary}\r\nContent-Disposition: form-data; name="name"\r\n\r\n{uuid.uuid4().hex}\r\n'
+            f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="upload.csv"\r\n'
+            f'Content-Type: text/csv\r\n\r\n').encode()
+    tail = f'\r\n--{boundary}--\r\n'.encode()
+
+    def body():
+        yield head
+        with open(path, "rb") as f:
+            while chunk := f.read(1024 * 1024):
+                yield chunk
+        yield tail
+
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=3600)
+    connection.request("POST", "/api/verify", body=body(), headers={
+        "Content-Type": f"multipart/form-data; boundary={boundary}",
+        "Content-Length": str(len(head) + os.path.getsize(path) + len(tail))})
+    response = connection.getresponse()
+    return response.status, json.loads(response.read())
+
+def measure(megabytes, directory):
+    small, large = os.path.join(directory, "small.csv"), os.path.join(directory, f"large-{megabytes}.csv")
+    write_csv(small, 0.1)
+    write_csv(large, megabytes)
+    port = free_port()
+    env = dict(os.environ, STREAMING_THRESHOLD_MB="1", PRELOAD_MODELS="0", SPACY_MODEL_DOWNLOAD="0")
+    server = subprocess.Popen([sys.executable, "-c", SERVE.format(port=port)], cwd=ROOT, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        for _ in range(600):
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=1).close()
+                break
+            except OSError:
+                time.sleep(0.05)
+        upload(port, small)
+        baseline = peak_kb(server.pid)
+        start = time.perf_counter()
+        status, _ = upload(port, large)
+        elapsed = time.perf_counter() - start
+        return status, elapsed, baseline, peak_kb(server.pid) - baseline
+    finally:
+        server.terminate()
+        server.wait()
+        os.remove(large)
+
+def main():
+    sizes = [int(size) for size in (sys.argv[1] if len(sys.argv) > 1 else "10,40,160").split(",")]
+    with tempfile.TemporaryDirectory() as directory:
+        for megabytes in sizes:
+            status, elapsed, baseline, growth = measure(megabytes, directory)
+            print(f"  {megabytes:5d}MB upload: HTTP {status} in {elapsed:.1f}s, "
+                  f"peak RSS {baseline / 1024:.0f}MB + {growth / 1024:.0f}MB")
+
+if __name__ == "__main__":
+    main()
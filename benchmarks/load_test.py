@@ -0,0 +1,102 @@
+"""Requests/sec and latency percentiles of a running server at several concurrency levels.
+
+Usage: python benchmarks/load_test.py [--url URL] [--endpoint verify|health]
+                                      [--concurrency 1,4,16] [--requests 50] [--rows 2000] [--cached]
+
+Start the server first, e.g. gunicorn -c gunicorn.conf.py wsgi:app. Each
+verify request uploads the same generated CSV under a new dataset name,
+so the result cache is bypassed; --cached reuses one name to measure
+cache hits instead.
+"""
+import argparse
+import io
+import os
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from bench_pii_detection import make_text_frame
+
+def make_upload(rows):
+    rng = np.random.default_rng(0)
+    df = make_text_frame(rows)
+    df["Amount"] = rng.lognormal(3, 1, rows).round(2)
+    df["Class"] = rng.integers(0, 2, rows)
+    return df.to_csv(index=False).encode()
+
+def multipart(fields, file_name, content):
+    boundary = uuid.uuid4().hex
+    body = io.BytesIO()
+    for name, value in fields.items():
+        body.write(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode())
+    body.write(f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="{file_name}"\r\n'
+               f'Content-Type: text/csv\r\n\r\n'.encode())
+    body.write(content)
+    body.write(f'\r\n--{boundary}--\r\n'.encode())
+    return body.getvalue(), f"multipart/form-data; boundary={boundary}"
+
+def send(args, content, index):
+    if args.endpoint == "health":
+        request = urllib.request.Request(f"{args.url}/health")
+    else:
+        name = "load-test" if args.cached else f"load-test-{uuid.uuid4().hex}"
+        body, content_type = multipart({"name": name}, "load.csv", content)
+        request = urllib.request.Request(f"{args.url}/api/verify", data=body, headers={"Content-Type": content_type})
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=600) as response:
+            response.read()
+            ok = response.status == 200
+    except (urllib.error.URLError, OSError):
+        ok = False
+    return time.perf_counter() - start, ok
+
+def run_level(args, content, concurrency):
+    latencies, errors = [], [0]
+    lock = threading.Lock()
+    counter = iter(range(args.requests))
+
+    def client():
+        while True:
+            with lock:
+                index = next(counter, None)
+            if index is None:
+                return
+            elapsed, ok = send(args, content, index)
+            with lock:
+                latencies.append(elapsed)
+                errors[0] += not ok
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - start
+    p50, p99 = np.percentile(latencies, [50, 99])
+    print(f"  concurrency {concurrency:3d}: {len(latencies) / wall:7.1f} req/s  "
+          f"p50 {p50 * 1000:8.1f}ms  p99 {p99 * 1000:8.1f}ms  errors {errors[0]}")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="http://127.0.0.1:5000")
+    parser.add_argument("--endpoint", choices=["verify", "health"], default="verify")
+    parser.add_argument("--concurrency", default="1,4,16")
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--cached", action="store_true")
+    args = parser.parse_args()
+    content = make_upload(args.rows) if args.endpoint == "verify" else None
+    size = f", {len(content) / 1024:.0f}KB upload" if content else ""
+    print(f"{args.endpoint} on {args.url}: {args.requests} requests per level{size}")
+    for concurrency in [int(level) for level in args.concurrency.split(",")]:
+        run_level(args, content, concurrency)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+# gunicorn settings for the verification service: gunicorn -c gunicorn.conf.py wsgi:app
+import multiprocessing
+import os
+import tempfile
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+
+# Verification is CPU-bound, so one worker process per core; each worker serves
+# GUNICORN_THREADS requests at once, which keeps /health and status polls answered
+# while a long verification runs
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+worker_class = "gthread"
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+
+# Async job status lives in SQLite; with several workers a poll can land on any of them,
+# so they have to share a file rather than each keep an in-memory database
+if workers > 1:
+    os.environ.setdefault('JOBS_DB', os.path.join(tempfile.gettempdir(),
+                                                  f"verifier-jobs-{os.environ.get('PORT', 5000)}.db"))
+
+# Load the app (and the spaCy pipeline) in the master, then fork
+preload_app = True
+
+# Large uploads can take minutes to verify; on SIGTERM in-flight requests and
+# running async jobs get graceful_timeout seconds to finish
+timeout = int(os.environ.get('WORKER_TIMEOUT', 300))
+graceful_timeout = int(os.environ.get('GRACEFUL_TIMEOUT', 60))
+keepalive = 5
+
+# Optionally recycle workers now and then so fragmented memory is returned to the OS.
+# Off by default: every request counts, async status polls included, and a recycled
+# worker only waits graceful_timeout seconds for its running async jobs, after which
+# they are marked failed
+max_requests = int(os.environ.get('MAX_REQUESTS', 0))
+max_requests_jitter = max_requests // 10
+
+# Request line and header limits; the body limit is MAX_UPLOAD_MB, enforced by the app
+limit_request_line = 8190
+limit_request_fields = 100
+limit_request_field_size = 8190
+
+accesslog = "-"
+
+def worker_exit(server, worker):
+    """Drain the worker's verification job queue before it exits."""
+    import server as app_module
+    app_module.shutdown(timeout=graceful_timeout)
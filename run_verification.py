@@ -1,50 +1,47 @@
-import pandas as pd
+import argparse
 import os
 import json
-from src.verifier import Verifier
+import logging
+from src.batch import BatchRunner, find_datasets
 
 def main():
-    print("QualityCheck module:", os.path.abspath("src/quality_check.py"))
-    print("Verifier module:", os.path.abspath("src/verifier.py"))
-    print("BiasCheck module:", os.path.abspath("src/bias_check.py"))
-    
-    input_dir = "data/input"
-    output_dir = "data/output"
-    os.makedirs(output_dir, exist_ok=True)
-    
-    verifier = Verifier()
-    
-    datasets = [
-        ("creditcard", "creditcard.csv"),
-        ("student_depression", "student_depression.csv"),
-        ("faulty_sales", "faulty_sales.csv"),
-        ("pokemon_data", "pokemon_data.csv")
-    ]
-    
-    for dataset_name, file_name in datasets:
-        file_path = os.path.join(input_dir, file_name)
-        if not os.path.exists(file_path):
-            print(f"Dataset {file_name} not found")
-            continue
-            
-        df = pd.read_csv(file_path)
-        
-        # Clean Student Depression dataset
-        if dataset_name == "student_depression":
-            print("DEBUG: Cleaning Work Pressure and Job Satisfaction in student_depression dataset")
-            df['Work Pressure'] = 0.0
-            df['Job Satisfaction'] = 0.0
-            print(f"DEBUG: Work Pressure unique values: {df['Work Pressure'].unique()}")
-            print(f"DEBUG: Job Satisfaction unique values: {df['Job Satisfaction'].unique()}")
-        
-        report = verifier.verify_dataset(df, dataset_name)
-        
-        output_file = os.path.join(output_dir, f"{dataset_name}_report.json")
-        with open(output_file, "w") as f:
-            json.dump(report, f, indent=2)
-        
-        print(f"\nDataset: {file_path}")
-        print(json.dumps(report, indent=2))
+    parser = argparse.ArgumentParser(description="Verify a directory (or manifest) of datasets across processes.")
+    parser.add_argument("inputs", nargs="*",
+                        help="files or glob patterns (quote them; ** recurses), default data/input/* without --manifest")
+    parser.add_argument("--manifest", help="file listing one dataset per line: a path or {\"path\", \"name\"}")
+    parser.add_argument("--output", default="data/output/reports.jsonl", help="JSON-lines results, appended to")
+    parser.add_argument("--checkpoint", help="checkpoint of verified files (default: <output>.checkpoint)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument("--pii-mode", choices=["exhaustive", "sampled"], default=None,
+                        help="default: sampled above PII_SAMPLE_ROWS rows")
+    parser.add_argument("--streaming-threshold-mb", type=int, default=50,
+                        help="CSV / JSON-lines files above this size are verified chunk by chunk")
+    parser.add_argument("--compact", action="store_true",
+                        help="hold frames in compact dtypes (categoricals, narrow numbers, Arrow strings)")
+    parser.add_argument("--register", action="store_true",
+                        help="publish each verified file's fingerprint in AUTHENTICITY_DB")
+    parser.add_argument("--force", action="store_true", help="re-verify files that have not changed")
+    parser.add_argument("--verbose", action="store_true", help="log every file")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING, format="%(message)s")
+
+    patterns = args.inputs or ([] if args.manifest else ["data/input/*"])
+    datasets = find_datasets(patterns, args.manifest)
+    if not datasets:
+        parser.error("no dataset files found")
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    runner = BatchRunner(args.output, args.checkpoint, args.workers, args.pii_mode, args.force,
+                         args.streaming_threshold_mb, args.compact, args.register)
+    summary = runner.run(datasets)
+    print(f"{len(datasets)} files: {summary['verified']} verified, {summary['unchanged']} unchanged, "
+          f"{summary['failed']} failed in {summary['wall_seconds']:.1f}s")
+    if summary["verified"]:
+        print(f"  {summary['files_per_second']:.2f} files/s, {summary['rows_per_second']:,.0f} rows/s, "
+              f"{summary['mb_per_second']:.1f} MB/s; per file p50 {summary['file_seconds_p50']}s, "
+              f"p95 {summary['file_seconds_p95']}s")
+    print(json.dumps(summary))
+    if summary["failed"]:
+        raise SystemExit(1)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,39 +1,47 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Request, Response, request, jsonify
 from flask_cors import CORS
 import os
-import pandas as pd
 import json
-import hashlib
-import io
+import logging
 import subprocess
 import sys
+import threading
+from types import SimpleNamespace
+
+from src.formats import INGEST_FORMATS, STREAM_FORMATS
+from src.instrumentation import PROFILERS
+from src.jobs import JobQueue, JobStore, QueueFull
+from src.metrics import metrics
+from src.models import SPACY_MODEL, model_installed, models
+from src.result_cache import ResultCache, cache_key
+from src.uploads import HashingSpool
+
+# LOG_LEVEL=DEBUG shows the per-column detail logged by the checks
+logging.basicConfig(level=os.environ.get('LOG_LEVEL', 'INFO').upper(),
+                    format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+logger = logging.getLogger('server')
 
 # Download spaCy model if not available
 def ensure_spacy_model():
-    """Ensure spaCy model is available before starting the server."""
+    """Ensure the spaCy model is installed; it is loaded on the first PII scan, not here."""
+    if model_installed(SPACY_MODEL):
+        logger.info("spaCy model installed")
+        return True
+    if os.environ.get('SPACY_MODEL_DOWNLOAD', '1').lower() in ('0', 'false', 'no'):
+        return False
+    logger.info("Downloading spaCy model...")
     try:
-        import spacy
-        nlp = spacy.load("en_core_web_sm")
-        print("✅ spaCy model ready")
+        subprocess.check_call([
+            sys.executable, "-m", "spacy", "download", SPACY_MODEL
+        ])
+        logger.info("spaCy model downloaded")
         return True
-    except OSError:
-        print("📦 Downloading spaCy model...")
-        try:
-            subprocess.check_call([
-                sys.executable, "-m", "spacy", "download", "en_core_web_sm"
-            ])
-            print("✅ spaCy model downloaded")
-            return True
-        except Exception as e:
-            print(f"❌ Failed to download spaCy model: {e}")
-            return False
-
-# Ensure model is available before importing modules that use it
-if not ensure_spacy_model():
-    print("⚠️ Warning: spaCy model not available. Some features may not work.")
+    except Exception as e:
+        logger.error("Failed to download spaCy model: %s", e)
+        return False
 
-from src.verifier import Verifier
-from src.utils import compute_hash
+if not ensure_spacy_model():
+    logger.warning("spaCy model not available. Some features may not work.")
 
 app = Flask(__name__)
 
@@ -49,20 +57,298 @@ else:
     # In development, allow all origins
     CORS(app)
 
-# Initialize the verifier
-verifier = Verifier()
+class UploadRequest(Request):
+    """Request whose file uploads are streamed to disk and hashed as they arrive."""
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return HashingSpool(UPLOAD_DIR)
+
+app.request_class = UploadRequest
+
+# Uploads are spooled here (default: the system temp directory), so it needs room for
+# MAX_UPLOAD_MB per concurrent upload
+UPLOAD_DIR = os.environ.get('UPLOAD_DIR') or None
+
+# Largest accepted upload; bigger requests get 413 before their body is read
+app.config['MAX_CONTENT_LENGTH'] = int(os.environ.get('MAX_UPLOAD_MB', 1024)) * 1024 * 1024
+
+# Per-process state (the verifiers, job queue and result cache, with their SQLite connections
+# and threads) is built on first use by get_services(). preload() only imports modules and loads
+# the spaCy pipeline, so a preforking server can run it once before forking and share the memory.
+services = None
+services_lock = threading.Lock()
+
+def get_services():
+    """Build this process's verifiers, job queue and result cache on first use."""
+    global services
+    if services is None:
+        with services_lock:
+            if services is None:
+                from src.config import VerificationConfig
+                from src.verifier import Verifier
+                from src.streaming import StreamingVerifier
+                from src.incremental import IncrementalVerifier, VerificationStateStore
+
+                # VERIFIER_CONFIG is a JSON file of check thresholds, e.g. the tuner's best_config.json
+                config = VerificationConfig.load(os.environ['VERIFIER_CONFIG']) if os.environ.get('VERIFIER_CONFIG') else None
+                # VERIFIER_EXECUTOR=process runs the checks concurrently on a process pool
+                verifier = Verifier(executor=os.environ.get('VERIFIER_EXECUTOR', 'sequential'),
+                                    authenticity_db=os.environ.get('AUTHENTICITY_DB') or None,
+                                    near_duplicates_db=os.environ.get('NEAR_DUPLICATES_DB') or None,
+                                    config=config)
+                # STREAMING_APPROXIMATE_DUPLICATES=1 estimates duplicates of streamed uploads in fixed memory
+                streaming_verifier = StreamingVerifier(
+                    verifier, approximate_duplicates=os.environ.get('STREAMING_APPROXIMATE_DUPLICATES') == '1')
+                # Saved verification state for appended dataset versions (keep_state / previous_verification_id)
+                incremental_verifier = None
+                if os.environ.get('VERIFICATION_STATE_DIR'):
+                    incremental_verifier = IncrementalVerifier(
+                        streaming_verifier, VerificationStateStore(os.environ['VERIFICATION_STATE_DIR']))
+                # Asynchronous verification jobs (POST /api/verify with async=true)
+                job_queue = JobQueue(JobStore(os.environ.get('JOBS_DB', ':memory:')),
+                                     workers=int(os.environ.get('JOB_WORKERS', 2)),
+                                     max_pending=int(os.environ.get('JOB_QUEUE_LIMIT', 16)))
+                # Results of earlier verifications, keyed by file content, dataset name and verifier version
+                result_cache = ResultCache(max_bytes=int(os.environ.get('RESULT_CACHE_MB', 64)) * 1024 * 1024,
+                                           path=os.environ.get('RESULT_CACHE_DB') or None)
+                services = SimpleNamespace(verifier=verifier, streaming_verifier=streaming_verifier,
+                                           incremental_verifier=incremental_verifier,
+                                           job_queue=job_queue, result_cache=result_cache)
+    return services
+
+def preload():
+    """Import the verifier modules and load the spaCy pipeline, without opening any per-process state."""
+    import src.incremental
+    import src.ingest
+    import src.verifier
+    from src.models import pii_pipeline
+    try:
+        pii_pipeline()
+    except OSError as e:
+        logger.warning("spaCy model could not be loaded: %s", e)
+
+def warm_up():
+    """Load everything ahead of the first upload."""
+    preload()
+    get_services()
+
+def shutdown(timeout=30):
+    """Let running verification jobs finish (up to timeout seconds) and release this process's state."""
+    if services is None:
+        return
+    if not services.job_queue.shutdown(timeout):
+        logger.warning("Verification jobs still running at shutdown")
+    services.verifier.close()
+
+@app.errorhandler(413)
+def upload_too_large(e):
+    return jsonify({'error': f"Upload exceeds the {app.config['MAX_CONTENT_LENGTH'] // (1024 * 1024)}MB limit"}), 413
+
+SUPPORTED_EXTENSIONS = ['.csv', '.xls', '.xlsx', '.json', '.jsonl', '.ndjson', '.parquet', '.feather']
+
+# CSV / JSON-lines uploads larger than this are verified chunk by chunk
+STREAMING_THRESHOLD_BYTES = int(os.environ.get('STREAMING_THRESHOLD_MB', 50)) * 1024 * 1024
+
+# Hold in-memory uploads in compact dtypes (categoricals, narrow numbers, Arrow strings) while they are verified
+COMPACT_FRAMES = os.environ.get('COMPACT_FRAMES') == '1'
+
+# Uploads with more rows than this get a sampled PII scan instead of a full one
+PII_SAMPLE_ROWS = int(os.environ.get('PII_SAMPLE_ROWS', 100000))
+
+# ALLOW_PROFILING=1 lets a request ask for a profiler report (profile=cprofile|pyinstrument)
+ALLOW_PROFILING = os.environ.get('ALLOW_PROFILING', '').lower() in ('1', 'true', 'yes')
+
+metrics.describe("verifier_http_requests_total", "counter", "HTTP requests, by endpoint and status.")
+metrics.describe("verifier_upload_bytes_total", "counter", "Bytes of uploaded dataset files.")
+metrics.describe("verifier_result_cache_hits_total", "counter", "Result cache hits.")
+metrics.describe("verifier_result_cache_misses_total", "counter", "Result cache misses.")
+metrics.describe("verifier_result_cache_bytes", "gauge", "Size of the in-memory result cache.")
+metrics.describe("verifier_jobs_pending", "gauge", "Asynchronous verifications queued or running.")
+
+def choose_pii_mode(row_count, requested=None):
+    """Pick the PII scan mode for an upload, honouring an explicit request.
+
+    row_count is None for streamed uploads, which are always large.
+    """
+    if requested in ('exhaustive', 'sampled'):
+        return requested
+    return 'sampled' if row_count is None or row_count > PII_SAMPLE_ROWS else 'exhaustive'
+
+def build_response(verification_result, content_hash):
+    """Shape a verification report into the /api/verify response."""
+    # Generate IPFS CID (mock for now)
+    dataset_hash = verification_result['datasetHash']
+    mock_cid = f"ipfs://{content_hash[:16]}"
+    verification_result['details']['datasetCID'] = mock_cid
+
+    return {
+        'isVerified': verification_result['isVerified'],
+        'verificationHash': verification_result['verificationHash'],
+        'datasetHash': dataset_hash,
+        'qualityScore': verification_result['qualityScore'],
+        'details': {
+            'missingValues': verification_result['details']['quality']['missingRatio'] * 100,
+            'anomaliesDetected': verification_result['details']['quality']['anomalies'],
+            'biasScore': verification_result['details']['bias_score'],
+            'piiDetected': verification_result['details']['pii_detected'],
+            'piiCount': verification_result['details']['pii_count'],
+            'piiScanMode': verification_result['details']['pii_scan']['mode'],
+            'overallQuality': verification_result['qualityScore'],
+            'diversity': verification_result['details']['diversity'],
+            'duplicates': verification_result['details']['quality']['duplicates'],
+            'datasetCID': mock_cid,
+            'analysisReport': verification_result['analysisReport'],
+            'nearDuplicates': verification_result['details'].get('near_duplicates'),
+            'incremental': verification_result['details'].get('incremental')
+        },
+        'verificationId': verification_result.get('verificationId')
+    }
+
+@app.after_request
+def count_request(response):
+    metrics.inc("verifier_http_requests_total", endpoint=request.endpoint or "none", status=response.status_code)
+    return response
+
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Prometheus metrics of this process."""
+    if services is not None:
+        cache = services.result_cache.stats()
+        metrics.set("verifier_result_cache_hits_total", cache["hits"])
+        metrics.set("verifier_result_cache_misses_total", cache["misses"])
+        metrics.set("verifier_result_cache_bytes", cache["bytes"])
+        metrics.set("verifier_jobs_pending", services.job_queue.pending)
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
 
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint for deployment platforms"""
-    return jsonify({'status': 'healthy', 'service': 'DataX AI Verification'}), 200
+    return jsonify({'status': 'healthy', 'service': 'DataX AI Verification',
+                    'verifierLoaded': services is not None, 'modelsLoaded': models.loaded()}), 200
+
+def verify_upload(progress, upload_path, content_hash, file_extension, name, options=None):
+    """Verify an uploaded file and return the /api/verify response body.
+
+    content_hash is the SHA-256 of the file, computed while it was
+    spooled. options holds the optional form fields (pii_mode,
+    keep_state, previous_verification_id, timings, trace_memory,
+    profile, register). Identical re-uploads are answered from the result cache,
+    except when timings or a profile were asked for: those measure a
+    fresh run. The key covers the state of the authenticity and
+    near-duplicate indexes, so registering a dataset retires cached
+    reports that could now answer differently.
+    """
+    options = options or {}
+    if options.get('timings') or options.get('profile'):
+        return run_verification(progress, upload_path, content_hash, file_extension, name, options)
+    stack = get_services()
+    version = f"{stack.verifier.config_version()}.{stack.verifier.registry_version()}"
+    key = cache_key(content_hash, name, version, json.dumps(options, sort_keys=True))
+    return stack.result_cache.get_or_compute(
+        key, lambda: run_verification(progress, upload_path, content_hash, file_extension, name, options))
+
+def run_verification(progress, upload_path, content_hash, file_extension, name, options):
+    """Parse an uploaded file from disk, run the verifier on it and shape the response.
+
+    With the timings option the response gets a per-stage / per-column
+    breakdown, with profile the profiler's report of the hottest calls.
+    """
+    from src.instrumentation import Instrumentation, profile_call
+
+    instrumentation = Instrumentation(options.get('trace_memory', False)) if options.get('timings') else None
+    try:
+        def run():
+            return run_verifier(progress, upload_path, file_extension, name, options, instrumentation)
+
+        if options.get('profile'):
+            verification_result, profile = profile_call(run, options['profile'])
+        else:
+            verification_result, profile = run(), None
+    finally:
+        if instrumentation is not None:
+            instrumentation.close()
+    if options.get('register'):
+        # Publishing the dataset: later verifications of the same data report is_authentic=false
+        get_services().verifier.register(verification_result, name)
+    response = build_response(verification_result, content_hash)
+    if instrumentation is not None:
+        response['timings'] = dict(verification_result['details']['instrumentation'],
+                                   total=verification_result['details']['timings']['total'])
+    if profile is not None:
+        response['profile'] = profile
+    return response
+
+def run_verifier(progress, upload_path, file_extension, name, options, instrumentation=None):
+    """Run the verifier that fits the upload and return its report."""
+    from src.ingest import load_frame
+
+    stack = get_services()
+    verifier, streaming_verifier, incremental_verifier = (
+        stack.verifier, stack.streaming_verifier, stack.incremental_verifier)
+    requested_pii_mode = options.get('pii_mode')
+    keep_state = incremental_verifier is not None and options.get('keep_state')
+    if options.get('previous_verification_id'):
+        # The upload only holds the rows appended since the previous verification
+        return incremental_verifier.verify_delta(
+            options['previous_verification_id'], upload_path, name,
+            STREAM_FORMATS[file_extension], progress=progress, instrumentation=instrumentation)
+
+    if file_extension in STREAM_FORMATS and os.path.getsize(upload_path) > STREAMING_THRESHOLD_BYTES:
+        pii_mode = choose_pii_mode(None, requested_pii_mode)
+        stream_verifier = incremental_verifier if keep_state else streaming_verifier
+        return stream_verifier.verify_file(upload_path, name, STREAM_FORMATS[file_extension], pii_mode=pii_mode,
+                                           progress=progress, instrumentation=instrumentation)
+
+    # Saved state is built from the frame's own dtypes, so it is not compacted
+    df = load_frame(upload_path, INGEST_FORMATS[file_extension], compact=COMPACT_FRAMES and not keep_state)
+
+    # Verify the dataset
+    pii_mode = choose_pii_mode(len(df), requested_pii_mode)
+    if keep_state:
+        return incremental_verifier.verify_frame(df, name, pii_mode=pii_mode, progress=progress,
+                                                 instrumentation=instrumentation)
+    return verifier.verify_dataset(df, name, pii_mode=pii_mode, progress=progress, instrumentation=instrumentation)
+
+def request_options():
+    """Optional /api/verify form fields that change how an upload is verified."""
+    options = {}
+    if request.form.get('pii_mode'):
+        options['pii_mode'] = request.form['pii_mode']
+    if request.form.get('keep_state', '').lower() in ('1', 'true', 'yes'):
+        options['keep_state'] = True
+    if request.form.get('previous_verification_id'):
+        options['previous_verification_id'] = request.form['previous_verification_id']
+    if request.form.get('trace_memory', '').lower() in ('1', 'true', 'yes'):
+        options['timings'] = options['trace_memory'] = True
+    elif request.form.get('timings', '').lower() in ('1', 'true', 'yes'):
+        options['timings'] = True
+    if request.form.get('profile'):
+        options['profile'] = request.form['profile']
+    if request.form.get('register', '').lower() in ('1', 'true', 'yes'):
+        options['register'] = True
+    return options
+
+def job_response(job):
+    """Shape a stored job into the GET /api/verify/<job_id> response."""
+    response = {
+        'jobId': job['id'],
+        'status': job['status'],
+        'progress': {'stage': job['stage'], 'done': job['done'], 'total': job['total']},
+    }
+    if job['status'] == 'done':
+        response['result'] = job['result']
+    elif job['status'] == 'failed':
+        response['error'] = job['error']
+    elif job['cancel_requested']:
+        response['cancelRequested'] = True
+    return response
 
 @app.route('/api/verify', methods=['POST'])
 def verify_dataset():
     """
     Endpoint to verify a dataset file.
     Expects a file upload.
-    Returns verification results.
+    Returns verification results, or with async=true a job id to poll.
     """
     if 'file' not in request.files:
         return jsonify({'error': 'No file part'}), 400
@@ -74,51 +360,123 @@ def verify_dataset():
     
     # Get dataset name from request or use filename
     name = request.form.get('name', os.path.splitext(file.filename)[0])
+    file_extension = os.path.splitext(file.filename)[1].lower()
+    if file_extension not in SUPPORTED_EXTENSIONS:
+        return jsonify({'error': 'Unsupported file format'}), 400
+    run_async = request.values.get('async', '').lower() in ('1', 'true', 'yes')
+    options = request_options()
+    if options.get('previous_verification_id') or options.get('keep_state'):
+        if get_services().incremental_verifier is None:
+            return jsonify({'error': 'Incremental verification is not enabled'}), 400
+        if options.get('previous_verification_id') and file_extension not in STREAM_FORMATS:
+            return jsonify({'error': 'Appended rows must be uploaded as CSV or JSON lines'}), 400
+    if options.get('profile'):
+        if not ALLOW_PROFILING:
+            return jsonify({'error': 'Profiling is not enabled'}), 403
+        if options['profile'] not in PROFILERS:
+            return jsonify({'error': f"Unknown or unavailable profiler, expected one of {PROFILERS}"}), 400
     
     try:
-        # Read the file based on extension
-        file_content = file.read()
-        file_extension = os.path.splitext(file.filename)[1].lower()
-        
-        if file_extension == '.csv':
-            df = pd.read_csv(io.BytesIO(file_content))
-        elif file_extension in ['.xls', '.xlsx']:
-            df = pd.read_excel(io.BytesIO(file_content))
-        elif file_extension == '.json':
-            df = pd.read_json(io.BytesIO(file_content))
-        else:
-            return jsonify({'error': 'Unsupported file format'}), 400
-        
-        # Verify the dataset
-        verification_result = verifier.verify_dataset(df, name)
-        
-        # Generate IPFS CID (mock for now)
-        dataset_hash = verification_result['datasetHash']
-        mock_cid = f"ipfs://{hashlib.sha256(file_content).hexdigest()[:16]}"
-        verification_result['details']['datasetCID'] = mock_cid
-        
-        return jsonify({
-            'isVerified': verification_result['isVerified'],
-            'verificationHash': verification_result['verificationHash'],
-            'datasetHash': dataset_hash,
-            'qualityScore': verification_result['qualityScore'],
-            'details': {
-                'missingValues': verification_result['details']['quality']['missingRatio'] * 100,
-                'anomaliesDetected': verification_result['details']['quality']['anomalies'],
-                'biasScore': verification_result['details']['bias_score'],
-                'piiDetected': verification_result['details']['pii_detected'],
-                'overallQuality': verification_result['qualityScore'],
-                'diversity': verification_result['details']['diversity'],
-                'duplicates': verification_result['details']['quality']['duplicates'],
-                'datasetCID': mock_cid,
-                'analysisReport': verification_result['analysisReport']
-            }
-        })
-    
+        # The parser has already streamed the file into a HashingSpool on disk
+        spool = file.stream
+        spool.flush()
+        content_hash = spool.hexdigest()
+        metrics.inc("verifier_upload_bytes_total", spool.size)
+
+        if run_async:
+            # The job outlives the request, so it takes over the spooled file and deletes it once over,
+            # even if it never runs (cancelled while queued, or failed at shutdown)
+            upload_path = spool.keep()
+            try:
+                job_id = get_services().job_queue.submit(
+                    verify_upload, upload_path, content_hash, file_extension, name, options, cleanup=spool.remove)
+            except QueueFull:
+                spool.remove()
+                return jsonify({'error': 'Verification queue is full, retry later'}), 429, {'Retry-After': '30'}
+            return jsonify({'jobId': job_id, 'status': 'queued', 'statusUrl': f'/api/verify/{job_id}'}), 202
+
+        return jsonify(verify_upload(None, spool.path, content_hash, file_extension, name, options))
+
+    except Exception as e:
+        from src.incremental import UnknownVerification
+        if isinstance(e, UnknownVerification):
+            return jsonify({'error': str(e)}), 404
+        logger.exception("Error processing file")
+        return jsonify({'error': str(e)}), 500
+
+def parse_grid(field):
+    """A comma-separated list of non-negative numbers from the form, or None."""
+    if not request.form.get(field):
+        return None
+    values = [float(value) for value in request.form[field].split(',')]
+    if any(value < 0 for value in values):
+        raise ValueError(f"{field} must be non-negative")
+    return values
+
+@app.route('/api/anomaly-curves', methods=['POST'])
+def anomaly_curves():
+    """Range and outlier counts per numeric column over grids of IQR multipliers and MAD z-score thresholds.
+
+    Optional form fields iqr_multipliers and z_thresholds are comma-separated
+    grids. The file is loaded in memory, so it is limited to uploads the
+    in-memory verifier handles.
+    """
+    from src.ingest import load_frame
+
+    file = request.files.get('file')
+    if file is None or file.filename == '':
+        return jsonify({'error': 'No file part'}), 400
+    file_extension = os.path.splitext(file.filename)[1].lower()
+    if file_extension not in SUPPORTED_EXTENSIONS:
+        return jsonify({'error': 'Unsupported file format'}), 400
+    try:
+        grids = {'iqr_multipliers': parse_grid('iqr_multipliers'), 'z_thresholds': parse_grid('z_thresholds')}
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    spool = file.stream
+    spool.flush()
+    try:
+        df = load_frame(spool.path, INGEST_FORMATS[file_extension])
+    except ValueError as e:
+        # pandas and pyarrow report malformed files (bad magic bytes, encoding, structure) as ValueError
+        return jsonify({'error': f"Could not parse the file: {e}"}), 400
+    try:
+        quality_check = get_services().verifier.quality_check
+        index = quality_check.threshold_index(df)
+        curves = quality_check.anomaly_curves(index, **{name: grid for name, grid in grids.items() if grid is not None})
     except Exception as e:
-        print(f"Error processing file: {e}")
+        logger.exception("Error computing anomaly curves")
         return jsonify({'error': str(e)}), 500
+    return jsonify({'columns': curves, 'maxAnomaliesPerColumn': index.max_anomalies_per_col})
+
+@app.route('/api/cache/stats', methods=['GET'])
+def cache_stats():
+    """Result cache hit/miss counters and size."""
+    return jsonify(get_services().result_cache.stats())
+
+@app.route('/api/verify/<job_id>', methods=['GET'])
+def verify_status(job_id):
+    """Progress, and once finished the result, of an asynchronous verification."""
+    job = get_services().job_queue.status(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown job'}), 404
+    return jsonify(job_response(job))
+
+@app.route('/api/verify/<job_id>', methods=['DELETE'])
+def cancel_verification(job_id):
+    """Cancel a queued or running asynchronous verification."""
+    job_queue = get_services().job_queue
+    if not job_queue.cancel(job_id):
+        job = job_queue.status(job_id)
+        if job is None:
+            return jsonify({'error': 'Unknown job'}), 404
+        return jsonify({'error': f"Job already {job['status']}"}), 409
+    return jsonify(job_response(job_queue.status(job_id)))
 
 if __name__ == '__main__':
+    # Development server; production runs gunicorn with gunicorn.conf.py (see DEPLOYMENT.md)
     port = int(os.environ.get('PORT', 5000))
+    if os.environ.get('PRELOAD_MODELS', '1').lower() not in ('0', 'false', 'no'):
+        # Load in the background: /health answers at once, the first upload finds everything ready
+        threading.Thread(target=warm_up, daemon=True).start()
     app.run(host='0.0.0.0', port=port, debug=True) 
\ No newline at end of file
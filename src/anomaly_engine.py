@@ -0,0 +1,219 @@
+from collections import defaultdict
+import numpy as np
+from .column_profile import PCA_COLUMN
+from .config import VerificationConfig
+from .instrumentation import current
+
+# Default points of the anomaly-count curves
+IQR_MULTIPLIER_GRID = [1.0, 1.5, 2.0, 3.0, 4.0, 6.0, 8.0, 10.0, 15.0, 20.0, 30.0]
+Z_THRESHOLD_GRID = [2.0, 3.0, 4.0, 6.0, 8.0, 10.0, 12.0, 15.0, 20.0, 30.0, 50.0]
+
+class AnomalyStatistics:
+    """The threshold-independent part of anomaly counting for one dataset.
+
+    Holds the per-column counts that no threshold affects (non-numeric,
+    negative, skipped) and, per block of scored columns, the (log-)
+    transformed values, their quartiles and their absolute MAD z-scores.
+    AnomalyEngine.count turns it into anomaly counts for any config
+    without touching the data again. With indexed=True the values and
+    z-scores are kept sorted per column (NaN last), so each count is a
+    pair of binary searches instead of a pass over the column.
+    """
+
+    def __init__(self, profiles, counts, blocks, max_anomalies_per_col, indexed=False):
+        self.profiles = profiles
+        self.counts = counts
+        self.blocks = blocks
+        self.max_anomalies_per_col = max_anomalies_per_col
+        self.indexed = indexed
+
+class AnomalyEngine:
+    """Batched IQR / MAD anomaly counting over every numeric column at once.
+
+    Columns are stacked into 2-D float64 blocks (one block per distinct
+    non-null length) so quartiles, medians, MADs and outlier counts are
+    computed with a handful of array operations instead of a pandas pass
+    per column. Counts match the per-column rules exactly. Thresholds come
+    from a VerificationConfig; prepare() does the work that does not depend
+    on them, so count() can be repeated cheaply for other configs.
+    """
+
+    def __init__(self, config=None):
+        self.config = config or VerificationConfig()
+
+    def count_anomalies(self, profiles, numeric_cols, n_rows):
+        """Return per-column anomaly counts for the numeric columns."""
+        return self.count(self.prepare(profiles, numeric_cols, n_rows))
+
+    def prepare(self, profiles, numeric_cols, n_rows, index=False):
+        """Compute the AnomalyStatistics of the numeric columns (sorted per column with index=True)."""
+        max_anomalies_per_col = int(n_rows * 0.01)
+        counts = {}
+        blocks = []
+        groups = defaultdict(list)
+        for col in numeric_cols:
+            profile = profiles[col]
+            counts[col] = {
+                "non_numeric": min(profile.invalid_count, max_anomalies_per_col),
+                "negative": 0,
+                "range": 0,
+                "outlier": 0,
+                "skipped": False,
+            }
+            if profile.count > 0:
+                groups[profile.count].append(col)
+
+        for count, cols in groups.items():
+            block = np.column_stack([profiles[col].numeric.to_numpy(dtype="float64") for col in cols])
+            is_constant = np.isclose(block, block[0], rtol=1e-5, atol=1e-8).all(axis=0)
+            active = []
+            for i, col in enumerate(cols):
+                if self.should_skip(col, profiles[col], is_constant[i]):
+                    counts[col]["skipped"] = True
+                else:
+                    active.append(i)
+            if active:
+                current().count("anomaly_values_scored", count * len(active))
+                blocks.extend(self._block_statistics(block[:, active], [cols[i] for i in active], profiles, counts,
+                                                     max_anomalies_per_col))
+        if index:
+            for block in blocks:
+                self._index_block(block)
+        return AnomalyStatistics(profiles, counts, blocks, max_anomalies_per_col, index)
+
+    def count(self, statistics, config=None):
+        """Per-column anomaly counts from prepared statistics, with config's thresholds (default: the engine's)."""
+        config = config or self.config
+        results = {col: dict(counts) for col, counts in statistics.counts.items()}
+        cap = statistics.max_anomalies_per_col
+        for block in statistics.blocks:
+            rules = [self.column_rules(col, statistics.profiles[col], config) for col in block["cols"]]
+            iqr_multipliers = np.array([rule["iqr_multiplier"] for rule in rules])
+            z_thresholds = np.array([rule["z_threshold"] for rule in rules])
+            if statistics.indexed:
+                range_counts = [self._range_count(block, i, iqr_multipliers[i]) for i in range(len(block["cols"]))]
+                outlier_counts = [self._outlier_count(block, i, z_thresholds[i]) for i in range(len(block["cols"]))]
+            else:
+                iqr = block["q3"] - block["q1"]
+                lower_bound = block["q1"] - iqr_multipliers * iqr
+                upper_bound = block["q3"] + iqr_multipliers * iqr
+                values = block["values"]
+                range_counts = ((values < lower_bound) | (values > upper_bound)).sum(axis=0)
+                outlier_counts = (block["deviations"] > z_thresholds).sum(axis=0)
+            for i, col in enumerate(block["cols"]):
+                results[col]["range"] = min(int(range_counts[i]), cap)
+                results[col]["outlier"] = min(int(outlier_counts[i]), cap)
+        return results
+
+    def curves(self, statistics, iqr_multipliers, z_thresholds, config=None):
+        """Anomaly-count curves of every scored column, from indexed statistics.
+
+        Returns {column: {"iqr_multipliers", "range", "z_thresholds",
+        "outlier", "iqr_multiplier", "z_threshold"}}: the range (IQR) and
+        outlier (MAD z-score) counts at each of the given non-negative
+        multipliers and thresholds, plus the column's thresholds under
+        config. Counts are not capped at 1% of the rows as the report's are.
+        """
+        if not statistics.indexed:
+            raise ValueError("Anomaly curves need statistics prepared with index=True")
+        config = config or self.config
+        iqr_multipliers = np.asarray(iqr_multipliers, dtype="float64")
+        z_thresholds = np.asarray(z_thresholds, dtype="float64")
+        curves = {}
+        for block in statistics.blocks:
+            for i, col in enumerate(block["cols"]):
+                rules = self.column_rules(col, statistics.profiles[col], config)
+                curves[col] = {
+                    "iqr_multipliers": iqr_multipliers.tolist(),
+                    "range": self._range_count(block, i, iqr_multipliers).tolist(),
+                    "z_thresholds": z_thresholds.tolist(),
+                    "outlier": self._outlier_count(block, i, z_thresholds).tolist(),
+                    "iqr_multiplier": rules["iqr_multiplier"],
+                    "z_threshold": rules["z_threshold"],
+                }
+        return curves
+
+    def _index_block(self, block):
+        """Replace a block's values and z-scores with per-column sorted copies (NaN sorts last)."""
+        block["sorted_values"] = np.sort(block.pop("values"), axis=0)
+        block["sorted_deviations"] = np.sort(block.pop("deviations"), axis=0)
+        block["valid_values"] = np.count_nonzero(~np.isnan(block["sorted_values"]), axis=0)
+        block["valid_deviations"] = np.count_nonzero(~np.isnan(block["sorted_deviations"]), axis=0)
+
+    def _range_count(self, block, i, multipliers):
+        """Values of column i below q1 - k * iqr or above q3 + k * iqr, for multiplier(s) k >= 0."""
+        iqr = block["q3"][i] - block["q1"][i]
+        if np.isnan(iqr):
+            return np.zeros(np.shape(multipliers), dtype=np.int64)
+        column = block["sorted_values"][:, i]
+        below = np.searchsorted(column, block["q1"][i] - multipliers * iqr, side="left")
+        above = block["valid_values"][i] - np.searchsorted(column, block["q3"][i] + multipliers * iqr, side="right")
+        return below + above
+
+    def _outlier_count(self, block, i, thresholds):
+        """Values of column i whose absolute MAD z-score exceeds the threshold(s)."""
+        column = block["sorted_deviations"][:, i]
+        return block["valid_deviations"][i] - np.searchsorted(column, thresholds, side="right")
+
+    def should_skip(self, col, profile, is_constant):
+        """Sparse, binary, constant or low-variation columns get no outlier checks."""
+        std_val = profile.std
+        return (profile.numeric_unique_count <= 2 or std_val < 1e-2 or is_constant or profile.count < 20 or
+                (col in ['Work Pressure', 'Job Satisfaction'] and std_val < 0.1))
+
+    def column_rules(self, col, profile, config=None):
+        """Per-column thresholds: PCA-like and Amount columns get wider bounds."""
+        config = config or self.config
+        is_pca_like = (abs(profile.mean) < 0.1 and 0.5 < profile.std < 2.0) or bool(PCA_COLUMN.match(col))
+        is_amount = col.lower() == "amount"
+        return {
+            "is_pca_like": is_pca_like,
+            "is_non_negative": profile.min >= 0,
+            "log_transform": is_amount,
+            "iqr_multiplier": (config.iqr_multiplier_pca if is_pca_like else
+                               config.iqr_multiplier_amount if is_amount else config.iqr_multiplier),
+            "z_threshold": (config.mad_threshold_pca if is_pca_like else
+                            config.mad_threshold_amount if is_amount else config.mad_threshold),
+        }
+
+    def _block_statistics(self, block, cols, profiles, counts, max_anomalies_per_col):
+        """Transform a block of scored columns and compute its quartiles and MAD z-scores."""
+        fallback = np.zeros(len(cols), dtype=bool)
+        transformed = block.copy()
+        for i, col in enumerate(cols):
+            rules = self.column_rules(col, profiles[col])
+            if rules["log_transform"]:
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    transformed[:, i] = np.log1p(block[:, i])
+                fallback[i] = np.isnan(transformed[:, i]).any()
+            if not (rules["is_pca_like"] or rules["is_non_negative"]):
+                counts[col]["negative"] = min(int((block[:, i] < 0).sum()), max_anomalies_per_col)
+
+        blocks = []
+        # Columns whose log transform produced NaN keep pandas' NaN-skipping semantics
+        for i in np.flatnonzero(fallback):
+            column = transformed[:, i]
+            valid = column[~np.isnan(column)]
+            q1 = q3 = median = mad = np.nan
+            if len(valid) > 0:
+                q1, q3 = np.quantile(valid, [0.25, 0.75])
+                median = np.median(valid)
+                mad = np.median(np.abs(column - median))
+            blocks.append(self._statistics(column[:, None], np.array([q1]), np.array([q3]), np.array([median]),
+                                           np.array([mad]), [cols[i]], profiles))
+
+        batched = np.flatnonzero(~fallback)
+        if len(batched) > 0:
+            transformed = transformed[:, batched]
+            q1, q3 = np.quantile(transformed, [0.25, 0.75], axis=0)
+            median = np.median(transformed, axis=0)
+            mad = np.median(np.abs(transformed - median), axis=0)
+            blocks.append(self._statistics(transformed, q1, q3, median, mad, [cols[i] for i in batched], profiles))
+        return blocks
+
+    def _statistics(self, transformed, q1, q3, median, mad, cols, profiles):
+        stds = np.array([profiles[col].std for col in cols], dtype="float64")
+        mad = np.where(mad == 0, np.where(stds != 0, stds, 1.0), mad)
+        with np.errstate(invalid="ignore"):
+            deviations = np.abs(0.6745 * (transformed - median) / mad)
+        return {"cols": cols, "values": transformed, "q1": q1, "q3": q3, "deviations": deviations}
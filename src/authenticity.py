@@ -1,9 +1,192 @@
+import contextlib
+import fcntl
+import hashlib
+import math
+import os
+import sqlite3
+import threading
+import time
+import numpy as np
+
+def fingerprint_digest(dataset_hash):
+    """32-byte digest for a dataset hash ("0x" + SHA-256 hex, or any other string)."""
+    text = str(dataset_hash)
+    if text.startswith("0x") and len(text) == 66:
+        try:
+            return bytes.fromhex(text[2:])
+        except ValueError:
+            pass
+    return hashlib.sha256(text.encode("utf-8")).digest()
+
+class BloomFilter:
+    """Bloom filter over 32-byte digests, in memory or memory-mapped from a file.
+
+    Bit positions come from double hashing two 64-bit slices of the digest,
+    which is already uniformly distributed. A file-backed filter is shared
+    by every process that maps it; writers serialize on a file lock so
+    concurrent read-modify-writes of the same byte cannot drop bits.
+    """
+
+    def __init__(self, capacity, error_rate=0.001, path=None, refill=None):
+        """refill() yields batches of digests to load when a file-backed filter is (re)created."""
+        self.bits = max(8, int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)))
+        self.bits += -self.bits % 8
+        self.hashes = max(1, round(self.bits / capacity * math.log(2)))
+        self.path = path
+        self.created = True
+        if path is None:
+            self.array = np.zeros(self.bits // 8, dtype=np.uint8)
+            return
+        with self._locked():
+            self.created = not (os.path.exists(path) and os.path.getsize(path) == self.bits // 8)
+            self.array = np.memmap(path, dtype=np.uint8, mode="w+" if self.created else "r+", shape=(self.bits // 8,))
+            if self.created and refill is not None:
+                # Refilled under the lock, so writers in other processes cannot interleave with the rebuild
+                for digests in refill():
+                    self._set(self._positions_of(digests))
+
+    @contextlib.contextmanager
+    def _locked(self):
+        with open(self.path + ".lock", "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _positions(self, digest):
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:16], "little") | 1
+        return [(h1 + i * h2) % self.bits for i in range(self.hashes)]
+
+    def add(self, digest):
+        self.add_many([digest])
+
+    def _positions_of(self, digests):
+        return np.array([position for digest in digests for position in self._positions(digest)], dtype=np.int64)
+
+    def add_many(self, digests):
+        positions = self._positions_of(digests)
+        if self.path is None:
+            self._set(positions)
+            return
+        with self._locked():
+            self._set(positions)
+
+    def _set(self, positions):
+        np.bitwise_or.at(self.array, positions >> 3, (1 << (positions & 7)).astype(np.uint8))
+
+    def __contains__(self, digest):
+        array = self.array
+        return all(array[position >> 3] & (1 << (position & 7)) for position in self._positions(digest))
+
+class AuthenticityIndex:
+    """Persistent index of published dataset fingerprints.
+
+    SQLite (WAL mode, so readers never block the single writer) is the source
+    of truth; a Bloom filter in front answers most lookups of unseen
+    datasets without touching it. With path=None both live in memory.
+    Bloom bits are set before the row is committed, so the filter never
+    reports a false negative for a committed fingerprint. The filter is
+    only allocated on first use; an in-memory index that nothing was
+    registered in never allocates it.
+    """
+
+    def __init__(self, path=None, capacity=10_000_000, error_rate=0.001):
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path or ":memory:", check_same_thread=False, isolation_level=None, timeout=30)
+        if path:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS fingerprints (
+                digest BLOB PRIMARY KEY,
+                dataset_name TEXT,
+                first_seen REAL NOT NULL
+            ) WITHOUT ROWID""")
+        # Bumped by every registration that adds a fingerprint, so cached reports can be versioned
+        self.conn.execute("CREATE TABLE IF NOT EXISTS generation (id INTEGER PRIMARY KEY CHECK (id = 0), value INTEGER NOT NULL)")
+        self.conn.execute("INSERT OR IGNORE INTO generation VALUES (0, 0)")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._bloom = None
+
+    @property
+    def bloom(self):
+        if self._bloom is None:
+            with self.lock:
+                if self._bloom is None:
+                    # A new or resized filter file is refilled from the authoritative table
+                    self._bloom = BloomFilter(self.capacity, self.error_rate, self.path + ".bloom" if self.path else None,
+                                              refill=self._stored_digests)
+        return self._bloom
+
+    def _stored_digests(self, batch=100_000):
+        cursor = self.conn.execute("SELECT digest FROM fingerprints")
+        while True:
+            rows = cursor.fetchmany(batch)
+            if not rows:
+                return
+            yield [digest for (digest,) in rows]
+
+    def contains(self, dataset_hash):
+        """True if the fingerprint has been registered."""
+        if self._bloom is None and self.path is None:
+            # Nothing was registered in this in-memory index yet
+            return False
+        digest = fingerprint_digest(dataset_hash)
+        if digest not in self.bloom:
+            return False
+        with self.lock:
+            return self.conn.execute("SELECT 1 FROM fingerprints WHERE digest = ?", (digest,)).fetchone() is not None
+
+    def add(self, dataset_hash, dataset_name=None):
+        """Register a fingerprint; returns False if it was already registered."""
+        digest = fingerprint_digest(dataset_hash)
+        self.bloom.add(digest)
+        with self.lock:
+            self.conn.execute("BEGIN")
+            added = self.conn.execute("INSERT OR IGNORE INTO fingerprints (digest, dataset_name, first_seen) VALUES (?, ?, ?)",
+                                      (digest, dataset_name, time.time())).rowcount == 1
+            if added:
+                self.conn.execute("UPDATE generation SET value = value + 1")
+            self.conn.execute("COMMIT")
+        return added
+
+    def add_many(self, dataset_hashes):
+        """Register many fingerprints in one transaction; returns how many were new."""
+        digests = [fingerprint_digest(dataset_hash) for dataset_hash in dataset_hashes]
+        self.bloom.add_many(digests)
+        now = time.time()
+        with self.lock:
+            before = self.conn.total_changes
+            self.conn.execute("BEGIN")
+            self.conn.executemany("INSERT OR IGNORE INTO fingerprints (digest, first_seen) VALUES (?, ?)",
+                                  ((digest, now) for digest in digests))
+            added = self.conn.total_changes - before
+            if added:
+                self.conn.execute("UPDATE generation SET value = value + 1")
+            self.conn.execute("COMMIT")
+            return added
+
+    def generation(self):
+        """Count of registrations that added fingerprints; changes whenever lookups may answer differently."""
+        with self.lock:
+            return self.conn.execute("SELECT value FROM generation").fetchone()[0]
+
+    def __len__(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM fingerprints").fetchone()[0]
+
 class AuthenticityCheck:
-    def __init__(self):
-        self.existing_hashes = set()
+    def __init__(self, index=None):
+        self.index = index if index is not None else AuthenticityIndex()
 
     def check_authenticity(self, dataset_hash):
-        """Check for duplicate datasets."""
-        is_duplicate = dataset_hash in self.existing_hashes
-        self.existing_hashes.add(dataset_hash)
-        return not is_duplicate
\ No newline at end of file
+        """True unless the dataset's fingerprint was registered (published) before; registers nothing."""
+        return not self.index.contains(dataset_hash)
+
+    def register(self, dataset_hash, dataset_name=None):
+        """Register (publish) a fingerprint; returns False if it was already registered."""
+        return self.index.add(dataset_hash, dataset_name)
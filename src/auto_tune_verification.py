@@ -1,36 +1,131 @@
 import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-import pandas as pd
+import argparse
 import json
-from src.verifier import Verifier
+import logging
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
+from src.anomaly_engine import AnomalyEngine
+from src.bias_check import BiasCheck
+from src.column_profile import profile_columns
+from src.config import VerificationConfig
+from src.ingest import load_frame
+from src.synthetic import DATASETS, make_dataset
+from src.utils import compute_hash
+from src.verifier import Verifier
+
+logger = logging.getLogger(__name__)
+
+# Range each threshold is searched in: (low, high, scale); "log" ranges are searched on a log scale
+SEARCH_SPACE = {
+    "iqr_multiplier_pca": (4.0, 30.0, "float"),
+    "mad_threshold_pca": (10.0, 80.0, "float"),
+    "iqr_multiplier_amount": (3.0, 12.0, "float"),
+    "mad_threshold_amount": (6.0, 24.0, "float"),
+    "iqr_multiplier": (2.0, 8.0, "float"),
+    "mad_threshold": (4.0, 16.0, "float"),
+    "expected_unique_categorical": (2, 20, "int"),
+    "expected_unique_numeric": (1000, 100000, "log"),
+}
+
+class PreparedDataset:
+    """Everything about a dataset that no tunable threshold affects, computed once.
+
+    Column profiles, the sorted threshold index of the numeric columns,
+    duplicates, the PII scan, relevance and the fingerprint are cached;
+    report(config) only binary-searches the index for the anomaly counts.
+    """
+
+    def __init__(self, name, df, verifier, pii_mode="exhaustive"):
+        self.name = name
+        self.n_rows = len(df)
+        self.n_cells = df.size
+        self.columns = list(df.columns)
+        self.size_kb = round(df.memory_usage(deep=True).sum() / 1024, 2)
+        self.dataset_hash = compute_hash(df)
+        self.profiles = profile_columns(df)
+        quality_check = verifier.quality_check
+        self.anomalies = quality_check.threshold_index(df, self.profiles)
+        self.duplicates = quality_check.count_duplicates(df)
+        self.pii_scan = verifier.pii_detection.scan(df, self.profiles, pii_mode)
+        self.relevance = verifier.relevance_check.check_relevance(df, name, self.profiles)
+        # Fill in the profiles' lazy statistics now, so evaluations (and pool workers) share them
+        BiasCheck().check_bias(None, self.profiles)
+
+    def report(self, verifier, config):
+        """The verification report of the dataset under config."""
+        column_anomalies = AnomalyEngine(config).count(self.anomalies)
+        quality = verifier.quality_check.summarize(self.profiles, self.n_rows, self.n_cells,
+                                                   column_anomalies, self.duplicates)
+        bias, bias_score, diversity = BiasCheck(config).check_bias(None, self.profiles)
+        return verifier.build_report(self.name, self.dataset_hash, self.n_rows, self.columns, self.size_kb,
+                                     quality, self.pii_scan, self.relevance, bias, bias_score, diversity)
+
+# The tuner and report-building Verifier of a pool worker, set by _init_tuning_worker
+_worker_tuner = None
+_worker_verifier = None
+
+def _init_tuning_worker(tuner):
+    global _worker_tuner, _worker_verifier
+    _worker_tuner = tuner
+    _worker_verifier = Verifier()
+
+def _evaluate_in_worker(values):
+    return _worker_tuner.evaluate(VerificationConfig(**values), _worker_verifier)
 
 class AutoTuneVerifier:
-    def __init__(self, datasets, max_iterations=50, target_score=13):
-        self.datasets = datasets
-        self.verifier = Verifier()
+    """Search the check thresholds (a VerificationConfig) that best match each dataset's target metrics.
+
+    datasets are file paths, names of synthetic reference datasets
+    (src/synthetic.py, generated with `rows` rows), or a {name: DataFrame}
+    dict. Each dataset is loaded and prepared once; a candidate config is
+    then scored from the cached statistics. Candidates are evaluated in
+    batches on a process pool: the first batch samples the search space
+    uniformly, later ones resample around the best quarter of the configs
+    seen so far (a cross-entropy search), with some uniform exploration.
+    The source tree is never modified; the best config is saved as JSON
+    for VERIFIER_CONFIG.
+    """
+
+    def __init__(self, datasets, max_iterations=50, target_score=13, workers=None, batch_size=None,
+                 config=None, seed=0, rows=100_000, pii_mode="exhaustive"):
         self.max_iterations = max_iterations
         self.target_score = target_score
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size or max(2 * self.workers, 8)
+        self.config = config or VerificationConfig()
+        self.rng = np.random.default_rng(seed)
         self.best_score = 0
         self.best_config = None
         self.best_reports = None
-        # Initial hyperparameters
-        self.config = {
-            "iqr_multiplier_pca": 8.0,
-            "mad_threshold_pca": 20.0,
-            "expected_unique_numeric": 10000,
-            "expected_unique_categorical": 10
-        }
+        self.trials = []
         self.iteration = 0
-        self.no_improvement_count = 0
+        verifier = Verifier()
+        self.datasets = [PreparedDataset(name, df, verifier, pii_mode)
+                         for name, df in self.load_datasets(datasets, rows, seed)]
+
+    def load_datasets(self, datasets, rows, seed):
+        """Yield (name, DataFrame) for every dataset."""
+        if isinstance(datasets, dict):
+            yield from datasets.items()
+            return
+        for dataset in datasets:
+            name = os.path.splitext(os.path.basename(dataset))[0]
+            if os.path.exists(dataset):
+                yield name, load_frame(dataset)
+            elif name in DATASETS:
+                logger.info("%s not found, generating %d synthetic rows", dataset, rows)
+                yield name, make_dataset(name, rows, seed)
+            else:
+                raise FileNotFoundError(dataset)
 
     def evaluate_report(self, report, dataset_name):
         """Evaluate report against target metrics."""
         score = 0
         details = report["details"]
         quality = details["quality"]
-        
+
         if dataset_name == "creditcard":
             # isVerified
             if report["isVerified"]:
@@ -71,110 +166,111 @@ class AutoTuneVerifier:
                 score += 1
         return score
 
-    def update_config(self):
-        """Adjust hyperparameters based on iteration."""
-        if self.no_improvement_count >= 10:
-            # Aggressive adjustment
-            self.config["iqr_multiplier_pca"] += np.random.uniform(-2.0, 2.0)
-            self.config["mad_threshold_pca"] += np.random.uniform(-5.0, 5.0)
-            self.config["expected_unique_numeric"] = int(self.config["expected_unique_numeric"] * np.random.uniform(0.5, 1.5))
-            self.no_improvement_count = 0
-        else:
-            # Incremental adjustment
-            self.config["iqr_multiplier_pca"] += np.random.uniform(-0.5, 0.5)
-            self.config["mad_threshold_pca"] += np.random.uniform(-2.0, 2.0)
-            self.config["expected_unique_numeric"] = int(self.config["expected_unique_numeric"] * np.random.uniform(0.9, 1.1))
-        # Ensure bounds
-        self.config["iqr_multiplier_pca"] = max(4.0, min(12.0, self.config["iqr_multiplier_pca"]))
-        self.config["mad_threshold_pca"] = max(10.0, min(30.0, self.config["mad_threshold_pca"]))
-        self.config["expected_unique_numeric"] = max(5000, min(20000, self.config["expected_unique_numeric"]))
-
-    def update_source_files(self):
-        """Update source files with current config."""
-        # Update quality_check.py
-        with open("src/quality_check.py", "r") as f:
-            lines = f.readlines()
-        with open("src/quality_check.py", "w") as f:
-            for line in lines:
-                if "iqr_multiplier = " in line and "is_pca_like" in line:
-                    line = f"                iqr_multiplier = {self.config['iqr_multiplier_pca']} if is_pca_like else 6.0 if col.lower() == 'amount' else 4.0\n"
-                elif "z_threshold = " in line and "is_pca_like" in line:
-                    line = f"                    z_threshold = {self.config['mad_threshold_pca']} if is_pca_like else 12.0 if col.lower() == 'amount' else 8.0\n"
-                f.write(line)
-        # Update bias_check.py
-        with open("src/bias_check.py", "r") as f:
-            lines = f.readlines()
-        with open("src/bias_check.py", "w") as f:
-            for line in lines:
-                if "expected_unique = " in line:
-                    line = f"                expected_unique = min(total_count, {self.config['expected_unique_categorical']} if col in categorical_cols or df[col].nunique() <= 2 else {self.config['expected_unique_numeric']})\n"
-                f.write(line)
-
-    def run_iteration(self):
-        """Run verification and evaluate."""
+    def evaluate(self, config, verifier):
+        """Score config over every dataset; returns (total score, {dataset name: report})."""
         reports = {}
         total_score = 0
-        for dataset_path in self.datasets:
-            dataset_name = dataset_path.split("/")[-1].split(".")[0]
-            df = pd.read_csv(dataset_path)
-            report = self.verifier.verify_dataset(df, dataset_name)
-            reports[dataset_name] = report
-            score = self.evaluate_report(report, dataset_name)
-            total_score += score
-            print(f"Iteration {self.iteration + 1}: {dataset_name} score = {score}/5")
-        
-        print(f"Iteration {self.iteration + 1}: Total score = {total_score}/15")
-        if total_score > self.best_score:
+        for dataset in self.datasets:
+            reports[dataset.name] = dataset.report(verifier, config)
+            total_score += self.evaluate_report(reports[dataset.name], dataset.name)
+        return total_score, reports
+
+    def sample(self, elite=None):
+        """Draw a candidate config: uniformly, or around the elite configs."""
+        values = {}
+        for name, (low, high, scale) in SEARCH_SPACE.items():
+            to_search, from_search = (np.log, np.exp) if scale == "log" else (float, float)
+            low_s, high_s = to_search(low), to_search(high)
+            if elite:
+                # Centre on one elite config, spread as widely as the elite disagree (at least 5% of the range)
+                points = [to_search(getattr(config, name) or high) for config in elite]
+                centre = points[self.rng.integers(len(points))]
+                value = self.rng.normal(centre, max(np.std(points), 0.05 * (high_s - low_s)))
+            else:
+                value = self.rng.uniform(low_s, high_s)
+            value = from_search(min(max(value, low_s), high_s))
+            values[name] = int(round(value)) if scale in ("int", "log") else round(value, 3)
+        return self.config.replace(**values)
+
+    def propose(self, count):
+        """The next batch of candidates; the starting config goes first."""
+        candidates = [] if self.trials else [self.config]
+        elite = None
+        if len(self.trials) >= self.batch_size:
+            ranked = sorted(self.trials, key=lambda trial: -trial[0])
+            elite = [config for _, config in ranked[:max(len(ranked) // 4, 2)]]
+        while len(candidates) < count:
+            explore = elite is None or self.rng.random() < 0.2
+            candidates.append(self.sample(None if explore else elite))
+        return candidates
+
+    def record(self, config, total_score, reports):
+        self.iteration += 1
+        self.trials.append((total_score, config))
+        logger.info("Config %d: total score = %d/%d %s", self.iteration, total_score,
+                    5 * len(self.datasets), config.to_dict())
+        if total_score > self.best_score or self.best_config is None:
             self.best_score = total_score
-            self.best_config = self.config.copy()
+            self.best_config = config
             self.best_reports = reports
-            self.no_improvement_count = 0
-        else:
-            self.no_improvement_count += 1
-        return total_score
 
-    def save_results(self):
+    def save_results(self, output_dir="data/output/tuning"):
         """Save best configuration and reports."""
-        os.makedirs("data/output/tuning", exist_ok=True)
-        with open("data/output/tuning/best_config.json", "w") as f:
-            json.dump(self.best_config, f, indent=2)
+        os.makedirs(output_dir, exist_ok=True)
+        with open(os.path.join(output_dir, "best_config.json"), "w") as f:
+            json.dump(self.best_config.to_dict(), f, indent=2)
         for dataset_name, report in self.best_reports.items():
-            with open(f"data/output/tuning/{dataset_name}_report.json", "w") as f:
+            with open(os.path.join(output_dir, f"{dataset_name}_report.json"), "w") as f:
                 json.dump(report, f, indent=2)
-        with open("data/output/tuning/tuning_log.txt", "w") as f:
-            f.write(f"Best Score: {self.best_score}/15\n")
-            f.write(f"Best Config: {json.dumps(self.best_config, indent=2)}\n")
-
-    def tune(self):
-        """Run tuning loop until target score or max iterations."""
-        while self.iteration < self.max_iterations:
-            self.iteration += 1
-            print(f"\nStarting iteration {self.iteration} with config: {self.config}")
-            self.update_source_files()
-            # Reload verifier to apply changes
-            from importlib import reload
-            import src.quality_check
-            import src.bias_check
-            reload(src.quality_check)
-            reload(src.bias_check)
-            self.verifier = Verifier()
-            
-            total_score = self.run_iteration()
-            if total_score >= self.target_score:
-                print(f"Target score {self.target_score}/15 achieved at iteration {self.iteration}")
-                self.save_results()
-                return True
-            self.update_config()
-        
-        print(f"Max iterations ({self.max_iterations}) reached. Best score: {self.best_score}/15")
-        self.save_results()
-        return False
+        with open(os.path.join(output_dir, "tuning_log.txt"), "w") as f:
+            f.write(f"Best Score: {self.best_score}/{5 * len(self.datasets)}\n")
+            f.write(f"Best Config: {json.dumps(self.best_config.to_dict(), indent=2)}\n")
+            f.write(f"Configs evaluated: {self.iteration}\n")
+            for total_score, config in self.trials:
+                f.write(f"{total_score}\t{json.dumps(config.to_dict())}\n")
+
+    def tune(self, output_dir="data/output/tuning"):
+        """Evaluate candidate configs until the target score or max_iterations configs; returns whether the target was reached."""
+        pool = None
+        if self.workers > 1:
+            pool = ProcessPoolExecutor(self.workers, initializer=_init_tuning_worker, initargs=(self,))
+        verifier = Verifier()
+        try:
+            while self.iteration < self.max_iterations and self.best_score < self.target_score:
+                batch = self.propose(min(self.batch_size, self.max_iterations - self.iteration))
+                if pool is not None:
+                    results = pool.map(_evaluate_in_worker, [config.to_dict() for config in batch])
+                else:
+                    results = (self.evaluate(config, verifier) for config in batch)
+                for config, (total_score, reports) in zip(batch, results):
+                    self.record(config, total_score, reports)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        reached = self.best_score >= self.target_score
+        if reached:
+            logger.info("Target score %d achieved after %d configs", self.target_score, self.iteration)
+        else:
+            logger.info("Max iterations (%d) reached. Best score: %d", self.max_iterations, self.best_score)
+        self.save_results(output_dir)
+        return reached
+
+def main():
+    parser = argparse.ArgumentParser(description="Tune the verification thresholds against reference datasets.")
+    parser.add_argument("datasets", nargs="*", default=["data/input/creditcard.csv",
+                                                        "data/input/student_depression.csv",
+                                                        "data/input/faulty_sales.csv"])
+    parser.add_argument("--iterations", type=int, default=50, help="configs to evaluate at most")
+    parser.add_argument("--target", type=int, default=13)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--rows", type=int, default=100_000, help="rows of generated stand-ins for missing datasets")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="data/output/tuning")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    tuner = AutoTuneVerifier(args.datasets, max_iterations=args.iterations, target_score=args.target,
+                             workers=args.workers, seed=args.seed, rows=args.rows)
+    tuner.tune(args.output)
 
 if __name__ == "__main__":
-    datasets = [
-        "data/input/creditcard.csv",
-        "data/input/student_depression.csv",
-        "data/input/faulty_sales.csv"
-    ]
-    tuner = AutoTuneVerifier(datasets)
-    tuner.tune()
\ No newline at end of file
+    main()
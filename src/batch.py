@@ -0,0 +1,238 @@
+import glob
+import hashlib
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+from .formats import INGEST_FORMATS, STREAM_FORMATS
+
+logger = logging.getLogger(__name__)
+
+# Files above this many rows get a sampled PII scan, as uploads do in the server
+PII_SAMPLE_ROWS = int(os.environ.get('PII_SAMPLE_ROWS', 100000))
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+def find_datasets(patterns=(), manifest=None):
+    """[(path, dataset name)] from glob patterns and/or a manifest file, in order, without repeats.
+
+    A manifest has one dataset per line: a path, or a JSON object with
+    "path" and optionally "name". Relative paths are relative to the
+    manifest. Names default to the file name without its extension.
+    """
+    entries = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern, recursive=True)) if glob.has_magic(pattern) else [pattern]
+        entries.extend((path, None) for path in matches
+                       if os.path.splitext(path)[1].lower() in INGEST_FORMATS and os.path.isfile(path))
+    if manifest is not None:
+        base = os.path.dirname(os.path.abspath(manifest))
+        with open(manifest) as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                entry = json.loads(line) if line.startswith("{") else {"path": line}
+                entries.append((os.path.join(base, entry["path"]), entry.get("name")))
+    datasets, seen = [], set()
+    for path, name in entries:
+        if path in seen:
+            continue
+        seen.add(path)
+        datasets.append((path, name or os.path.splitext(os.path.basename(path))[0]))
+    return datasets
+
+class Checkpoint:
+    """JSON-lines record of the files verified so far, with their size, mtime and content hash.
+
+    One line is appended (and flushed) per verified file, so an
+    interrupted run loses at most the files in flight. On load the last
+    line per path wins. A file is unchanged when its content hash matches;
+    the hash is only recomputed when its size or mtime differ.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # a line cut short by an interrupted run
+                    self.entries[entry["path"]] = entry
+        self.file = open(path, "a")
+
+    def stat_matches(self, path):
+        """True when path has the size and mtime it had when it was verified."""
+        entry = self.entries.get(os.path.abspath(path))
+        if entry is None:
+            return False
+        stat = os.stat(path)
+        return entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns
+
+    def previous_hash(self, path):
+        entry = self.entries.get(os.path.abspath(path))
+        return entry["sha256"] if entry else None
+
+    def add(self, path, sha256):
+        stat = os.stat(path)
+        entry = {"path": os.path.abspath(path), "sha256": sha256, "size": stat.st_size,
+                 "mtime_ns": stat.st_mtime_ns}
+        self.entries[entry["path"]] = entry
+        self.file.write(json.dumps(entry) + "\n")
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+# Verifiers of a worker process, created once by _init_worker
+_worker = None
+
+def _init_worker(streaming_threshold):
+    """Create the verifiers and load the spaCy pipeline once per worker process."""
+    global _worker
+    from .models import pii_pipeline
+    from .streaming import StreamingVerifier
+    from .verifier import Verifier
+
+    verifier = Verifier(authenticity_db=os.environ.get('AUTHENTICITY_DB') or None,
+                        near_duplicates_db=os.environ.get('NEAR_DUPLICATES_DB') or None)
+    _worker = {"verifier": verifier, "streaming_verifier": StreamingVerifier(verifier),
+               "streaming_threshold": streaming_threshold}
+    try:
+        pii_pipeline()
+    except OSError as e:
+        logger.warning("spaCy model could not be loaded: %s", e)
+
+def verify_path(path, name, previous_hash=None, pii_mode=None, compact=False, register=False):
+    """Verify one file in this worker; returns its output record.
+
+    The record's status is "ok" (with the report), "unchanged" (the content
+    hash equals previous_hash, nothing was verified) or "error". compact
+    holds in-memory frames in compact dtypes (see compact_frame); register
+    publishes the verified file's fingerprint in the authenticity index.
+    """
+    from .ingest import load_frame
+
+    start = time.perf_counter()
+    record = {"path": os.path.abspath(path), "name": name, "bytes": 0, "rows": 0}
+    try:
+        record["bytes"] = os.path.getsize(path)
+        record["sha256"] = file_sha256(path)
+        if record["sha256"] == previous_hash:
+            record["status"] = "unchanged"
+            return record
+        extension = os.path.splitext(path)[1].lower()
+        if extension in STREAM_FORMATS and record["bytes"] > _worker["streaming_threshold"]:
+            report = _worker["streaming_verifier"].verify_file(path, name, STREAM_FORMATS[extension],
+                                                               pii_mode=pii_mode or "sampled")
+        else:
+            df = load_frame(path, INGEST_FORMATS[extension], compact=compact)
+            mode = pii_mode or ("sampled" if len(df) > PII_SAMPLE_ROWS else "exhaustive")
+            report = _worker["verifier"].verify_dataset(df, name, pii_mode=mode)
+        if register:
+            _worker["verifier"].register(report, name)
+        record.update(status="ok", rows=report["details"]["metadata"]["rows"], report=report)
+    except Exception as e:
+        logger.debug("Verifying %s failed", path, exc_info=True)
+        record.update(status="error", error=f"{type(e).__name__}: {e}")
+    finally:
+        record["seconds"] = round(time.perf_counter() - start, 4)
+    return record
+
+class BatchRunner:
+    """Verify many dataset files across a process pool, streaming one JSON line per file.
+
+    Each worker builds its verifiers and loads the spaCy pipeline once and
+    reuses them for every file it is given. Results are appended to the
+    output as they complete; files whose content hash matches the
+    checkpoint are skipped, so a rerun resumes an interrupted batch and a
+    nightly run only re-verifies what changed (force=True re-verifies all).
+    """
+
+    def __init__(self, output, checkpoint=None, workers=None, pii_mode=None, force=False,
+                 streaming_threshold_mb=50, compact=False, register=False):
+        self.output = output
+        self.checkpoint_path = checkpoint or output + ".checkpoint"
+        self.workers = workers or os.cpu_count() or 1
+        self.pii_mode = pii_mode
+        self.force = force
+        self.streaming_threshold = streaming_threshold_mb * 1024 * 1024
+        self.compact = compact
+        self.register = register
+
+    def run(self, datasets):
+        """Verify [(path, name)] and return the summary()."""
+        start = time.perf_counter()
+        checkpoint = Checkpoint(self.checkpoint_path)
+        records = []
+        skipped = 0
+        pending = []
+        for path, name in datasets:
+            if not self.force and checkpoint.stat_matches(path):
+                skipped += 1
+            else:
+                pending.append((path, name, None if self.force else checkpoint.previous_hash(path)))
+        logger.info("%d files to verify, %d unchanged since the checkpoint", len(pending), skipped)
+
+        pool = None
+        try:
+            with open(self.output, "a") as output:
+                if self.workers > 1 and len(pending) > 1:
+                    pool = ProcessPoolExecutor(min(self.workers, len(pending)), initializer=_init_worker,
+                                               initargs=(self.streaming_threshold,))
+                    futures = [pool.submit(verify_path, path, name, previous, self.pii_mode, self.compact,
+                                           self.register)
+                               for path, name, previous in pending]
+                    results = (future.result() for future in as_completed(futures))
+                else:
+                    if pending:
+                        _init_worker(self.streaming_threshold)
+                    results = (verify_path(path, name, previous, self.pii_mode, self.compact, self.register)
+                               for path, name, previous in pending)
+                for record in results:
+                    records.append(record)
+                    if record["status"] == "unchanged":
+                        skipped += 1
+                        checkpoint.add(record["path"], record["sha256"])
+                        continue
+                    output.write(json.dumps(record, separators=(",", ":")) + "\n")
+                    output.flush()
+                    if record["status"] == "ok":
+                        checkpoint.add(record["path"], record["sha256"])
+                    logger.info("%s %s: %d rows in %.2fs", record["status"], record["path"], record["rows"],
+                                record["seconds"])
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+            checkpoint.close()
+        return self.summary(records, skipped, time.perf_counter() - start)
+
+    def summary(self, records, skipped, wall_seconds):
+        """Aggregate counts and throughput of a run."""
+        verified = [record for record in records if record["status"] == "ok"]
+        seconds = [record["seconds"] for record in verified]
+        rows = sum(record["rows"] for record in verified)
+        size = sum(record["bytes"] for record in verified)
+        return {
+            "verified": len(verified),
+            "unchanged": skipped,
+            "failed": sum(record["status"] == "error" for record in records),
+            "rows": rows,
+            "bytes": size,
+            "wall_seconds": round(wall_seconds, 3),
+            "files_per_second": round(len(verified) / wall_seconds, 3) if wall_seconds else 0.0,
+            "rows_per_second": round(rows / wall_seconds, 1) if wall_seconds else 0.0,
+            "mb_per_second": round(size / 1024 / 1024 / wall_seconds, 3) if wall_seconds else 0.0,
+            "file_seconds_p50": round(float(np.percentile(seconds, 50)), 4) if seconds else None,
+            "file_seconds_p95": round(float(np.percentile(seconds, 95)), 4) if seconds else None,
+        }
@@ -0,0 +1,192 @@
+import re
+import warnings
+from functools import cached_property
+import pandas as pd
+import numpy as np
+from scipy.stats import skew
+from .compaction import LOGICAL_DTYPES, logical_values
+from .instrumentation import current
+
+# Numeric columns whose name looks like a PCA component (V1, V2, ...)
+PCA_COLUMN = re.compile(r"V\d+")
+# Largest block of stacked column values fill_skews reduces at once
+SKEW_BLOCK_BYTES = 64 * 1024 * 1024
+
+class ColumnProfile:
+    """Per-column statistics computed once and shared by the verification checks."""
+
+    def __init__(self, name, series, dtype=None):
+        """dtype is the column's dtype before compaction, if series was compacted (see src/compaction.py)."""
+        self.name = name
+        self._series = series
+        self.dtype = series.dtype if dtype is None else dtype
+        self.is_numeric_dtype = pd.api.types.is_numeric_dtype(self.dtype)
+        self.is_category = self.dtype == "category"
+        self.is_object = self.dtype == "object"
+
+        self.null_count = int(series.isnull().sum())
+        self.non_null_count = len(series) - self.null_count
+        self.unique_count = series.nunique()
+        # All-null columns count as fully repetitive rather than dividing by zero
+        self.unique_ratio = self.unique_count / self.non_null_count if self.non_null_count > 0 else 0.0
+        self.is_low_cardinality = self.is_object and self.unique_ratio < 0.1
+
+        # Coerce once; every check reads the coerced values from here
+        series = logical_values(series, self.dtype)
+        self.numeric = None
+        self.numeric_ratio = np.nan
+        try:
+            coerced = pd.to_numeric(series, errors="coerce")
+            with np.errstate(divide="ignore", invalid="ignore"):
+                self.numeric_ratio = coerced.notna().sum() / np.int64(self.non_null_count)
+            self.numeric = coerced.dropna()
+        except Exception:
+            coerced = None
+        self.is_numeric = bool(self.numeric_ratio > 0.8)
+
+        # Strings that failed coercion are the "non-numeric anomalies" of a numeric column
+        self.invalid_count = 0
+        self.invalid_samples = []
+        if self.is_numeric and self.is_object:
+            invalid = np.fromiter((isinstance(x, str) for x in series.values), dtype=bool, count=len(series))
+            invalid &= coerced.isna().values
+            self.invalid_count = int(invalid.sum())
+            self.invalid_samples = series[invalid].iloc[:5].tolist()
+
+        self._compute_numeric_stats()
+
+    def _compute_numeric_stats(self):
+        values = self.numeric
+        self.count = len(values) if values is not None else 0
+        self.numeric_unique_count = 0
+        self.mean = self.std = self.min = np.nan
+        if self.count == 0:
+            return
+        self.numeric_unique_count = values.nunique()
+        self.mean = values.mean()
+        self.std = values.std() if self.count > 1 else 0
+        self.min = self._ordered().min()
+
+    def _ordered(self):
+        return self.numeric.astype("float64") if self.numeric.dtype == bool else self.numeric
+
+    # Order statistics are only computed on demand; the anomaly engine batches its own
+    @cached_property
+    def quartiles(self):
+        if self.count == 0:
+            return np.nan, np.nan
+        q1, q3 = self._ordered().quantile([0.25, 0.75])
+        return q1, q3
+
+    @property
+    def q1(self):
+        return self.quartiles[0]
+
+    @property
+    def q3(self):
+        return self.quartiles[1]
+
+    # Skewness too is on demand; fill_skews computes it for many columns at once
+    @cached_property
+    def skew(self):
+        if self.count == 0:
+            return np.nan
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            return skew(self.numeric, nan_policy="omit")
+
+    @cached_property
+    def median(self):
+        return self._ordered().median() if self.count > 0 else np.nan
+
+    @cached_property
+    def mad(self):
+        return np.median(np.abs(self._ordered() - self.median)) if self.count > 0 else np.nan
+
+    @cached_property
+    def top_frequency(self):
+        """Occurrences of the most frequent non-null value, counted from factorized codes."""
+        if isinstance(self._series.dtype, pd.CategoricalDtype):
+            codes = self._series.cat.codes.to_numpy()
+        else:
+            codes = pd.factorize(self._series)[0]
+        codes = codes[codes >= 0]
+        return int(np.bincount(codes).max()) if len(codes) else 0
+
+    @property
+    def value_levels(self):
+        """Number of distinct levels, counting unused categories like value_counts does."""
+        return len(self.dtype.categories) if self.is_category else self.unique_count
+
+    @property
+    def kind(self):
+        """Inferred column kind: numeric, categorical, string or other."""
+        if self.is_numeric:
+            return "numeric"
+        if self.is_category or self.is_low_cardinality:
+            return "categorical"
+        if self.is_object:
+            return "string"
+        return "other"
+
+    def __getstate__(self):
+        # The column is left out; whoever unpickles a profile rebinds _series (see SharedFrame)
+        state = self.__dict__.copy()
+        state["_series"] = None
+        return state
+
+    def __repr__(self):
+        return f"ColumnProfile({self.name!r}, kind={self.kind}, nulls={self.null_count}, unique={self.unique_count})"
+
+def _block_skews(values):
+    """scipy.stats.skew of each row of a 2-D block, bit for bit.
+
+    The central moments are reduced along the rows exactly as scipy
+    reduces one array; the final ratio is taken per row with scalar
+    arithmetic, as scipy does for a 1-D input (its vectorized power can
+    differ in the last bit).
+    """
+    dtype = values.dtype.type if values.dtype.kind == "f" else np.float64
+    mean = np.asarray(values.mean(axis=1, keepdims=True), dtype=dtype)
+    deviations = values - mean
+    powers = deviations ** 2
+    m2 = np.mean(powers, axis=1)
+    powers *= deviations
+    m3 = np.mean(powers, axis=1)
+    mean = mean[:, 0]
+    with np.errstate(all="ignore"):
+        zero = m2 <= (np.finfo(m2.dtype).resolution * mean) ** 2
+        return [np.nan if zero[i] else m3[i] / m2[i] ** 1.5 for i in range(len(m2))]
+
+def fill_skews(profiles, block_bytes=SKEW_BLOCK_BYTES):
+    """Compute the skew of many in-memory profiles at once.
+
+    Columns with the same number of values and dtype are stacked into 2-D
+    blocks of at most block_bytes and reduced together; the results match
+    the per-column property exactly. Others are left to the property.
+    """
+    groups = {}
+    for profile in profiles:
+        if "skew" in profile.__dict__ or profile.count == 0 or profile.numeric is None:
+            continue
+        values = profile.numeric.to_numpy()
+        if values.dtype.kind not in "biuf":
+            continue
+        groups.setdefault((len(values), values.dtype), []).append((profile, values))
+    for (count, dtype), members in groups.items():
+        per_block = max(1, block_bytes // max(count * np.dtype(np.float64).itemsize, 1))
+        for start in range(0, len(members), per_block):
+            block = members[start:start + per_block]
+            skews = _block_skews(np.vstack([values for _, values in block]))
+            for (profile, _), value in zip(block, skews):
+                profile.__dict__["skew"] = value
+
+def profile_columns(df):
+    """Profile every column of the dataset in a single pass."""
+    instrumentation = current()
+    logical = df.attrs.get(LOGICAL_DTYPES, {})
+    profiles = {}
+    for col in df:
+        with instrumentation.column(col):
+            profiles[col] = ColumnProfile(col, df[col], logical.get(col))
+    return profiles
@@ -0,0 +1,109 @@
+import time
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401 - backs the compact string dtype
+    STRING_DTYPE = pd.StringDtype("pyarrow")
+except ImportError:  # pragma: no cover - pyarrow is optional; text columns then stay object dtype
+    STRING_DTYPE = None
+
+# Keys of DataFrame.attrs set by compact_frame
+LOGICAL_DTYPES = "logical_dtypes"
+COMPACTION = "compaction"
+
+# Text columns with at most this share of distinct values become categoricals, the rest Arrow strings
+CATEGORY_RATIO = 0.5
+
+def _compact_integers(values):
+    low, high = values.min(), values.max()
+    for dtype in (np.int8, np.int16, np.int32):
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return values.astype(dtype)
+    return None
+
+def _compact_floats(values):
+    narrow = values.astype(np.float32)
+    with np.errstate(invalid="ignore"):
+        if np.array_equal(narrow.astype(np.float64), values, equal_nan=True):
+            return narrow
+    return None
+
+def compact_series(series, category_ratio=CATEGORY_RATIO):
+    """The series in a smaller dtype that keeps every value, or None when there is none.
+
+    int64 columns shrink to the narrowest integer holding their range,
+    float64 columns to float32 when every value round-trips exactly, and
+    text columns to categoricals (few distinct values) or Arrow strings.
+    Text columns are only converted when their nulls are all NaN, the
+    only missing value the checks can tell apart after conversion.
+    """
+    if len(series) == 0:
+        return None
+    if series.dtype == np.int64:
+        return _compact_integers(series)
+    if series.dtype == np.float64:
+        return _compact_floats(series)
+    if series.dtype != object or pd.api.types.infer_dtype(series, skipna=True) != "string":
+        return None
+    missing = series.isna().to_numpy()
+    if missing.any() and not all(isinstance(value, float) for value in series[missing]):
+        return None
+    non_null = len(series) - int(missing.sum())
+    if non_null and series.nunique() / non_null <= category_ratio:
+        return series.astype("category")
+    if STRING_DTYPE is not None:
+        return series.astype(STRING_DTYPE)
+    return None
+
+def compact_frame(df, category_ratio=CATEGORY_RATIO):
+    """A copy of df in the smallest lossless dtypes, for holding uploads in less memory.
+
+    The original dtypes are kept in df.attrs, where profile_columns finds
+    them, so the checks give the same results on the compacted frame. df.attrs also
+    gets the compaction report: bytes before and after (deep memory
+    usage), the converted columns and the seconds spent.
+    """
+    start = time.perf_counter()
+    bytes_before = int(df.memory_usage(deep=True).sum())
+    if len(df.columns) == 0:
+        return df.copy()
+    compacted = {}
+    columns = {}
+    logical = dict(df.attrs.get(LOGICAL_DTYPES, {}))
+    for i, col in enumerate(df.columns):
+        series = df.iloc[:, i]
+        narrow = compact_series(series, category_ratio)
+        if narrow is None:
+            compacted[i] = series
+            continue
+        compacted[i] = narrow
+        logical.setdefault(col, series.dtype)
+        columns[str(col)] = f"{series.dtype} -> {narrow.dtype}"
+    result = pd.concat(compacted, axis=1, copy=False)
+    result.columns = df.columns
+    result.attrs = {**df.attrs, LOGICAL_DTYPES: logical}
+    result.attrs[COMPACTION] = {
+        "bytes_before": bytes_before,
+        "bytes_after": int(result.memory_usage(deep=True).sum()),
+        "columns": columns,
+        "seconds": round(time.perf_counter() - start, 4),
+    }
+    return result
+
+def logical_values(series, dtype):
+    """The series converted back to dtype, e.g. a compacted text column as object strings with NaN."""
+    if series.dtype == dtype:
+        return series
+    if dtype == object:
+        values = series.astype(object)
+        return values.where(series.notna(), np.nan)
+    return series.astype(dtype)
+
+def as_text(series, dtype):
+    """str values of a column whose dtype before compaction was dtype, as that column would give them."""
+    if isinstance(series.dtype, pd.StringDtype) and dtype == object:
+        # Arrow strings print their nulls as "<NA>", object columns as "nan"
+        series = logical_values(series, dtype)
+    return series.astype(str)
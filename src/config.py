@@ -0,0 +1,55 @@
+import hashlib
+import json
+
+class VerificationConfig:
+    """Tunable thresholds of the checks, passed to them at runtime.
+
+    iqr_multiplier_* and mad_threshold_* are the IQR-range multipliers and
+    MAD z-score thresholds of the anomaly checks, for PCA-like columns,
+    the Amount column and every other numeric column. expected_unique_*
+    are the distinct counts at which a column counts as fully diverse:
+    categorical (and binary) columns use expected_unique_categorical,
+    other columns expected_unique_numeric, or their non-null count when
+    that is None.
+    """
+
+    DEFAULTS = {
+        "iqr_multiplier_pca": 20.0,
+        "iqr_multiplier_amount": 6.0,
+        "iqr_multiplier": 4.0,
+        "mad_threshold_pca": 50.0,
+        "mad_threshold_amount": 12.0,
+        "mad_threshold": 8.0,
+        "expected_unique_categorical": 5,
+        "expected_unique_numeric": None,
+    }
+
+    def __init__(self, **values):
+        unknown = set(values) - set(self.DEFAULTS)
+        if unknown:
+            raise ValueError(f"Unknown verification settings: {sorted(unknown)}")
+        for name, default in self.DEFAULTS.items():
+            setattr(self, name, values.get(name, default))
+
+    def replace(self, **values):
+        """A copy with some settings changed."""
+        return VerificationConfig(**{**self.to_dict(), **values})
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.DEFAULTS}
+
+    def version(self):
+        """Short digest of the settings, for keying cached results."""
+        return hashlib.sha256(json.dumps(self.to_dict(), sort_keys=True).encode()).hexdigest()[:12]
+
+    @classmethod
+    def load(cls, path):
+        """Read settings from a JSON file (e.g. the tuner's best_config.json)."""
+        with open(path) as f:
+            return cls(**json.load(f))
+
+    def __eq__(self, other):
+        return isinstance(other, VerificationConfig) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        return f"VerificationConfig({self.to_dict()})"
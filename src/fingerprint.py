@@ -0,0 +1,174 @@
+import hashlib
+import json
+import numbers
+import numpy as np
+import pandas as pd
+
+# Bump whenever the canonical encoding below changes; it is mixed into every digest
+FINGERPRINT_VERSION = 2
+# Rows are hashed in fixed-size blocks so the digest never depends on how the caller chunked the data
+BLOCK_ROWS = 65536
+
+def canonical_kind(dtype):
+    """Map a pandas dtype onto the version-independent kind used for hashing."""
+    if isinstance(dtype, pd.CategoricalDtype):
+        return "text"
+    if pd.api.types.is_bool_dtype(dtype):
+        return "bool"
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return "datetime"
+    if pd.api.types.is_timedelta64_dtype(dtype):
+        return "timedelta"
+    # Integers and floats share one kind (integral values are encoded alike), so downcasting or
+    # NaN-promotion keeps the digest
+    if pd.api.types.is_numeric_dtype(dtype):
+        return "number"
+    return "text"
+
+def _type_tag(value):
+    """One byte naming the type of a value in a text column, so 1 and "1" hash differently."""
+    if isinstance(value, str):
+        return b"s"
+    if isinstance(value, (bool, np.bool_)):
+        return b"b"
+    if isinstance(value, numbers.Integral):
+        return b"i"
+    if isinstance(value, numbers.Real):
+        return b"f"
+    return b"o"
+
+def _encode_numbers(series, mask):
+    """Per-value tag bytes and 64-bit payloads of a numeric column.
+
+    Integral values (of any integer or float dtype) are encoded exactly as
+    int64, so ints above 2**53 stay distinct and NaN-promoted int columns
+    keep their digest; uint64 values above the int64 range and non-integral
+    floats are tagged and encoded by their own bits.
+    """
+    tags = np.zeros(len(series), dtype="u1")
+    if pd.api.types.is_unsigned_integer_dtype(series.dtype):
+        values = series.to_numpy(dtype="<u8", na_value=0)
+        tags[values > np.iinfo(np.int64).max] = 2
+        return tags, values.view("<i8")
+    if pd.api.types.is_integer_dtype(series.dtype):
+        return tags, series.to_numpy(dtype="<i8", na_value=0)
+    # Adding 0.0 folds -0.0 into 0.0
+    values = series.to_numpy(dtype="<f8", na_value=0.0) + 0.0
+    values[mask] = 0.0
+    with np.errstate(invalid="ignore"):
+        integral = (np.floor(values) == values) & (values >= -2.0 ** 63) & (values < 2.0 ** 63)
+    payload = values.view("<i8").copy()
+    payload[integral] = values[integral].astype("<i8")
+    tags[~integral] = 1
+    return tags, payload
+
+def _encode_column(series, kind):
+    """Encode one column of a block as null-mask bytes plus little-endian value bytes."""
+    mask = series.isna().to_numpy()
+    parts = [np.packbits(mask).tobytes()]
+    if kind == "text":
+        encoded = [b"" if missing else _type_tag(value) + str(value).encode("utf-8")
+                   for value, missing in zip(series.to_numpy(dtype=object), mask)]
+        parts.append(np.fromiter((len(value) for value in encoded), dtype="<i8", count=len(encoded)).tobytes())
+        parts.append(b"".join(encoded))
+    elif kind == "datetime":
+        if isinstance(series.dtype, pd.DatetimeTZDtype):
+            series = series.dt.tz_convert("UTC").dt.tz_localize(None)
+        values = series.to_numpy(dtype="datetime64[ns]").view("<i8").copy()
+        values[mask] = 0
+        parts.append(values.tobytes())
+    elif kind == "timedelta":
+        values = series.to_numpy(dtype="timedelta64[ns]").view("<i8").copy()
+        values[mask] = 0
+        parts.append(values.tobytes())
+    elif kind == "bool":
+        parts.append(series.to_numpy(dtype="u1", na_value=False).tobytes())
+    else:
+        tags, values = _encode_numbers(series, mask)
+        if mask.any():
+            values = np.where(mask, 0, values)
+        parts.append(tags.tobytes())
+        parts.append(values.tobytes())
+    return parts
+
+class DatasetFingerprint:
+    """Streaming, versioned SHA-256 fingerprint of a dataset.
+
+    Column names, canonical column kinds and the raw column values are hashed
+    in fixed blocks of BLOCK_ROWS rows, so memory stays bounded and the same
+    data gives the same digest whether it arrives as one frame or in chunks
+    (as long as every chunk gives a column the same kind).
+    """
+
+    def __init__(self):
+        self.columns = None
+        self.kinds = None
+        self.rows = 0
+        self.block_digests = []
+        self._pending = []
+        self._pending_rows = 0
+
+    def update(self, df):
+        """Fold the next chunk of rows into the fingerprint."""
+        if self.columns is None:
+            self.columns = [str(col) for col in df.columns]
+            self.kinds = [canonical_kind(df[col].dtype) for col in df]
+        elif [str(col) for col in df.columns] != self.columns:
+            raise ValueError("Chunk columns do not match the fingerprinted dataset")
+        else:
+            # A column whose later chunks parse to another kind (e.g. text in a numeric CSV column)
+            # is hashed as text from then on; text encodes values of any type
+            self.kinds = [kind if kind == canonical_kind(dtype) else "text" for dtype, kind in zip(df.dtypes, self.kinds)]
+        self.rows += len(df)
+        start = 0
+        if self._pending:
+            take = BLOCK_ROWS - self._pending_rows
+            self._pending.append(df.iloc[:take])
+            self._pending_rows += len(df.iloc[:take])
+            start = take
+            if self._pending_rows < BLOCK_ROWS:
+                return self
+            self._hash_block(pd.concat(self._pending))
+            self._pending, self._pending_rows = [], 0
+        while start + BLOCK_ROWS <= len(df):
+            self._hash_block(df.iloc[start:start + BLOCK_ROWS])
+            start += BLOCK_ROWS
+        if start < len(df):
+            self._pending = [df.iloc[start:]]
+            self._pending_rows = len(df) - start
+        return self
+
+    def _hash_block(self, block):
+        self.block_digests.append(self._block_digest(block))
+
+    def _block_digest(self, block):
+        digest = hashlib.sha256()
+        for col, kind in zip(block, self.kinds):
+            for part in _encode_column(block[col], kind):
+                digest.update(len(part).to_bytes(8, "little"))
+                digest.update(part)
+        return digest.digest()
+
+    def hexdigest(self):
+        """Return the "0x"-prefixed dataset fingerprint."""
+        block_digests = list(self.block_digests)
+        if self._pending:
+            # The partial tail block is hashed without consuming it, so update() may continue
+            block_digests.append(self._block_digest(pd.concat(self._pending)))
+        header = json.dumps({
+            "version": FINGERPRINT_VERSION,
+            "columns": self.columns or [],
+            "kinds": self.kinds or [],
+            "rows": self.rows,
+        }, sort_keys=True).encode()
+        digest = hashlib.sha256(header)
+        for block_digest in block_digests:
+            digest.update(block_digest)
+        return "0x" + digest.hexdigest()
+
+def fingerprint_dataframe(df):
+    """Fingerprint an in-memory DataFrame."""
+    fingerprint = DatasetFingerprint()
+    if len(df.columns) > 0:
+        fingerprint.update(df)
+    return fingerprint.hexdigest()
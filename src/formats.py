@@ -0,0 +1,16 @@
+# File extensions and the formats they are read as; kept free of heavy imports so the server can
+# validate uploads before pandas is loaded
+
+STREAM_FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+INGEST_FORMATS = {
+    ".csv": "csv",
+    ".json": "json",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".parquet": "parquet",
+    ".feather": "feather",
+    ".arrow": "feather",
+    ".xls": "excel",
+    ".xlsx": "excel",
+}
@@ -0,0 +1,142 @@
+import io
+import os
+import numpy as np
+import pandas as pd
+from .compaction import compact_frame
+from .formats import INGEST_FORMATS
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.json as pa_json
+    import pyarrow.feather as pa_feather
+    import pyarrow.parquet as pa_parquet
+except ImportError:  # pragma: no cover - pyarrow is optional; pandas' own readers are used instead
+    pa = None
+
+# pandas.read_csv's default missing-value markers, so both readers agree on what is null
+PANDAS_NA_VALUES = ["", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+                    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null"]
+
+def ingest_format(path_or_name):
+    """Ingestion format for a file name, from its extension."""
+    extension = os.path.splitext(str(path_or_name))[1].lower()
+    if extension not in INGEST_FORMATS:
+        raise ValueError(f"Unsupported file format: {extension or path_or_name}")
+    return INGEST_FORMATS[extension]
+
+def load_frame(path, file_format=None, compact=False):
+    """Load a file into a DataFrame; Parquet and Feather files are memory-mapped.
+
+    compact=True returns the frame in compact dtypes (see compact_frame).
+    """
+    df = _load_frame(path, file_format or ingest_format(path))
+    return compact_frame(df) if compact else df
+
+def _load_frame(path, file_format):
+    if pa is None:
+        return _pandas_read(path, file_format)
+    if file_format == "parquet":
+        return table_to_frame(pa_parquet.read_table(path, memory_map=True))
+    if file_format == "feather":
+        return table_to_frame(pa_feather.read_table(path, memory_map=True))
+    if file_format in ("csv", "jsonl"):
+        # Text is parsed block by block; mapping it would only add the whole file to the resident set
+        return _arrow_read(str(path), file_format, lambda: str(path))
+    return _pandas_read(path, file_format)
+
+def read_bytes(content, file_format):
+    """Parse uploaded file bytes into a DataFrame."""
+    if pa is None:
+        return _pandas_read(io.BytesIO(content), file_format)
+    if file_format == "parquet":
+        return table_to_frame(pa_parquet.read_table(pa.BufferReader(content)))
+    if file_format == "feather":
+        return table_to_frame(pa_feather.read_table(pa.BufferReader(content)))
+    if file_format in ("csv", "jsonl"):
+        return _arrow_read(pa.BufferReader(content), file_format, lambda: pa.BufferReader(content))
+    return _pandas_read(io.BytesIO(content), file_format)
+
+def _pandas_read(source, file_format):
+    if file_format == "csv":
+        return pd.read_csv(source)
+    if file_format == "json":
+        return pd.read_json(source)
+    if file_format == "jsonl":
+        return pd.read_json(source, lines=True)
+    if file_format == "parquet":
+        return pd.read_parquet(source)
+    if file_format == "feather":
+        return pd.read_feather(source)
+    if file_format == "excel":
+        return pd.read_excel(source)
+    raise ValueError(f"Unsupported file format: {file_format}")
+
+def _pandas_date_column(name):
+    """Column names pandas.read_json converts to datetimes (its keep_default_dates rule)."""
+    if not isinstance(name, str):
+        return False
+    name = name.lower()
+    return (name.endswith(("_at", "_time")) or name in ("modified", "date", "datetime") or
+            name.startswith("timestamp"))
+
+def _arrow_read(source, file_format, reopen):
+    """Parse CSV / JSON lines with pyarrow's multithreaded readers, falling back to pandas.
+
+    Arrow infers dates, times and timestamps where pandas.read_csv keeps the
+    text, so such CSV columns are parsed again as strings (reopen() gives a
+    fresh source for that second parse). JSON lines with temporal, nested
+    or pandas date-named columns, and CSVs Arrow rejects (ragged rows,
+    duplicate column names), are read by pandas as before.
+    """
+    try:
+        table = _arrow_parse(source, file_format)
+        temporal = [field.name for field in table.schema if pa.types.is_temporal(field.type)]
+        if temporal and file_format == "csv":
+            table = _arrow_parse(reopen(), file_format, {name: pa.string() for name in temporal})
+            temporal = []
+        if (temporal or len(set(table.column_names)) != len(table.column_names) or
+                any(pa.types.is_nested(field.type) for field in table.schema) or
+                (file_format == "jsonl" and any(_pandas_date_column(name) for name in table.column_names))):
+            raise ValueError("columns need pandas semantics")
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError, ValueError):
+        # Ragged rows, duplicate column names and the like keep pandas' behaviour
+        fallback = reopen()
+        return _pandas_read(fallback if isinstance(fallback, str) else io.BytesIO(fallback.read()), file_format)
+    return table_to_frame(table)
+
+def _arrow_parse(source, file_format, column_types=None):
+    if file_format == "jsonl":
+        return pa_json.read_json(source, read_options=pa_json.ReadOptions(use_threads=True))
+    return pa_csv.read_csv(
+        source,
+        read_options=pa_csv.ReadOptions(use_threads=True),
+        convert_options=pa_csv.ConvertOptions(
+            column_types=column_types,
+            null_values=PANDAS_NA_VALUES,
+            strings_can_be_null=True,
+            true_values=["True", "TRUE", "true"],
+            false_values=["False", "FALSE", "false"],
+        ),
+    )
+
+def table_to_frame(table):
+    """Convert an Arrow table to a tightly typed pandas frame with pandas' null conventions.
+
+    Numeric columns arrive as int64 / float64 (float64 when they hold
+    nulls), so no check needs to coerce them; text columns are object
+    dtype with NaN, not None, for missing values; all-null columns are
+    float64 NaN, as pandas.read_csv produces them.
+    """
+    for i, field in enumerate(table.schema):
+        if pa.types.is_null(field.type):
+            table = table.set_column(i, field.name, pa.nulls(len(table), pa.float64()))
+    df = table.to_pandas(split_blocks=True, self_destruct=True)
+    for col in df.columns[df.dtypes == object]:
+        series = df[col]
+        missing = series.isna().to_numpy()
+        if missing.any():
+            values = series.to_numpy(dtype=object, copy=True)
+            values[missing] = np.nan
+            df[col] = values
+    return df
@@ -0,0 +1,143 @@
+import contextlib
+import contextvars
+import cProfile
+import io
+import pstats
+import time
+import tracemalloc
+
+try:
+    import pyinstrument
+except ImportError:  # pragma: no cover - pyinstrument is optional; cProfile is always available
+    pyinstrument = None
+
+# Profilers available to profile_call
+PROFILERS = ["cprofile"] + (["pyinstrument"] if pyinstrument is not None else [])
+
+# The Instrumentation of the stage running in this thread (or task), if any
+_current = contextvars.ContextVar("instrumentation", default=None)
+
+class Instrumentation:
+    """Wall time, CPU time and peak memory per stage, time per column, and counters for one verification.
+
+    Stages are timed with stage(name); inside a stage, checks time their
+    columns with current().column(col) and count work with
+    current().count(name, n), without the instrumentation being passed
+    down to them. CPU time is the running thread's. Peak memory is only
+    measured with trace_memory=True, because tracemalloc slows every
+    allocation down while it is on.
+    """
+
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.stages = {}
+        self.columns = {}
+        self.counters = {}
+        self._stage = None
+        self._started_tracing = False
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        token = _current.set(self)
+        outer, self._stage = self._stage, name
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            memory_start = tracemalloc.get_traced_memory()[0]
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield self
+        finally:
+            entry = self.stages.setdefault(name, {"wall_seconds": 0.0, "cpu_seconds": 0.0, "calls": 0})
+            entry["wall_seconds"] += time.perf_counter() - wall
+            entry["cpu_seconds"] += time.thread_time() - cpu
+            entry["calls"] += 1
+            if self.trace_memory:
+                peak = tracemalloc.get_traced_memory()[1] - memory_start
+                entry["peak_bytes"] = max(entry.get("peak_bytes", 0), peak)
+            self._stage = outer
+            _current.reset(token)
+
+    @contextlib.contextmanager
+    def column(self, col):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            columns = self.columns.setdefault(self._stage, {})
+            columns[str(col)] = columns.get(str(col), 0.0) + time.perf_counter() - start
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + int(n)
+
+    def seconds(self, name):
+        """Wall seconds spent in a stage so far (0 if it never ran)."""
+        return self.stages.get(name, {}).get("wall_seconds", 0.0)
+
+    def merge(self, other):
+        """Fold in another instrumentation (e.g. a stage measured in a pool worker)."""
+        other = other if isinstance(other, dict) else other.report()
+        for name, entry in other["stages"].items():
+            mine = self.stages.setdefault(name, {"wall_seconds": 0.0, "cpu_seconds": 0.0, "calls": 0})
+            for key, value in entry.items():
+                mine[key] = max(mine.get(key, 0), value) if key == "peak_bytes" else mine.get(key, 0) + value
+        for stage, columns in other["columns"].items():
+            mine = self.columns.setdefault(stage, {})
+            for col, seconds in columns.items():
+                mine[col] = mine.get(col, 0.0) + seconds
+        for name, value in other["counters"].items():
+            self.count(name, value)
+        return self
+
+    def report(self, digits=4):
+        """JSON-serializable summary."""
+        return {
+            "stages": {name: {key: round(value, digits) if isinstance(value, float) else value
+                              for key, value in entry.items()}
+                       for name, entry in self.stages.items()},
+            "columns": {stage: {col: round(seconds, digits) for col, seconds in columns.items()}
+                        for stage, columns in self.columns.items()},
+            "counters": dict(self.counters),
+        }
+
+    def close(self):
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+class _NoInstrumentation:
+    """Stand-in outside any instrumented stage: records nothing."""
+
+    def column(self, col):
+        return contextlib.nullcontext()
+
+    def count(self, name, n=1):
+        pass
+
+_NOTHING = _NoInstrumentation()
+
+def current():
+    """The instrumentation of the running stage, or a no-op stand-in."""
+    return _current.get() or _NOTHING
+
+def profile_call(func, profiler="cprofile", top=30):
+    """Run func() under a profiler; returns (result, text report of the hottest calls)."""
+    if profiler == "pyinstrument":
+        if pyinstrument is None:
+            raise ValueError("pyinstrument is not installed")
+        session = pyinstrument.Profiler()
+        session.start()
+        try:
+            result = func()
+        finally:
+            session.stop()
+        return result, session.output_text()
+    if profiler != "cprofile":
+        raise ValueError(f"Unknown profiler: {profiler}")
+    session = cProfile.Profile()
+    result = session.runcall(func)
+    out = io.StringIO()
+    pstats.Stats(session, stream=out).sort_stats("cumulative").print_stats(top)
+    return result, out.getvalue()
@@ -0,0 +1,229 @@
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+JOB_STATUSES = ["queued", "running", "done", "failed", "cancelled"]
+FINISHED_STATUSES = ["done", "failed", "cancelled"]
+
+class QueueFull(Exception):
+    """Raised by JobQueue.submit when the pending-job limit is reached."""
+
+class JobCancelled(Exception):
+    """Raised inside a running job, at its next progress report, once it has been cancelled."""
+
+class JobStore:
+    """Job state in SQLite.
+
+    The default ":memory:" database serves a single process; a file path
+    lets every server process answer status polls for jobs run by another.
+    """
+
+    def __init__(self, path=":memory:"):
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL" if path != ":memory:" else "PRAGMA journal_mode=MEMORY")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                stage TEXT,
+                done INTEGER,
+                total INTEGER,
+                cancel_requested INTEGER NOT NULL DEFAULT 0,
+                result TEXT,
+                error TEXT,
+                created REAL NOT NULL,
+                updated REAL NOT NULL
+            )""")
+
+    def create(self, job_id):
+        now = time.time()
+        with self.lock:
+            self.conn.execute("INSERT INTO jobs (id, status, created, updated) VALUES (?, 'queued', ?, ?)",
+                              (job_id, now, now))
+
+    def update(self, job_id, **fields):
+        if "result" in fields:
+            fields["result"] = json.dumps(fields["result"])
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self.lock:
+            self.conn.execute(f"UPDATE jobs SET {assignments}, updated = ? WHERE id = ?",
+                              (*fields.values(), time.time(), job_id))
+
+    def transition(self, job_id, from_statuses, status):
+        """Atomically move a job to status if it is currently in one of from_statuses."""
+        placeholders = ", ".join("?" for _ in from_statuses)
+        with self.lock:
+            cursor = self.conn.execute(
+                f"UPDATE jobs SET status = ?, updated = ? WHERE id = ? AND status IN ({placeholders})",
+                (status, time.time(), job_id, *from_statuses))
+        return cursor.rowcount == 1
+
+    def get(self, job_id):
+        with self.lock:
+            cursor = self.conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,))
+            row = cursor.fetchone()
+            names = [column[0] for column in cursor.description]
+        if row is None:
+            return None
+        job = dict(zip(names, row))
+        job["result"] = json.loads(job["result"]) if job["result"] is not None else None
+        job["cancel_requested"] = bool(job["cancel_requested"])
+        return job
+
+    def purge(self, older_than):
+        """Delete finished jobs last updated before the given timestamp."""
+        placeholders = ", ".join("?" for _ in FINISHED_STATUSES)
+        with self.lock:
+            self.conn.execute(f"DELETE FROM jobs WHERE updated < ? AND status IN ({placeholders})",
+                              (older_than, *FINISHED_STATUSES))
+
+class JobQueue:
+    """Bounded in-process job queue served by a fixed pool of worker threads.
+
+    submit() raises QueueFull once max_pending jobs are queued or running.
+    A job function is called as func(progress, *args) and must call
+    progress(stage, done, total) between steps; that is where cancellation
+    takes effect for a running job. A job's cleanup callback runs once the
+    job is over, whether it ran, was cancelled before starting or was
+    failed at shutdown. Finished jobs are kept for retention seconds.
+    shutdown() drains the queue for a graceful process exit; jobs still
+    running when it gives up are marked failed and cleaned up, since the
+    worker threads die with the process.
+    """
+
+    def __init__(self, store=None, workers=2, max_pending=16, retention=3600):
+        self.store = store or JobStore()
+        self.workers = workers
+        self.max_pending = max_pending
+        self.retention = retention
+        self._queue = queue.Queue()
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._threads = []
+        self._closed = False
+        # Cleanup callbacks of the running jobs, by job id; whoever pops one runs it
+        self._running = {}
+
+    def submit(self, func, *args, cleanup=None):
+        """Queue func(progress, *args) and return the job id; cleanup() is called once the job is over."""
+        with self._lock:
+            if self._closed:
+                raise QueueFull("Job queue is shutting down")
+            if self._pending >= self.max_pending:
+                raise QueueFull(f"{self._pending} jobs already pending")
+            self._pending += 1
+            self._start_workers()
+        job_id = uuid.uuid4().hex
+        self.store.create(job_id)
+        self._queue.put((job_id, func, args, cleanup))
+        return job_id
+
+    def status(self, job_id):
+        return self.store.get(job_id)
+
+    def cancel(self, job_id):
+        """Cancel a queued or running job; returns False if it already finished or is unknown."""
+        if self.store.transition(job_id, ["queued"], "cancelled"):
+            return True
+        job = self.store.get(job_id)
+        if job is None or job["status"] != "running":
+            return False
+        self.store.update(job_id, cancel_requested=1)
+        return True
+
+    @property
+    def pending(self):
+        return self._pending
+
+    def shutdown(self, timeout=30):
+        """Stop taking jobs, fail the queued ones and wait up to timeout seconds for the running ones.
+
+        Returns True if every running job finished in time.
+        """
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                job_id, _, _, cleanup = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if self.store.transition(job_id, ["queued"], "failed"):
+                self.store.update(job_id, error="Server shut down before the job started")
+            self._cleanup(job_id, cleanup)
+            with self._lock:
+                self._pending -= 1
+        for _ in self._threads:
+            self._queue.put(None)
+        deadline = time.monotonic() + timeout
+        for thread in self._threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+        if not any(thread.is_alive() for thread in self._threads):
+            return True
+        with self._lock:
+            unfinished, self._running = self._running, {}
+        for job_id, cleanup in unfinished.items():
+            if self.store.transition(job_id, ["running"], "failed"):
+                self.store.update(job_id, error="Server shut down before the job finished")
+            self._cleanup(job_id, cleanup)
+        return False
+
+    def _start_workers(self):
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(target=self._work, name=f"verify-job-{len(self._threads)}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _work(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            job_id, func, args, cleanup = item
+            with self._lock:
+                self._running[job_id] = cleanup
+            try:
+                self._run(job_id, func, args)
+            finally:
+                with self._lock:
+                    # Gone if shutdown() already failed the job and ran its cleanup
+                    owned = job_id in self._running
+                    self._running.pop(job_id, None)
+                if owned:
+                    self._cleanup(job_id, cleanup)
+                with self._lock:
+                    self._pending -= 1
+                self.store.purge(time.time() - self.retention)
+
+    def _cleanup(self, job_id, cleanup):
+        if cleanup is None:
+            return
+        try:
+            cleanup()
+        except Exception:
+            logger.exception("Cleanup of job %s failed", job_id)
+
+    def _run(self, job_id, func, args):
+        if not self.store.transition(job_id, ["queued"], "running"):
+            return
+
+        def progress(stage, done=None, total=None):
+            self.store.update(job_id, stage=stage, done=done, total=total)
+            if self.store.get(job_id)["cancel_requested"]:
+                raise JobCancelled(job_id)
+
+        try:
+            result = func(progress, *args)
+        except JobCancelled:
+            self.store.update(job_id, status="cancelled")
+        except Exception as e:
+            logger.exception("Job %s failed", job_id)
+            self.store.update(job_id, status="failed", error=str(e))
+        else:
+            self.store.update(job_id, status="done", result=result)
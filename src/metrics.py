@@ -0,0 +1,97 @@
+import bisect
+import threading
+
+# Upper bounds (seconds) of the latency histogram buckets
+SECONDS_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300]
+
+def _label_text(labels):
+    if not labels:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') for value in labels.values())
+    return "{" + ",".join(f'{key}="{value}"' for key, value in zip(labels, escaped)) + "}"
+
+class MetricsRegistry:
+    """Process-wide counters, gauges and histograms, rendered in the Prometheus text format.
+
+    Every server process keeps its own registry; Prometheus sums the
+    workers' series when it scrapes each of them.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.kinds = {}
+        self.help = {}
+        self.buckets = {}
+        self.values = {}
+
+    def describe(self, name, kind, help_text, buckets=None):
+        """Declare a metric: kind is "counter", "gauge" or "histogram"."""
+        self.kinds[name] = kind
+        self.help[name] = help_text
+        if kind == "histogram":
+            self.buckets[name] = list(buckets or SECONDS_BUCKETS)
+        self.values.setdefault(name, {})
+
+    def inc(self, name, value=1, **labels):
+        key = tuple(labels.items())
+        with self.lock:
+            series = self.values[name]
+            series[key] = series.get(key, 0) + value
+
+    def set(self, name, value, **labels):
+        with self.lock:
+            self.values[name][tuple(labels.items())] = value
+
+    def observe(self, name, value, **labels):
+        key = tuple(labels.items())
+        buckets = self.buckets[name]
+        with self.lock:
+            series = self.values[name].get(key)
+            if series is None:
+                series = self.values[name][key] = {"buckets": [0] * len(buckets), "sum": 0.0, "count": 0}
+            index = bisect.bisect_left(buckets, value)
+            if index < len(buckets):
+                series["buckets"][index] += 1
+            series["sum"] += value
+            series["count"] += 1
+
+    def render(self):
+        lines = []
+        with self.lock:
+            for name, kind in self.kinds.items():
+                lines.append(f"# HELP {name} {self.help[name]}")
+                lines.append(f"# TYPE {name} {kind}")
+                for key, value in self.values[name].items():
+                    labels = dict(key)
+                    if kind != "histogram":
+                        lines.append(f"{name}{_label_text(labels)} {value}")
+                        continue
+                    cumulative = 0
+                    for bound, count in zip(self.buckets[name], value["buckets"]):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{_label_text({**labels, 'le': bound})} {cumulative}")
+                    lines.append(f"{name}_bucket{_label_text({**labels, 'le': '+Inf'})} {value['count']}")
+                    lines.append(f"{name}_sum{_label_text(labels)} {value['sum']}")
+                    lines.append(f"{name}_count{_label_text(labels)} {value['count']}")
+        return "\n".join(lines) + "\n"
+
+metrics = MetricsRegistry()
+metrics.describe("verifier_verifications_total", "counter", "Datasets verified, by mode (in_memory or streaming).")
+metrics.describe("verifier_stage_seconds", "histogram", "Wall time of a verification stage.")
+metrics.describe("verifier_stage_cpu_seconds_total", "counter", "CPU time spent in a verification stage.")
+metrics.describe("verifier_rows_total", "counter", "Rows read by verifications.")
+metrics.describe("verifier_values_total", "counter", "Cells (rows x columns) read by verifications.")
+metrics.describe("verifier_work_total", "counter", "Other work counted inside the checks, by kind.")
+
+def record_verification(instrumentation, mode):
+    """Add one verification's instrumentation to the process metrics."""
+    metrics.inc("verifier_verifications_total", mode=mode)
+    for stage, entry in instrumentation.stages.items():
+        metrics.observe("verifier_stage_seconds", entry["wall_seconds"], stage=stage)
+        metrics.inc("verifier_stage_cpu_seconds_total", entry["cpu_seconds"], stage=stage)
+    counters = instrumentation.counters
+    metrics.inc("verifier_rows_total", counters.get("rows", 0))
+    metrics.inc("verifier_values_total", counters.get("values", 0))
+    for name, value in counters.items():
+        if name not in ("rows", "values"):
+            metrics.inc("verifier_work_total", value, kind=name)
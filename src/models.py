@@ -0,0 +1,49 @@
+import importlib.util
+import threading
+
+SPACY_MODEL = "en_core_web_sm"
+# PII detection only reads doc.ents; en_core_web_sm's ner carries its own token-to-vector layer,
+# so the other components are not even loaded
+PII_EXCLUDE = ["tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer", "senter"]
+
+def model_installed(name=SPACY_MODEL):
+    """True if the spaCy model package is installed, without importing spaCy."""
+    return importlib.util.find_spec(name) is not None
+
+class ModelRegistry:
+    """spaCy pipelines loaded on first use and shared by everything in the process.
+
+    spaCy itself is imported on the first load, so importing the checks
+    stays cheap. Pipelines are keyed by model name and excluded
+    components; concurrent first calls load a pipeline once.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pipelines = {}
+
+    def pipeline(self, name=SPACY_MODEL, exclude=()):
+        key = (name, tuple(sorted(exclude)))
+        nlp = self.pipelines.get(key)
+        if nlp is None:
+            with self.lock:
+                nlp = self.pipelines.get(key)
+                if nlp is None:
+                    import spacy
+                    nlp = spacy.load(name, exclude=list(exclude))
+                    self.pipelines[key] = nlp
+        return nlp
+
+    def loaded(self):
+        """Names of the pipelines loaded so far."""
+        return [name for name, _ in self.pipelines]
+
+    def clear(self):
+        with self.lock:
+            self.pipelines.clear()
+
+models = ModelRegistry()
+
+def pii_pipeline():
+    """The shared NER-only pipeline used by PII detection."""
+    return models.pipeline(SPACY_MODEL, PII_EXCLUDE)
@@ -0,0 +1,175 @@
+import sqlite3
+import threading
+from collections import OrderedDict
+import numpy as np
+from .sketches import MinHash, hash_rows, hash_values, jaccard_estimate, mix64
+
+SIGNATURE_KINDS = ["rows", "values"]
+NUM_BINS = 128
+# 16 bands of 8 bins: pairs above ~0.7 Jaccard collide in some band with high probability
+LSH_BANDS = 16
+# Signatures of this many recently checked datasets are kept for NearDuplicateCheck.register
+RECENT_SIGNATURES = 64
+
+class DatasetSignature:
+    """MinHash signatures of a dataset, built chunk by chunk.
+
+    "rows" covers the set of row hashes, so shuffled rows or a few edited
+    cells keep most of it. "values" covers the distinct values of every
+    column, pooled without column names, so added, dropped, renamed or
+    reordered columns keep most of it.
+    """
+
+    def __init__(self, num_bins=NUM_BINS):
+        self.rows = MinHash(num_bins)
+        self.values = MinHash(num_bins, seed=0xD1B54A32D192ED03)
+
+    def update(self, chunk, row_hashes=None):
+        self.rows.update_hashes(hash_rows(chunk) if row_hashes is None else row_hashes)
+        for col in chunk:
+            self.values.update_hashes(hash_values(chunk[col].dropna()))
+        return self
+
+    def merge(self, other):
+        self.rows.merge(other.rows)
+        self.values.merge(other.values)
+        return self
+
+    def signatures(self):
+        return {"rows": self.rows.signature(), "values": self.values.signature()}
+
+def band_keys(signature, bands=LSH_BANDS):
+    """One signed 64-bit key per LSH band (SQLite integers are signed)."""
+    rows = signature.reshape(bands, -1).astype(np.uint64)
+    keys = np.zeros(bands, dtype=np.uint64)
+    for i in range(rows.shape[1]):
+        keys = mix64(keys ^ rows[:, i])
+    return (keys ^ np.arange(bands, dtype=np.uint64)).view(np.int64)
+
+class NearDuplicateIndex:
+    """Locality-sensitive-hashing index of dataset signatures in SQLite.
+
+    A query only reads the datasets sharing at least one band key with it
+    (one indexed lookup per band), so its cost depends on the number of
+    similar datasets rather than on the size of the index.
+    """
+
+    def __init__(self, path=None, bands=LSH_BANDS):
+        self.bands = bands
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path or ":memory:", check_same_thread=False, isolation_level=None, timeout=30)
+        if path:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS signatures (
+                dataset_id TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                dataset_name TEXT,
+                signature BLOB NOT NULL,
+                PRIMARY KEY (dataset_id, kind)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS bands (
+                kind TEXT NOT NULL,
+                band_key INTEGER NOT NULL,
+                dataset_id TEXT NOT NULL,
+                PRIMARY KEY (kind, band_key, dataset_id)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS generation (id INTEGER PRIMARY KEY CHECK (id = 0), value INTEGER NOT NULL);
+            INSERT OR IGNORE INTO generation VALUES (0, 0);
+        """)
+
+    def add(self, dataset_id, signatures, dataset_name=None):
+        self.add_many([(dataset_id, signatures, dataset_name)])
+
+    def add_many(self, entries):
+        """Index (dataset_id, signatures, dataset_name) entries in one transaction."""
+        signature_rows, band_rows = [], []
+        for dataset_id, signatures, dataset_name in entries:
+            for kind, signature in signatures.items():
+                if signature is None:
+                    continue
+                signature_rows.append((dataset_id, kind, dataset_name, signature.tobytes()))
+                band_rows.extend((kind, int(key), dataset_id) for key in band_keys(signature, self.bands))
+        with self.lock:
+            self.conn.execute("BEGIN")
+            self.conn.executemany("INSERT OR REPLACE INTO signatures VALUES (?, ?, ?, ?)", signature_rows)
+            self.conn.executemany("INSERT OR IGNORE INTO bands VALUES (?, ?, ?)", band_rows)
+            self.conn.execute("UPDATE generation SET value = value + 1")
+            self.conn.execute("COMMIT")
+
+    def generation(self):
+        """Count of add_many calls; changes whenever queries may answer differently."""
+        with self.lock:
+            return self.conn.execute("SELECT value FROM generation").fetchone()[0]
+
+    def query(self, signatures, limit=5, min_similarity=0.5, exclude=None):
+        """Closest indexed datasets, as dicts sorted by decreasing estimated Jaccard similarity.
+
+        A dataset's similarity is the larger of its "rows" and "values" estimates.
+        """
+        best = {}
+        with self.lock:
+            for kind, signature in signatures.items():
+                if signature is None:
+                    continue
+                keys = [int(key) for key in band_keys(signature, self.bands)]
+                placeholders = ", ".join("?" for _ in keys)
+                rows = self.conn.execute(
+                    f"""SELECT s.dataset_id, s.dataset_name, s.signature FROM signatures s
+                        WHERE s.kind = ? AND s.dataset_id IN (
+                            SELECT dataset_id FROM bands WHERE kind = ? AND band_key IN ({placeholders}))""",
+                    (kind, kind, *keys)).fetchall()
+                for dataset_id, dataset_name, blob in rows:
+                    if dataset_id == exclude:
+                        continue
+                    similarity = jaccard_estimate(signature, np.frombuffer(blob, dtype=np.uint32))
+                    match = best.setdefault(dataset_id, {"datasetHash": dataset_id, "name": dataset_name, "similarity": 0.0})
+                    match[kind] = round(similarity, 4)
+                    match["similarity"] = max(match["similarity"], round(similarity, 4))
+        matches = [match for match in best.values() if match["similarity"] >= min_similarity]
+        return sorted(matches, key=lambda match: -match["similarity"])[:limit]
+
+    def __len__(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(DISTINCT dataset_id) FROM signatures").fetchone()[0]
+
+class NearDuplicateCheck:
+    """Query the index of published datasets; only register() adds to it.
+
+    The signatures of the last RECENT_SIGNATURES checked datasets are kept,
+    so a dataset can be registered by its hash right after it was verified.
+    """
+
+    def __init__(self, index=None, limit=5, min_similarity=0.5):
+        self.index = index if index is not None else NearDuplicateIndex()
+        self.limit = limit
+        self.min_similarity = min_similarity
+        self.lock = threading.Lock()
+        self.recent = OrderedDict()
+
+    def check_near_duplicates(self, dataset_hash, dataset_name, signatures):
+        """Find the closest registered datasets; indexes nothing."""
+        matches = self.index.query(signatures, self.limit, self.min_similarity, exclude=dataset_hash)
+        with self.lock:
+            self.recent[dataset_hash] = signatures
+            self.recent.move_to_end(dataset_hash)
+            while len(self.recent) > RECENT_SIGNATURES:
+                self.recent.popitem(last=False)
+        return {
+            "similarity": matches[0]["similarity"] if matches else 0.0,
+            "matches": matches,
+        }
+
+    def register(self, dataset_hash, dataset_name=None, signatures=None):
+        """Index a published dataset; signatures default to those of its latest check.
+
+        Returns False when there are none to index.
+        """
+        if signatures is None:
+            with self.lock:
+                signatures = self.recent.get(dataset_hash)
+        if signatures is None:
+            return False
+        self.index.add(dataset_hash, signatures, dataset_name)
+        return True
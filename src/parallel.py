@@ -0,0 +1,177 @@
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from .quality_check import QualityCheck
+from .pii_detection import PIIDetection
+from .relevance_check import RelevanceCheck
+from .bias_check import BiasCheck
+from .models import pii_pipeline
+from .instrumentation import Instrumentation
+
+CHECK_STAGES = ["quality", "pii", "relevance", "bias"]
+
+# Check instances of a pool worker, created once by _init_worker
+_worker_checks = None
+
+class SharedFrame:
+    """A DataFrame and its column profiles written once into shared memory for the pool workers.
+
+    Both are serialized with pickle protocol 5: column blocks and profile
+    arrays are stored as out-of-band buffers that workers map zero-copy
+    (read-only), and only the small frame skeleton, object columns and
+    profile scalars are unpickled per task. The profiles travel without
+    their column (ColumnProfile.__getstate__) and are rebound to the
+    mapped frame. Only the segment name and offsets go through the task queue.
+    """
+
+    def __init__(self, df, profiles=None):
+        buffers = []
+
+        def keep_out_of_band(buffer):
+            try:
+                buffers.append(buffer.raw())
+            except BufferError:
+                # Non-contiguous buffers stay in the pickle stream
+                return True
+            return False
+
+        payload = pickle.dumps((df, profiles), protocol=5, buffer_callback=keep_out_of_band)
+        self.spans = []
+        offset = len(payload)
+        for buffer in buffers:
+            self.spans.append((offset, offset + buffer.nbytes))
+            offset += buffer.nbytes
+        self.payload_size = len(payload)
+        self._shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        self.name = self._shm.name
+        self._shm.buf[:len(payload)] = payload
+        for buffer, (start, end) in zip(buffers, self.spans):
+            self._shm.buf[start:end] = buffer.cast("B")
+
+    def __getstate__(self):
+        return {"name": self.name, "spans": self.spans, "payload_size": self.payload_size}
+
+    def attach(self):
+        """Map the segment and return (df, profiles, segment); close the segment once both are released."""
+        # Pool workers share the parent's resource tracker, so attaching does not add a second owner
+        shm = shared_memory.SharedMemory(name=self.name)
+        view = shm.buf.toreadonly()
+        df, profiles = pickle.loads(view[:self.payload_size], buffers=[view[start:end] for start, end in self.spans])
+        for col, profile in (profiles or {}).items():
+            profile._series = df[col]
+        return df, profiles, shm
+
+    def unlink(self):
+        self._shm.close()
+        self._shm.unlink()
+
+def _init_worker(config=None, load_nlp=False):
+    """Create the checks once per worker process; load_nlp also loads the shared spaCy pipeline."""
+    global _worker_checks
+    _worker_checks = {
+        "quality": QualityCheck(config),
+        "pii": PIIDetection(),
+        "relevance": RelevanceCheck(),
+        "bias": BiasCheck(config),
+    }
+    if load_nlp:
+        pii_pipeline()
+
+def run_stage(checks, stage, df, profiles, dataset_name, pii_mode):
+    """Run one verification stage and return its result."""
+    if stage == "quality":
+        return checks["quality"].check_quality(df, profiles)
+    if stage == "pii":
+        return checks["pii"].scan(df, profiles, pii_mode)
+    if stage == "relevance":
+        return checks["relevance"].check_relevance(df, dataset_name, profiles)
+    if stage == "bias":
+        return checks["bias"].check_bias(df, profiles)
+    raise ValueError(f"Unknown verification stage: {stage}")
+
+def _run_shared_stage(stage, frame, dataset_name, pii_mode, trace_memory=False):
+    instrumentation = Instrumentation(trace_memory)
+    try:
+        with instrumentation.stage(stage):
+            df, profiles, shm = frame.attach()
+            try:
+                result = run_stage(_worker_checks, stage, df, profiles, dataset_name, pii_mode)
+            finally:
+                # Every view into the segment has to be gone before it can be closed
+                df = profiles = None
+                shm.close()
+    finally:
+        instrumentation.close()
+    return result, instrumentation.report(digits=6)
+
+class ProcessExecutor:
+    """Runs the independent verification stages concurrently on persistent process pools.
+
+    The PII stage has a one-process pool of its own, the only worker that
+    loads the spaCy pipeline; the other stages share a pool of up to
+    max_workers processes. Pools are started on first use and each worker
+    creates the checks once. The columns are profiled once, by the caller,
+    and shipped to the workers with the frame.
+    """
+
+    def __init__(self, max_workers=None, mp_context=None, config=None):
+        self.max_workers = max_workers or min(len(CHECK_STAGES) - 1, os.cpu_count() or 1)
+        self.mp_context = mp_context
+        self.config = config
+        self._pool = None
+        self._pii_pool = None
+
+    @property
+    def pool(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=self.mp_context,
+                                             initializer=_init_worker, initargs=(self.config,))
+        return self._pool
+
+    @property
+    def pii_pool(self):
+        if self._pii_pool is None:
+            self._pii_pool = ProcessPoolExecutor(max_workers=1, mp_context=self.mp_context,
+                                                 initializer=_init_worker, initargs=(self.config, True))
+        return self._pii_pool
+
+    def run(self, df, profiles, dataset_name, pii_mode, before_wait=None, progress=None, instrumentation=None):
+        """Run every stage over df and its column profiles and return {stage: result}.
+
+        The workers' measurements are merged into instrumentation, next to
+        the "share" stage (copying the frame and profiles into shared memory).
+
+        before_wait is called in this process while the workers run, and
+        progress(stage, done, total) as each stage finishes. If progress
+        raises, stages that have not started yet are cancelled.
+        """
+        instrumentation = instrumentation or Instrumentation()
+        with instrumentation.stage("share"):
+            frame = SharedFrame(df, profiles)
+        try:
+            futures = {stage: (self.pii_pool if stage == "pii" else self.pool).submit(
+                           _run_shared_stage, stage, frame, dataset_name, pii_mode, instrumentation.trace_memory)
+                       for stage in CHECK_STAGES}
+            if before_wait is not None:
+                before_wait()
+            results = {}
+            try:
+                for stage, future in futures.items():
+                    results[stage], measured = future.result()
+                    instrumentation.merge(measured)
+                    if progress is not None:
+                        progress(stage, len(results), len(CHECK_STAGES))
+            except BaseException:
+                for future in futures.values():
+                    future.cancel()
+                raise
+        finally:
+            frame.unlink()
+        return results
+
+    def shutdown(self):
+        for pool in (self._pool, self._pii_pool):
+            if pool is not None:
+                pool.shutdown()
+        self._pool = self._pii_pool = None
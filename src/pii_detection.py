@@ -1,43 +1,271 @@
-import spacy
+import logging
 import re
+import math
+import numpy as np
 import pandas as pd
+from scipy.stats import norm
 from .utils import convert_to_native
+from .column_profile import profile_columns
+from .compaction import as_text
+from .models import pii_pipeline
+from .instrumentation import current
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # pragma: no cover - pyarrow is optional; values are then screened one at a time
+    pa = pc = None
+
+logger = logging.getLogger(__name__)
+
+EMAIL_PATTERN = re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b")
+SHORT_TOKEN_PATTERN = re.compile(r"^[A-Za-z0-9-]{1,10}$")
+PII_SCAN_MODES = ["exhaustive", "sampled"]
+
+# RE2 forms of the rules for ASCII values, where they agree with Python's re and str methods:
+# Python's $ also matches before a final newline, and str.split() splits on \x1c-\x1f too
+ARROW_SHORT_TOKEN = r"^[A-Za-z0-9-]{1,10}\n?$"
+ARROW_EMAIL = EMAIL_PATTERN.pattern
+ARROW_FEW_WORDS = r"^[\t-\r\x1c-\x20]*(?:[^\t-\r\x1c-\x20]+(?:[\t-\r\x1c-\x20]+[^\t-\r\x1c-\x20]+)?)?[\t-\r\x1c-\x20]*$"
+
+def _prescreen_python(values, skip, email, ner):
+    """Apply the screening rules to values one at a time, setting the masks in place."""
+    for i, val in enumerate(values):
+        if (val.lower() in ["", "nan"] or
+                val.isdigit() or
+                len(val) < 3 or
+                SHORT_TOKEN_PATTERN.match(val)):
+            skip[i] = True
+        elif EMAIL_PATTERN.search(val):
+            email[i] = True
+        elif len(val.split()) <= 2:
+            # Longer values never count as a PERSON hit, so they skip the model entirely
+            ner[i] = True
+
+def prescreen(values):
+    """Boolean masks (skip, email, needs_ner) over an array of stripped string values.
+
+    skip marks values that can never count as PII (blank, "nan", digits,
+    short tokens), email those holding an email address, and needs_ner
+    the rest of one or two words, the only ones the model has to see.
+    ASCII values are screened in bulk with Arrow's regex kernels; other
+    values, whose Unicode rules RE2 does not share with Python, one at a time.
+    """
+    values = np.asarray(values, dtype=object)
+    skip, email, ner = (np.zeros(len(values), dtype=bool) for _ in range(3))
+    if pc is None or len(values) == 0:
+        _prescreen_python(values, skip, email, ner)
+        return skip, email, ner
+    try:
+        array = pa.array(values, type=pa.string())
+    except (pa.ArrowException, UnicodeEncodeError):
+        _prescreen_python(values, skip, email, ner)
+        return skip, email, ner
+    ascii_values = pc.fill_null(pc.string_is_ascii(array), False)
+    skip_arrow = pc.or_(pc.or_(pc.less(pc.utf8_length(array), 3), pc.equal(pc.ascii_lower(array), "nan")),
+                        pc.or_(pc.ascii_is_decimal(array), pc.match_substring_regex(array, ARROW_SHORT_TOKEN)))
+    keep = pc.and_not(ascii_values, skip_arrow)
+    skip[:] = pc.and_(ascii_values, skip_arrow).to_numpy(zero_copy_only=False)
+    email_arrow = pc.and_(keep, pc.match_substring_regex(array, ARROW_EMAIL))
+    email[:] = email_arrow.to_numpy(zero_copy_only=False)
+    ner[:] = pc.and_(pc.and_not(keep, email_arrow),
+                     pc.match_substring_regex(array, ARROW_FEW_WORDS)).to_numpy(zero_copy_only=False)
+    residual = np.flatnonzero(~ascii_values.to_numpy(zero_copy_only=False))
+    if len(residual):
+        residual_masks = [np.zeros(len(residual), dtype=bool) for _ in range(3)]
+        _prescreen_python(values[residual], *residual_masks)
+        for mask, residual_mask in zip((skip, email, ner), residual_masks):
+            mask[residual] = residual_mask
+    return skip, email, ner
+
+def wilson_interval(hits, n, z):
+    """Wilson score interval for a binomial proportion."""
+    if n == 0:
+        return 0.0, 1.0
+    p = hits / n
+    denom = 1 + z * z / n
+    center = (p + z * z / (2 * n)) / denom
+    half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+    return max(center - half, 0.0), min(center + half, 1.0)
 
 class PIIDetection:
-    def __init__(self):
-        self.nlp = spacy.load("en_core_web_sm", disable=["tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer"])
+    def __init__(self, batch_size=1000, n_process=1, sample_batch=256, max_sample=5000,
+                 hit_rate_threshold=0.01, min_detectable_rate=0.002, confidence=0.95, random_state=None):
+        self.batch_size = batch_size
+        self.n_process = n_process
+        # Sampled mode: stop once a column's hit rate is confirmed above hit_rate_threshold,
+        # or once the sample rules out a rate of min_detectable_rate, at the given confidence
+        self.sample_batch = sample_batch
+        self.max_sample = max_sample
+        self.hit_rate_threshold = hit_rate_threshold
+        self.min_detectable_rate = min_detectable_rate
+        self.confidence = confidence
+        self.random_state = random_state
+
+    @property
+    def nlp(self):
+        """The shared spaCy pipeline, loaded on first use."""
+        return pii_pipeline()
+
+    def skip_columns(self, df, profiles):
+        """Columns that are unlikely to hold PII (numeric, IDs or low-cardinality categoricals)."""
+        return [col for col in profiles if profiles[col].dtype in ["int64", "float64"] or
+                profiles[col].unique_ratio < 0.1 or
+                col.lower() in ["id", "identifier", "index"]]
+
+    def find_pii(self, df, profiles=None):
+        """Return {column: {value: row labels}} for every cell detected as PII.
 
-    def detect_pii(self, df):
+        Each column is deduplicated before scanning, cheap rules drop values
+        that can never count as PII, and only the remaining candidates are
+        streamed through ``nlp.pipe``. Hits are mapped back to every row that
+        holds the value.
+        """
+        if profiles is None:
+            profiles = profile_columns(df)
+        skip_cols = self.skip_columns(df, profiles)
+        instrumentation = current()
+        matches = {}
+        for col in df:
+            if col in skip_cols:
+                continue
+            logger.debug("Checking PII in %s", col)
+            with instrumentation.column(col):
+                values = as_text(df[col], profiles[col].dtype).str.strip()
+                hits = self.scan_values(pd.unique(values), col)
+                if hits:
+                    rows = values[values.isin(hits)]
+                    matches[col] = {val: group.index.tolist() for val, group in rows.groupby(rows, sort=False)}
+        return matches
+
+    def scan_values(self, unique_values, col=""):
+        """Return the subset of distinct, stripped string values that are PII."""
+        values = np.asarray(unique_values, dtype=object)
+        _, email, needs_ner = prescreen(values)
+        hits = values[email].tolist()
+        ner_candidates = values[needs_ner].tolist()
+        emails = len(hits)
+        docs = self.nlp.pipe(ner_candidates, batch_size=self.batch_size, n_process=self.n_process)
+        for val, doc in zip(ner_candidates, docs):
+            if any(ent.label_ == "PERSON" for ent in doc.ents):
+                hits.append(val)
+        instrumentation = current()
+        instrumentation.count("pii_values_scanned", len(unique_values))
+        instrumentation.count("pii_ner_candidates", len(ner_candidates))
+        logger.debug("PII in %s: %s emails, %s PERSON entities among %s candidates",
+                     col, emails, len(hits) - emails, len(ner_candidates))
+        return hits
+
+    def detect_pii(self, df, profiles=None, mode="exhaustive"):
         """Detect PII using spaCy with batch processing."""
-        pii_count = 0
-        pii_values = set()
-        batch_size = 1000
+        result = self.scan(df, profiles, mode)
+        return result["pii_detected"], result["pii_count"]
 
-        # Dynamically identify columns to skip (likely IDs, short strings, or categorical)
-        skip_cols = [col for col in df if df[col].dtype in ["int64", "float64"] or 
-                     df[col].nunique() / len(df[col].dropna()) < 0.1 or
-                     col.lower() in ["id", "identifier", "index"]]
+    def scan(self, df, profiles=None, mode="exhaustive"):
+        """Run a PII scan and return the count, its interval and the mode used."""
+        if mode not in PII_SCAN_MODES:
+            raise ValueError(f"Unknown PII scan mode: {mode}")
+        if mode == "sampled":
+            return self._sampled_scan(df, profiles)
+        matches = self.find_pii(df, profiles)
+        # A value only counts once, even if it appears in several columns
+        pii_values = set()
+        for column_hits in matches.values():
+            pii_values.update(column_hits)
+        pii_count = len(pii_values)
+        return {
+            "mode": "exhaustive",
+            "pii_detected": pii_count > 0,
+            "pii_count": pii_count,
+            "pii_count_interval": [pii_count, pii_count],
+            "columns": {col: {"hits": len(column_hits), "values": list(column_hits)}
+                        for col, column_hits in matches.items()},
+        }
 
+    def _sampled_scan(self, df, profiles=None):
+        if profiles is None:
+            profiles = profile_columns(df)
+        rng = np.random.default_rng(self.random_state)
+        z = norm.ppf(1 - (1 - self.confidence) / 2)
+        skip_cols = self.skip_columns(df, profiles)
+        instrumentation = current()
+        columns = {}
         for col in df:
             if col in skip_cols:
                 continue
-            print(f"Checking PII in {col}")
-            for start in range(0, len(df), batch_size):
-                batch = df[col][start:start + batch_size].astype(str).str.strip()
-                for val in batch:
-                    if (val.lower() in ["", "nan"] or 
-                        val.isdigit() or 
-                        len(val) < 3 or
-                        re.match(r"^[A-Za-z0-9-]{1,10}$", val)):
-                        continue
-                    doc = self.nlp(val)
-                    for ent in doc.ents:
-                        if ent.label_ == "PERSON" and len(val.split()) <= 2 and val not in pii_values:
-                            print(f"Detected entity in {col}: '{val}' as PERSON")
-                            pii_values.add(val)
-                            pii_count += 1
-                    if re.search(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b", val) and val not in pii_values:
-                        print(f"Detected email in {col}: '{val}'")
-                        pii_values.add(val)
-                        pii_count += 1
-        return pii_count > 0, pii_count
\ No newline at end of file
+            logger.debug("Sampling PII in %s", col)
+            with instrumentation.column(col):
+                columns[col] = self._sample_column(pd.unique(as_text(df[col], profiles[col].dtype).str.strip()), col, rng, z)
+        estimate = sum(result["estimate"] for result in columns.values())
+        return {
+            "mode": "sampled",
+            "pii_detected": any(result["hits"] > 0 for result in columns.values()),
+            "pii_count": int(round(estimate)),
+            "pii_count_interval": [int(math.floor(sum(result["interval"][0] for result in columns.values()))),
+                                   int(math.ceil(sum(result["interval"][1] for result in columns.values())))],
+            "confidence": self.confidence,
+            "columns": columns,
+        }
+
+    def _sample_column(self, values, col, rng, z, population=None):
+        """Scan a stratified random sample of a column's distinct values with early exit.
+
+        population is the column's distinct-value count when values is itself
+        only a sample of them (streaming mode); it defaults to len(values).
+        """
+        total = len(values)
+        population = max(population or total, total)
+        order = self._stratified_order(total, rng)
+        hits = sampled = 0
+        stopped = "exhausted"
+        while sampled < len(order):
+            batch = values[order[sampled:sampled + self.sample_batch]]
+            hits += len(self.scan_values(batch, col))
+            sampled += len(batch)
+            lower, upper = wilson_interval(hits, sampled, z)
+            if sampled == total:
+                break
+            if lower > self.hit_rate_threshold:
+                stopped = "confirmed"
+                break
+            if upper < self.min_detectable_rate:
+                stopped = "ruled_out"
+                break
+        else:
+            stopped = "max_sample" if sampled < total else stopped
+        if stopped == "exhausted" and sampled < population:
+            stopped = "max_sample"
+
+        if sampled == population:
+            interval = [float(hits), float(hits)]
+        elif sampled == 0:
+            # Nothing to sample from (this also covers population 1, where sampled < population means 0)
+            interval = [0.0, float(population)]
+        else:
+            # Shrink the Wilson interval towards the point estimate by the finite-population
+            # correction, then clamp to what the sample already proves
+            fpc = math.sqrt((population - sampled) / (population - 1))
+            rate = hits / sampled
+            low, high = rate - (rate - lower) * fpc, rate + (upper - rate) * fpc
+            interval = [max(low * population, hits), min(high * population, population - (sampled - hits))]
+        return {
+            "distinct": population,
+            "sampled": sampled,
+            "hits": hits,
+            "estimate": hits / sampled * population if sampled else 0.0,
+            "interval": interval,
+            "stopped": stopped,
+        }
+
+    def _stratified_order(self, total, rng):
+        """Random order over value positions that draws evenly from contiguous position strata."""
+        size = min(total, self.max_sample)
+        if size == 0:
+            return np.arange(0)
+        strata_count = max(1, min(size // self.sample_batch, 32))
+        stratum = np.arange(total) * strata_count // total
+        by_stratum = np.lexsort((rng.random(total), stratum))
+        rank = np.empty(total, dtype=np.int64)
+        starts = np.searchsorted(stratum[by_stratum], np.arange(strata_count))
+        rank[by_stratum] = np.arange(total) - np.repeat(starts, np.diff(np.append(starts, total)))
+        return np.lexsort((stratum, rank))[:size]
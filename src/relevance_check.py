@@ -1,9 +1,7 @@
-import spacy
 import pandas as pd
 
 class RelevanceCheck:
     def __init__(self):
-        self.nlp = spacy.load("en_core_web_sm", disable=["parser", "ner"])
         self.domains = {
             "Health": ["depression", "stress", "mental", "sleep", "diet", "health"],
             "Finance": ["amount", "transaction", "credit", "balance"],
@@ -13,20 +11,22 @@ class RelevanceCheck:
             "Other": []
         }
 
-    def check_relevance(self, df, dataset_name):
+    def check_relevance(self, df, dataset_name, profiles=None):
         """Determine dataset relevance based on columns and content."""
         score = {domain: 0 for domain in self.domains}
         dataset_name_lower = dataset_name.lower()
-        
+        columns = list(profiles) if profiles is not None else df.columns
+
         # Score based on column names
-        for col in df.columns:
+        for col in columns:
             col_lower = col.lower()
             for domain, keywords in self.domains.items():
                 for keyword in keywords:
                     if keyword in col_lower:
                         score[domain] += 1
                 # Boost for binary target columns
-                if col_lower == "class" and pd.Series(df[col]).nunique() == 2:
+                unique_count = profiles[col].unique_count if profiles is not None else pd.Series(df[col]).nunique()
+                if col_lower == "class" and unique_count == 2:
                     if domain == "Fraud Detection":
                         score[domain] += 3
                     elif domain == "Finance":
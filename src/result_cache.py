@@ -0,0 +1,97 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+def cache_key(content_hash, dataset_name, config_version, options=""):
+    """Key a verification result by file content, dataset name and verifier configuration."""
+    return hashlib.sha256(json.dumps([content_hash, dataset_name, config_version, options]).encode()).hexdigest()
+
+class ResultCache:
+    """Two-tier cache of JSON-serializable verification results.
+
+    The memory tier is an LRU bounded by the size of the encoded entries
+    (max_bytes). The optional disk tier is a SQLite file that survives
+    restarts and is shared by every process using the same path; disk hits
+    are promoted back into memory.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, path=None):
+        self.max_bytes = max_bytes
+        self.path = path
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.conn = None
+        if path:
+            self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL)")
+
+    def get(self, key):
+        """Return the cached result for key, or None."""
+        with self.lock:
+            encoded = self.entries.get(key)
+            if encoded is not None:
+                self.entries.move_to_end(key)
+                self.memory_hits += 1
+                return json.loads(encoded)
+            if self.conn is not None:
+                row = self.conn.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    self.disk_hits += 1
+                    self._remember(key, row[0])
+                    return json.loads(row[0])
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        encoded = json.dumps(value)
+        with self.lock:
+            self._remember(key, encoded)
+            if self.conn is not None:
+                self.conn.execute("INSERT OR REPLACE INTO results (key, value, created) VALUES (?, ?, ?)",
+                                  (key, encoded, time.time()))
+
+    def _remember(self, key, encoded):
+        if key in self.entries:
+            self.bytes -= len(self.entries.pop(key))
+        if len(encoded) > self.max_bytes:
+            return
+        self.entries[key] = encoded
+        self.bytes += len(encoded)
+        while self.bytes > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.bytes -= len(evicted)
+            self.evictions += 1
+
+    def get_or_compute(self, key, compute):
+        """Return the cached result for key, computing and storing it on a miss."""
+        result = self.get(key)
+        if result is None:
+            result = compute()
+            self.put(key, result)
+        return result
+
+    def stats(self):
+        with self.lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                "hits": hits,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+                "entries": len(self.entries),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "evictions": self.evictions,
+                "disk": self.path is not None,
+            }
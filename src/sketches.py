@@ -0,0 +1,393 @@
+import math
+import numpy as np
+import pandas as pd
+
+def hash_values(series):
+    """64-bit hashes of a Series' values; numeric values hash by their float64 value."""
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        series = series.astype("float64")
+    return pd.util.hash_pandas_object(series, index=False).to_numpy()
+
+def hash_rows(df):
+    """64-bit hash per row, combining the per-column value hashes."""
+    combined = np.zeros(len(df), dtype=np.uint64)
+    for col in df:
+        combined = combined * np.uint64(0x100000001B3) ^ hash_values(df[col])
+    return combined
+
+def value_keys(series, distinct_nulls=False):
+    """64-bit keys of a Series' values, equal exactly when pandas counts the values as duplicates.
+
+    Unlike hash_values, integers keep their own dtype (ids above 2**53 stay
+    distinct) and -0.0 and every NaN get one key each. Object columns of
+    anything but strings get pandas' own codes, since the value hash
+    stringifies mixed values (1 and "1" would collide). Nulls of an object
+    column share one key, as in a multi-column DataFrame.duplicated;
+    distinct_nulls keeps None, NaN and NA apart, as Series.duplicated does.
+    """
+    if series.dtype != object:
+        if pd.api.types.is_float_dtype(series) and isinstance(series.dtype, np.dtype):
+            values = series.to_numpy()
+            return pd.util.hash_array(np.where(np.isnan(values), np.nan, values + 0.0))
+        return pd.util.hash_pandas_object(series, index=False).to_numpy()
+    if pd.api.types.infer_dtype(series, skipna=True) in ("string", "empty"):
+        keys = pd.util.hash_pandas_object(series, index=False).to_numpy()
+    else:
+        keys = mix64(pd.factorize(series)[0].astype(np.int64).view(np.uint64))
+    if distinct_nulls:
+        nulls = series.isna().to_numpy()
+        if nulls.any():
+            keys = keys.copy()
+            keys[nulls] = mix64(pd.factorize(series[nulls].map(type))[0].astype(np.uint64) + np.uint64(1 << 32))
+    return keys
+
+def row_keys(df):
+    """64-bit key per row from the columns' value_keys, for counting duplicate rows of an in-memory frame."""
+    combined = np.zeros(len(df), dtype=np.uint64)
+    for i in range(df.shape[1]):
+        # pandas compares a single column's values as Series.duplicated does
+        combined = combined * np.uint64(0x100000001B3) ^ value_keys(df.iloc[:, i], df.shape[1] == 1)
+    return combined
+
+def count_repeats(keys):
+    """Number of keys equal to an earlier key, from one sort of the uint64 array."""
+    if len(keys) < 2:
+        return 0
+    keys = np.sort(keys)
+    return int(np.count_nonzero(keys[1:] == keys[:-1]))
+
+def _bit_length(values):
+    """Exact bit length of uint64 values (0 for 0)."""
+    high = (values >> np.uint64(32)).astype(np.float64)
+    low = (values & np.uint64(0xFFFFFFFF)).astype(np.float64)
+    high_bits = np.frexp(high)[1]
+    low_bits = np.frexp(low)[1]
+    return np.where(high > 0, high_bits + 32, low_bits)
+
+class HyperLogLog:
+    """Mergeable distinct-count sketch; relative error is about 1.04 / sqrt(2 ** precision)."""
+
+    def __init__(self, precision=14):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def update_hashes(self, hashes):
+        if len(hashes) == 0:
+            return self
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        shift = np.uint64(64 - self.precision)
+        index = (hashes >> shift).astype(np.int64)
+        remainder = hashes & np.uint64((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - _bit_length(remainder) + 1
+        np.maximum.at(self.registers, index, rank.astype(np.uint8))
+        return self
+
+    def update(self, series):
+        return self.update_hashes(hash_values(series.dropna()))
+
+    def merge(self, other):
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def estimate(self):
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros > 0:
+            # Linear counting is far more accurate for small cardinalities
+            return m * math.log(m / zeros)
+        return raw
+
+class TDigest:
+    """Mergeable quantile sketch (merging t-digest with the arcsine scale function).
+
+    Centroids are small near both tails, so extreme quantiles and tail CDF
+    values, which drive the IQR and MAD outlier counts, stay accurate.
+    """
+
+    def __init__(self, compression=1000):
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.min = np.inf
+        self.max = -np.inf
+        self._buffer = []
+        self._buffered = 0
+
+    @property
+    def count(self):
+        return float(self.weights.sum()) + self._buffered
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return self
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self._buffer.append((values, np.ones(len(values))))
+        self._buffered += len(values)
+        if self._buffered > 20 * self.compression:
+            self._compress()
+        return self
+
+    def merge(self, other):
+        other._compress()
+        if len(other.means):
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+            self._buffer.append((other.means, other.weights))
+            self._buffered += int(other.weights.sum())
+            self._compress()
+        return self
+
+    def _compress(self):
+        if not self._buffer:
+            return
+        means = np.concatenate([self.means] + [values for values, _ in self._buffer])
+        weights = np.concatenate([self.weights] + [w for _, w in self._buffer])
+        self._buffer, self._buffered = [], 0
+        order = np.argsort(means, kind="stable")
+        means, weights = means[order], weights[order]
+        total = weights.sum()
+        midpoints = (np.cumsum(weights) - weights / 2) / total
+        scale = self.compression / (2 * np.pi) * np.arcsin(2 * midpoints - 1)
+        buckets = np.floor(scale - scale[0]).astype(np.int64)
+        merged_weights = np.bincount(buckets, weights=weights)
+        merged_sums = np.bincount(buckets, weights=weights * means)
+        keep = merged_weights > 0
+        self.weights = merged_weights[keep]
+        self.means = merged_sums[keep] / self.weights
+
+    def _positions(self):
+        self._compress()
+        return np.cumsum(self.weights) - self.weights / 2
+
+    def quantile(self, q):
+        """Approximate quantile(s) for q in [0, 1]."""
+        positions = self._positions()
+        if len(positions) == 0:
+            return np.full(np.shape(q), np.nan) if np.ndim(q) else np.nan
+        total = self.weights.sum()
+        xp = np.concatenate([[0.0], positions, [total]])
+        fp = np.concatenate([[self.min], self.means, [self.max]])
+        return np.interp(np.asarray(q, dtype=np.float64) * total, xp, fp)
+
+    def cdf(self, x):
+        """Approximate fraction of values below x."""
+        positions = self._positions()
+        if len(positions) == 0:
+            return np.full(np.shape(x), np.nan) if np.ndim(x) else np.nan
+        total = self.weights.sum()
+        xp = np.concatenate([[self.min], self.means, [self.max]])
+        fp = np.concatenate([[0.0], positions, [total]]) / total
+        return np.interp(x, xp, fp, left=0.0, right=1.0)
+
+class Moments:
+    """Mergeable count / mean / central-moment accumulator (Chan et al. pairwise update)."""
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.m3 = 0.0
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return self
+        other = Moments()
+        other.n = len(values)
+        other.mean = float(values.mean())
+        deviations = values - other.mean
+        other.m2 = float(np.dot(deviations, deviations))
+        other.m3 = float(np.sum(deviations ** 3))
+        return self.merge(other)
+
+    def merge(self, other):
+        if other.n == 0:
+            return self
+        if self.n == 0:
+            self.n, self.mean, self.m2, self.m3 = other.n, other.mean, other.m2, other.m3
+            return self
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        mean = self.mean + delta * other.n / n
+        m2 = self.m2 + other.m2 + delta * delta * self.n * other.n / n
+        m3 = (self.m3 + other.m3 + delta ** 3 * self.n * other.n * (self.n - other.n) / (n * n) +
+              3 * delta * (self.n * other.m2 - other.n * self.m2) / n)
+        self.n, self.mean, self.m2, self.m3 = n, mean, m2, m3
+        return self
+
+    @property
+    def std(self):
+        """Sample standard deviation (ddof=1), like pandas."""
+        return math.sqrt(self.m2 / (self.n - 1)) if self.n > 1 else np.nan
+
+    @property
+    def skew(self):
+        """Biased sample skewness, like scipy.stats.skew."""
+        if self.n == 0 or self.m2 <= 0:
+            return np.nan
+        return math.sqrt(self.n) * self.m3 / self.m2 ** 1.5
+
+class TopCounter:
+    """Value frequencies, exact until more than `capacity` distinct values are seen.
+
+    Past capacity only the most frequent values are kept; `error` bounds how
+    much any evicted value's count could have been.
+    """
+
+    def __init__(self, capacity=10000):
+        self.capacity = capacity
+        self.counts = pd.Series(dtype="int64")
+        self.error = 0
+
+    def update(self, series):
+        return self._add(series.value_counts())
+
+    def merge(self, other):
+        self.error += other.error
+        return self._add(other.counts)
+
+    def _add(self, counts):
+        if len(counts) == 0:
+            return self
+        self.counts = self.counts.add(counts, fill_value=0).astype("int64")
+        if len(self.counts) > self.capacity:
+            self.counts = self.counts.nlargest(self.capacity)
+            self.error = max(self.error, int(self.counts.iloc[-1]))
+        return self
+
+    def top_frequency(self):
+        return int(self.counts.max()) if len(self.counts) else 0
+
+class DistinctSample:
+    """Uniform sample of distinct values: the `size` values with the smallest hashes (bottom-k)."""
+
+    def __init__(self, size=5000):
+        self.size = size
+        self.hashes = np.empty(0, dtype=np.uint64)
+        self.values = np.empty(0, dtype=object)
+
+    def update(self, series):
+        return self._add(hash_values(series), series.to_numpy(dtype=object))
+
+    def merge(self, other):
+        return self._add(other.hashes, other.values)
+
+    def _add(self, hashes, values):
+        hashes = np.concatenate([self.hashes, hashes])
+        values = np.concatenate([self.values, values])
+        hashes, first = np.unique(hashes, return_index=True)
+        self.hashes = hashes[:self.size]
+        self.values = values[first[:self.size]]
+        return self
+
+def mix64(values):
+    """splitmix64 finalizer: a fast, well-mixed bijection on uint64 arrays."""
+    values = np.asarray(values, dtype=np.uint64).copy()
+    values ^= values >> np.uint64(30)
+    values *= np.uint64(0xBF58476D1CE4E5B9)
+    values ^= values >> np.uint64(27)
+    values *= np.uint64(0x94D049BB133111EB)
+    values ^= values >> np.uint64(31)
+    return values
+
+class MinHash:
+    """Mergeable MinHash signature of a set of 64-bit hashes (one-permutation hashing).
+
+    Each hash is mixed once and routed to one of num_bins bins by its top
+    bits; a bin keeps its minimum. That costs O(n) instead of O(n * bins),
+    and chunked updates give exactly the same signature as one update.
+    Empty bins are filled from the next non-empty bin (rotation
+    densification) when the signature is read.
+    """
+
+    EMPTY = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+    def __init__(self, num_bins=128, seed=0x9E3779B97F4A7C15):
+        if num_bins & (num_bins - 1):
+            raise ValueError("num_bins must be a power of two")
+        self.num_bins = num_bins
+        self.seed = np.uint64(seed)
+        self.shift = np.uint64(64 - (num_bins.bit_length() - 1))
+        self.mins = np.full(num_bins, self.EMPTY, dtype=np.uint64)
+
+    def update_hashes(self, hashes):
+        if len(hashes) == 0:
+            return self
+        mixed = mix64(np.asarray(hashes, dtype=np.uint64) ^ self.seed)
+        bins = (mixed >> self.shift).astype(np.intp)
+        values = mixed & ((np.uint64(1) << self.shift) - np.uint64(1))
+        np.minimum.at(self.mins, bins, values)
+        return self
+
+    def merge(self, other):
+        np.minimum(self.mins, other.mins, out=self.mins)
+        return self
+
+    def signature(self):
+        """Densified 32-bit signature, or None for an empty set."""
+        filled = np.flatnonzero(self.mins != self.EMPTY)
+        if len(filled) == 0:
+            return None
+        positions = np.arange(self.num_bins)
+        wrapped = np.concatenate([filled, filled + self.num_bins])
+        source = wrapped[np.searchsorted(wrapped, positions)]
+        distance = (source - positions).astype(np.uint64)
+        dense = mix64(self.mins[source % self.num_bins] + distance * np.uint64(0x9E3779B97F4A7C15))
+        dense[distance == 0] = self.mins[filled]
+        return (dense & np.uint64(0xFFFFFFFF)).astype(np.uint32)
+
+def jaccard_estimate(signature, other):
+    """Estimated Jaccard similarity of the sets behind two MinHash signatures."""
+    if signature is None or other is None:
+        return 0.0
+    return float(np.mean(signature == other))
+
+class DuplicateCounter:
+    """Mergeable count of repeated 64-bit keys (e.g. row hashes), fed a chunk at a time.
+
+    Exact mode keeps every key, 8 bytes per row, and counts repeats with
+    one sort. Approximate mode folds the keys into a HyperLogLog instead
+    (2 ** precision bytes however many rows) and estimates the repeats as
+    rows minus the distinct estimate; error() bounds the estimate.
+    """
+
+    def __init__(self, approximate=False, precision=14):
+        self.approximate = approximate
+        self.rows = 0
+        self.chunks = []
+        self.distinct = HyperLogLog(precision) if approximate else None
+
+    def update(self, keys):
+        self.rows += len(keys)
+        if self.approximate:
+            self.distinct.update_hashes(keys)
+        else:
+            self.chunks.append(np.asarray(keys, dtype=np.uint64))
+        return self
+
+    def merge(self, other):
+        self.rows += other.rows
+        if self.approximate:
+            self.distinct.merge(other.distinct)
+        else:
+            self.chunks.extend(other.chunks)
+        return self
+
+    def count(self):
+        if self.approximate:
+            return int(min(max(round(self.rows - self.distinct.estimate()), 0), max(self.rows - 1, 0)))
+        if len(self.chunks) > 1:
+            self.chunks = [np.concatenate(self.chunks)]
+        return count_repeats(self.chunks[0]) if self.chunks else 0
+
+    def error(self):
+        """Three standard errors of the distinct estimate (about 99.7% of estimates fall within); 0 when exact."""
+        if not self.approximate:
+            return 0
+        return round(3 * 1.04 / math.sqrt(len(self.distinct.registers)) * self.distinct.estimate())
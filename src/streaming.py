@@ -0,0 +1,488 @@
+import logging
+import os
+import numpy as np
+import pandas as pd
+from scipy.stats import norm
+from .column_profile import ColumnProfile
+from .fingerprint import DatasetFingerprint
+from .formats import STREAM_FORMATS
+from .instrumentation import Instrumentation
+from .metrics import record_verification
+from .near_duplicates import DatasetSignature
+from .sketches import (HyperLogLog, TDigest, Moments, TopCounter, DistinctSample, DuplicateCounter, hash_values,
+                       hash_rows)
+from .verifier import Verifier
+
+logger = logging.getLogger(__name__)
+
+KEY_COLUMNS = ["id", "customerid", "userid"]
+
+def detect_format(name):
+    """Map a file name onto a streamable format ("csv" or "jsonl")."""
+    extension = os.path.splitext(str(name))[1].lower()
+    if extension not in STREAM_FORMATS:
+        raise ValueError(f"Unsupported streaming format: {extension}")
+    return STREAM_FORMATS[extension]
+
+def read_chunks(source, file_format, chunksize):
+    """Iterate over DataFrame chunks of a CSV or JSON-lines path or file object.
+
+    Column types are inferred per chunk, so a column that mixes numbers and
+    text (e.g. "abc" in the first chunk only) can parse differently from a
+    whole-file read; its fingerprint and size estimate then differ too.
+    CSV floats are parsed correctly rounded, as src.ingest's Arrow reader
+    parses them, so streamed and in-memory fingerprints agree.
+    """
+    if hasattr(source, "seek"):
+        source.seek(0)
+    if file_format == "csv":
+        return pd.read_csv(source, chunksize=chunksize, float_precision="round_trip")
+    if file_format == "jsonl":
+        return pd.read_json(source, lines=True, chunksize=chunksize)
+    raise ValueError(f"Unsupported streaming format: {file_format}")
+
+def digest_mad(digest, median):
+    """Median absolute deviation from a quantile sketch, by bisection on its CDF."""
+    if digest.count == 0 or np.isnan(median):
+        return np.nan
+    low, high = 0.0, max(digest.max - median, median - digest.min)
+    for _ in range(64):
+        mid = (low + high) / 2
+        if digest.cdf(median + mid) - digest.cdf(median - mid) < 0.5:
+            low = mid
+        else:
+            high = mid
+    return high
+
+class ColumnAccumulator:
+    """Mergeable per-column state: counts, distinct sketches, moments and quantile digests."""
+
+    def __init__(self, name, pii_sample_size=5000):
+        self.name = name
+        self.dtypes = []
+        self.rows = 0
+        self.null_count = 0
+        self.numeric_count = 0
+        self.coercible = True
+        self.invalid_count = 0
+        self.invalid_samples = []
+        self.negative_count = 0
+        self.first = None
+        self.min = np.inf
+        self.max = -np.inf
+        self.distinct = HyperLogLog()
+        self.numeric_distinct = HyperLogLog()
+        self.moments = Moments()
+        self.digest = TDigest()
+        self.log_transform = str(name).lower() == "amount"
+        self.transformed_digest = TDigest() if self.log_transform else None
+        self.top = TopCounter()
+        self.pii_sample = DistinctSample(pii_sample_size)
+        self.pii_hits = set()
+
+    def update(self, series, pii_detection=None, pii_mode="sampled"):
+        if str(series.dtype) not in self.dtypes:
+            self.dtypes.append(str(series.dtype))
+        self.rows += len(series)
+        nulls = int(series.isnull().sum())
+        self.null_count += nulls
+        self.distinct.update(series)
+
+        try:
+            coerced = pd.to_numeric(series, errors="coerce")
+        except Exception:
+            self.coercible = False
+            coerced = None
+        if coerced is not None:
+            if series.dtype == "object":
+                invalid = np.fromiter((isinstance(x, str) for x in series.values), dtype=bool, count=len(series))
+                invalid &= coerced.isna().values
+                self.invalid_count += int(invalid.sum())
+                if len(self.invalid_samples) < 5:
+                    self.invalid_samples += series[invalid].iloc[:5 - len(self.invalid_samples)].tolist()
+            values = coerced.dropna().to_numpy(dtype="float64")
+            self._update_numeric(values)
+
+        if series.dtype == "object":
+            self.top.update(series)
+        # Every column skip_columns may leave in (any dtype but int64 / float64) keeps PII state
+        if pii_detection is not None and series.dtype not in ("int64", "float64"):
+            stripped = series.astype(str).str.strip()
+            if pii_mode == "sampled":
+                self.pii_sample.update(pd.Series(pd.unique(stripped)))
+            else:
+                self.pii_hits.update(pii_detection.scan_values(pd.unique(stripped), self.name))
+        return self
+
+    def _update_numeric(self, values):
+        if len(values) == 0:
+            return
+        if self.first is None:
+            self.first = float(values[0])
+        self.numeric_count += len(values)
+        self.numeric_distinct.update_hashes(hash_values(pd.Series(values)))
+        self.moments.update(values)
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self.negative_count += int((values < 0).sum())
+        self.digest.update(values)
+        if self.log_transform:
+            with np.errstate(invalid="ignore", divide="ignore"):
+                self.transformed_digest.update(np.log1p(values))
+
+    def merge(self, other):
+        """Fold another accumulator for the same column (later rows) into this one."""
+        self.dtypes += [dtype for dtype in other.dtypes if dtype not in self.dtypes]
+        self.rows += other.rows
+        self.null_count += other.null_count
+        self.numeric_count += other.numeric_count
+        self.coercible = self.coercible and other.coercible
+        self.invalid_count += other.invalid_count
+        self.invalid_samples = (self.invalid_samples + other.invalid_samples)[:5]
+        self.negative_count += other.negative_count
+        if self.first is None:
+            self.first = other.first
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.distinct.merge(other.distinct)
+        self.numeric_distinct.merge(other.numeric_distinct)
+        self.moments.merge(other.moments)
+        self.digest.merge(other.digest)
+        if self.log_transform:
+            self.transformed_digest.merge(other.transformed_digest)
+        self.top.merge(other.top)
+        self.pii_sample.merge(other.pii_sample)
+        self.pii_hits |= other.pii_hits
+        return self
+
+    def dtype(self):
+        """The dtype a single full read would most likely have produced."""
+        if not self.dtypes:
+            return np.dtype("object")
+        if "object" in self.dtypes:
+            return np.dtype("object")
+        try:
+            return np.result_type(*self.dtypes)
+        except TypeError:
+            return np.dtype("object")
+
+    def profile(self):
+        return SketchColumnProfile(self)
+
+class SketchColumnProfile(ColumnProfile):
+    """ColumnProfile built from a ColumnAccumulator instead of an in-memory Series.
+
+    Distinct counts come from HyperLogLog and the order statistics from the
+    t-digest, so they carry sketch error; counts, moments and extrema are exact.
+    """
+
+    def __init__(self, accumulator):
+        self.accumulator = accumulator
+        self.name = accumulator.name
+        self._series = None
+        self.dtype = accumulator.dtype()
+        self.is_numeric_dtype = pd.api.types.is_numeric_dtype(self.dtype)
+        self.is_category = False
+        self.is_object = self.dtype == "object"
+
+        self.null_count = accumulator.null_count
+        self.non_null_count = accumulator.rows - accumulator.null_count
+        self.unique_count = min(int(round(accumulator.distinct.estimate())), self.non_null_count)
+        self.unique_ratio = self.unique_count / self.non_null_count if self.non_null_count > 0 else 0.0
+        self.is_low_cardinality = self.is_object and self.unique_ratio < 0.1
+
+        self.numeric = None
+        self.numeric_ratio = np.nan
+        if accumulator.coercible and self.non_null_count > 0:
+            self.numeric_ratio = accumulator.numeric_count / self.non_null_count
+        self.is_numeric = bool(self.numeric_ratio > 0.8)
+        self.invalid_count = accumulator.invalid_count if self.is_numeric and self.is_object else 0
+        self.invalid_samples = accumulator.invalid_samples if self.invalid_count else []
+
+        self.count = accumulator.numeric_count
+        self.numeric_unique_count = min(int(round(accumulator.numeric_distinct.estimate())), self.count)
+        self.mean = self.std = self.min = self.skew = np.nan
+        self.quartiles = (np.nan, np.nan)
+        self.median = self.mad = np.nan
+        self.is_constant = False
+        if self.count > 0:
+            moments = accumulator.moments
+            self.mean = moments.mean
+            self.std = moments.std if self.count > 1 else 0
+            self.min = accumulator.min
+            self.skew = moments.skew
+            self.quartiles = tuple(accumulator.digest.quantile([0.25, 0.75]))
+            self.median = float(accumulator.digest.quantile(0.5))
+            self.mad = digest_mad(accumulator.digest, self.median)
+            first = accumulator.first
+            spread = max(abs(accumulator.max - first), abs(accumulator.min - first))
+            self.is_constant = spread <= 1e-8 + 1e-5 * abs(first)
+        self.top_frequency = accumulator.top.top_frequency()
+
+class DatasetAccumulator:
+    """Mergeable verification state for a dataset read in chunks.
+
+    Memory is bounded by the sketches, except for the 8-byte-per-row hash
+    arrays kept for exact duplicate counting; with approximate_duplicates
+    the duplicates are estimated from HyperLogLog sketches instead.
+    """
+
+    def __init__(self, pii_detection=None, pii_mode="sampled", pii_sample_size=5000, approximate_duplicates=False):
+        self.pii_detection = pii_detection
+        self.pii_mode = pii_mode
+        self.pii_sample_size = pii_sample_size
+        self.approximate_duplicates = approximate_duplicates
+        self.columns = {}
+        self.rows = 0
+        self.memory_bytes = 0
+        self.fingerprint = DatasetFingerprint()
+        self.row_duplicates = DuplicateCounter(approximate_duplicates)
+        self.key_duplicates = {}
+        self.signature = DatasetSignature()
+
+    def update(self, chunk):
+        """Fold the next chunk of rows into the accumulated state."""
+        # The (range) index is counted once, as it would be for the whole frame
+        self.memory_bytes += int(chunk.memory_usage(deep=True, index=self.rows == 0).sum())
+        self.rows += len(chunk)
+        self.fingerprint.update(chunk)
+        for col in chunk:
+            if col not in self.columns:
+                self.columns[col] = ColumnAccumulator(col, self.pii_sample_size)
+            self.columns[col].update(chunk[col], self.pii_detection, self.pii_mode)
+        row_hashes = hash_rows(chunk)
+        self.row_duplicates.update(row_hashes)
+        self.signature.update(chunk, row_hashes)
+        for col in chunk.columns:
+            if str(col).lower() in KEY_COLUMNS:
+                if col not in self.key_duplicates:
+                    self.key_duplicates[col] = DuplicateCounter(self.approximate_duplicates)
+                self.key_duplicates[col].update(hash_values(chunk[col]))
+        return self
+
+    def __getstate__(self):
+        # The PII detector (and its spaCy model) is reattached by whoever restores the state
+        state = self.__dict__.copy()
+        state["pii_detection"] = None
+        return state
+
+    def __setstate__(self, state):
+        if "row_hashes" in state:
+            # Saved before duplicates were counted by DuplicateCounter
+            state["approximate_duplicates"] = False
+            state["row_duplicates"] = DuplicateCounter()
+            for hashes in state.pop("row_hashes"):
+                state["row_duplicates"].update(hashes)
+            state["key_duplicates"] = {}
+            for col, chunks in state.pop("key_hashes").items():
+                state["key_duplicates"][col] = DuplicateCounter()
+                for hashes in chunks:
+                    state["key_duplicates"][col].update(hashes)
+        self.__dict__.update(state)
+
+    def profiles(self):
+        return {col: accumulator.profile() for col, accumulator in self.columns.items()}
+
+    def duplicates(self):
+        """Duplicate rows (or duplicate key values, whichever is larger), counted from row hashes."""
+        return self.duplicates_with_error()[0]
+
+    def duplicates_with_error(self):
+        """(duplicates, error bound); the bound is 0 unless approximate_duplicates."""
+        counter = self.row_duplicates
+        duplicates = counter.count()
+        for col, key_counter in self.key_duplicates.items():
+            key_duplicates = key_counter.count()
+            if key_duplicates > duplicates:
+                duplicates, counter = key_duplicates, key_counter
+            logger.debug("Duplicates in key column %s: %s", col, key_duplicates)
+        return duplicates, counter.error()
+
+class StreamingVerifier:
+    """Verify CSV / JSON-lines data chunk by chunk with bounded memory.
+
+    The report has the same shape as Verifier.verify_dataset. Distinct
+    counts, quartiles and MADs come from mergeable sketches; when the source
+    can be re-read (a path or seekable file) a second pass counts the IQR and
+    MAD outliers exactly against the sketched bounds, otherwise the counts
+    are estimated from the t-digest tails. approximate_duplicates estimates
+    the duplicate rows in fixed memory (HyperLogLog) and adds its error
+    bound to the report as quality.duplicatesError.
+    """
+
+    def __init__(self, verifier=None, chunksize=100_000, exact_counts=True, approximate_duplicates=False):
+        self.verifier = verifier or Verifier()
+        self.chunksize = chunksize
+        self.exact_counts = exact_counts
+        self.approximate_duplicates = approximate_duplicates
+
+    def verify_file(self, source, dataset_name, file_format=None, pii_mode="sampled", progress=None,
+                    instrumentation=None):
+        """Verify a path or file object and return the verification report.
+
+        progress, if given, is called as progress("read", rows_read, None) after every chunk.
+        instrumentation works as in Verifier.verify_dataset.
+        """
+        file_format = file_format or detect_format(source if isinstance(source, (str, os.PathLike)) else getattr(source, "name", ""))
+        logger.debug("Streaming verification of dataset: %s", dataset_name)
+        measured = instrumentation or Instrumentation()
+        with measured.stage("read"):
+            state = self.accumulate(source, file_format, pii_mode, progress)
+        return self.verify_state(state, dataset_name, source, file_format, measured, instrumentation is not None)
+
+    def accumulate(self, source, file_format, pii_mode="sampled", progress=None, state=None):
+        """Fold every chunk of source into state (a new DatasetAccumulator by default) and return it."""
+        if state is None:
+            state = DatasetAccumulator(self.verifier.pii_detection, pii_mode,
+                                       self.verifier.pii_detection.max_sample, self.approximate_duplicates)
+        for chunk in read_chunks(source, file_format, self.chunksize):
+            state.update(chunk)
+            if progress is not None:
+                progress("read", state.rows, None)
+        return state
+
+    def verify_state(self, state, dataset_name, source=None, file_format=None, instrumentation=None, detailed=None):
+        """Build the report from accumulated state (optionally re-reading source for exact counts).
+
+        Stages are timed into instrumentation (next to e.g. an earlier "read"
+        stage); its breakdown is added to the report when detailed, which
+        defaults to whether an instrumentation was passed.
+        """
+        measured = instrumentation or Instrumentation()
+        detailed = instrumentation is not None if detailed is None else detailed
+        measured.count("rows", state.rows)
+        measured.count("values", state.rows * len(state.columns))
+        with measured.stage("profile"):
+            profiles = state.profiles()
+        quality_check = self.verifier.quality_check
+        with measured.stage("quality"):
+            numeric_cols = quality_check.numeric_columns(profiles)
+            plan = self.anomaly_plan(profiles, numeric_cols, state.rows)
+            rereadable = source is not None and (isinstance(source, (str, os.PathLike)) or
+                                                 (hasattr(source, "seek") and getattr(source, "seekable", lambda: True)()))
+            if self.exact_counts and rereadable and any(not entry["skipped"] for entry in plan.values()):
+                self.count_outliers(plan, read_chunks(source, file_format, self.chunksize))
+            column_anomalies = self.finish_anomalies(plan, profiles, state.rows)
+            duplicates, duplicates_error = state.duplicates_with_error()
+            quality = quality_check.summarize(profiles, state.rows, state.rows * len(profiles),
+                                              column_anomalies, duplicates)
+            if state.approximate_duplicates:
+                quality["duplicatesError"] = duplicates_error
+        with measured.stage("pii"):
+            pii_scan = self.pii_scan(state, profiles)
+        with measured.stage("relevance"):
+            relevance = self.verifier.relevance_check.check_relevance(None, dataset_name, profiles)
+        with measured.stage("bias"):
+            bias, bias_score, diversity = self.verifier.bias_check.check_bias(None, profiles)
+        with measured.stage("signature"):
+            signatures = state.signature.signatures()
+        timings = {stage: measured.seconds(stage) for stage in measured.stages}
+        timings["total"] = sum(timings.values())
+        record_verification(measured, "streaming")
+        return self.verifier.build_report(dataset_name, state.fingerprint.hexdigest(), state.rows,
+                                          list(profiles), round(state.memory_bytes / 1024, 2),
+                                          quality, pii_scan, relevance, bias, bias_score, diversity,
+                                          timings, signatures, measured if detailed else None)
+
+    def anomaly_plan(self, profiles, numeric_cols, n_rows):
+        """Resolve skip rules and IQR/MAD bounds for every numeric column from the sketches."""
+        engine = self.verifier.quality_check.anomaly_engine
+        max_anomalies_per_col = int(n_rows * 0.01)
+        plan = {}
+        for col in numeric_cols:
+            profile = profiles[col]
+            entry = {"non_numeric": min(profile.invalid_count, max_anomalies_per_col), "skipped": False}
+            plan[col] = entry
+            if profile.count == 0:
+                entry["skipped"] = None
+                continue
+            if engine.should_skip(col, profile, profile.is_constant):
+                entry["skipped"] = True
+                continue
+            rules = engine.column_rules(col, profile)
+            digest = profile.accumulator.transformed_digest if rules["log_transform"] else profile.accumulator.digest
+            q1, q3 = digest.quantile([0.25, 0.75])
+            median = float(digest.quantile(0.5))
+            mad = digest_mad(digest, median)
+            if mad == 0:
+                mad = profile.std or 1
+            iqr = q3 - q1
+            entry.update({
+                "rules": rules,
+                "digest": digest,
+                "lower_bound": q1 - rules["iqr_multiplier"] * iqr,
+                "upper_bound": q3 + rules["iqr_multiplier"] * iqr,
+                "median": median,
+                "mad": mad,
+                "negative": 0 if rules["is_pca_like"] or rules["is_non_negative"] else profile.accumulator.negative_count,
+            })
+        return plan
+
+    def count_outliers(self, plan, chunks):
+        """Second pass: count values outside the sketched IQR bounds and MAD z-threshold."""
+        active = {col: entry for col, entry in plan.items() if entry["skipped"] is False}
+        for entry in active.values():
+            entry["range_count"] = entry["outlier_count"] = 0
+        for chunk in chunks:
+            for col, entry in active.items():
+                values = pd.to_numeric(chunk[col], errors="coerce").dropna().to_numpy(dtype="float64")
+                if entry["rules"]["log_transform"]:
+                    with np.errstate(invalid="ignore", divide="ignore"):
+                        values = np.log1p(values)
+                entry["range_count"] += int(((values < entry["lower_bound"]) | (values > entry["upper_bound"])).sum())
+                with np.errstate(invalid="ignore"):
+                    z_scores = 0.6745 * (values - entry["median"]) / entry["mad"]
+                entry["outlier_count"] += int((np.abs(z_scores) > entry["rules"]["z_threshold"]).sum())
+
+    def finish_anomalies(self, plan, profiles, n_rows):
+        """Turn the plan into the per-column counts QualityCheck.summarize expects."""
+        max_anomalies_per_col = int(n_rows * 0.01)
+        results = {}
+        for col, entry in plan.items():
+            counts = {"non_numeric": entry["non_numeric"], "negative": 0, "range": 0, "outlier": 0,
+                      "skipped": bool(entry["skipped"])}
+            results[col] = counts
+            if entry["skipped"] is not False:
+                continue
+            if "range_count" in entry:
+                range_count, outlier_count = entry["range_count"], entry["outlier_count"]
+            else:
+                # Estimate from the digest tails when the source cannot be read twice
+                digest, total = entry["digest"], entry["digest"].count
+                range_count = total * (digest.cdf(entry["lower_bound"]) + 1 - digest.cdf(entry["upper_bound"]))
+                deviation = entry["rules"]["z_threshold"] * entry["mad"] / 0.6745
+                outlier_count = total * (digest.cdf(entry["median"] - deviation) + 1 - digest.cdf(entry["median"] + deviation))
+            counts["negative"] = min(int(entry["negative"]), max_anomalies_per_col)
+            counts["range"] = min(int(round(range_count)), max_anomalies_per_col)
+            counts["outlier"] = min(int(round(outlier_count)), max_anomalies_per_col)
+        return results
+
+    def pii_scan(self, state, profiles):
+        """PII result from the per-column hit sets (exhaustive) or distinct-value samples (sampled)."""
+        pii_detection = self.verifier.pii_detection
+        skip_cols = pii_detection.skip_columns(None, profiles)
+        candidates = [col for col in profiles if col not in skip_cols]
+        if state.pii_mode != "sampled":
+            pii_values = set()
+            for col in candidates:
+                pii_values |= state.columns[col].pii_hits
+            return {"mode": "exhaustive", "pii_detected": bool(pii_values), "pii_count": len(pii_values),
+                    "pii_count_interval": [len(pii_values), len(pii_values)]}
+        rng = np.random.default_rng(pii_detection.random_state)
+        z = norm.ppf(1 - (1 - pii_detection.confidence) / 2)
+        columns = {}
+        for col in candidates:
+            sample = state.columns[col].pii_sample.values
+            if len(sample) == 0:
+                # Only int64 / float64 chunks (or nulls) were read, none of which can hold PII
+                continue
+            columns[col] = pii_detection._sample_column(sample, col, rng, z, profiles[col].unique_count)
+        estimate = sum(result["estimate"] for result in columns.values())
+        return {
+            "mode": "sampled",
+            "pii_detected": any(result["hits"] > 0 for result in columns.values()),
+            "pii_count": int(round(estimate)),
+            "pii_count_interval": [int(np.floor(sum(result["interval"][0] for result in columns.values()))),
+                                   int(np.ceil(sum(result["interval"][1] for result in columns.values())))],
+            "columns": columns,
+        }
@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+
+CITIES = ["Delhi", "Mumbai", "Pune", "Kolkata", "Chennai", "Jaipur", "Surat", "Lucknow", "Bhopal", "Patna"]
+DEGREES = ["B.Tech", "BSc", "BA", "BCA", "M.Tech", "MSc", "MBA", "B.Com", "MBBS", "PhD", "Class 12"]
+SLEEP = ["Less than 5 hours", "5-6 hours", "7-8 hours", "More than 8 hours", "Others"]
+DIETS = ["Healthy", "Moderate", "Unhealthy", "Others"]
+PRODUCTS = ["Laptop", "Phone", "Tablet", "Monitor", "Keyboard", "Mouse", "Headset", "Camera"]
+FIRST_NAMES = ["John", "Mary", "Alice", "Robert", "Linda", "Priya", "Wei", "Carlos", "Fatima", "Olga"]
+LAST_NAMES = ["Smith", "Jones", "Brown", "Garcia", "Khan", "Chen", "Patel", "Novak", "Silva", "Okafor"]
+
+def make_creditcard(rows, seed=0):
+    """Card transactions shaped like creditcard.csv: Time, PCA components V1..V28, Amount and a rare fraud Class."""
+    rng = np.random.default_rng(seed)
+    data = {"Time": np.sort(rng.uniform(0, 172_800, rows)).round()}
+    for i in range(1, 29):
+        # Heavy-tailed, centred components with shrinking variance, like a PCA projection
+        scale = 2.0 / (1 + i / 10)
+        data[f"V{i}"] = rng.standard_t(4, rows) * scale
+    data["Amount"] = rng.lognormal(3.0, 1.5, rows).round(2)
+    data["Class"] = (rng.random(rows) < 0.0017).astype(np.int64)
+    return pd.DataFrame(data)
+
+def make_student_depression(rows, seed=0):
+    """Mixed-type survey shaped like student_depression.csv: ids, categories, 1-5 scores, CGPA, a '?' in numerics."""
+    rng = np.random.default_rng(seed)
+    financial_stress = rng.integers(1, 6, rows).astype(str).astype(object)
+    financial_stress[rng.random(rows) < 0.0002] = "?"
+    return pd.DataFrame({
+        "id": np.arange(2, 2 + 3 * rows, 3),
+        "Gender": rng.choice(["Male", "Female"], rows, p=[0.56, 0.44]).astype(object),
+        "Age": rng.integers(18, 35, rows).astype(float),
+        "City": rng.choice(CITIES, rows).astype(object),
+        "Profession": np.where(rng.random(rows) < 0.999, "Student", "Architect").astype(object),
+        "Academic Pressure": rng.integers(0, 6, rows).astype(float),
+        "Work Pressure": np.where(rng.random(rows) < 0.0001, 5.0, 0.0),
+        "CGPA": rng.uniform(5.0, 10.0, rows).round(2),
+        "Study Satisfaction": rng.integers(0, 6, rows).astype(float),
+        "Job Satisfaction": np.where(rng.random(rows) < 0.0002, 4.0, 0.0),
+        "Sleep Duration": rng.choice(SLEEP, rows, p=[0.3, 0.22, 0.26, 0.21, 0.01]).astype(object),
+        "Dietary Habits": rng.choice(DIETS, rows, p=[0.27, 0.36, 0.369, 0.001]).astype(object),
+        "Degree": rng.choice(DEGREES, rows).astype(object),
+        "Have you ever had suicidal thoughts ?": rng.choice(["Yes", "No"], rows, p=[0.63, 0.37]).astype(object),
+        "Work/Study Hours": rng.integers(0, 13, rows).astype(float),
+        "Financial Stress": financial_stress,
+        "Family History of Mental Illness": rng.choice(["Yes", "No"], rows).astype(object),
+        "Depression": (rng.random(rows) < 0.585).astype(np.int64),
+    })
+
+def make_faulty_sales(rows, seed=0):
+    """Dirty sales export shaped like faulty_sales.csv: bad numerics, negatives, outliers, gaps, PII and duplicate rows."""
+    rng = np.random.default_rng(seed)
+    unique_rows = rows - rows // 20
+    price = rng.normal(250, 60, unique_rows).round(2).astype(object)
+    bad = rng.random(unique_rows)
+    price[bad < 0.005] = "abc"
+    price[(bad >= 0.005) & (bad < 0.01)] = -99.0
+    price[(bad >= 0.01) & (bad < 0.012)] = 1e6
+    quantity = rng.integers(1, 20, unique_rows).astype(float)
+    quantity[rng.random(unique_rows) < 0.03] = np.nan
+    first = rng.choice(FIRST_NAMES, unique_rows).astype(object)
+    last = rng.choice(LAST_NAMES, unique_rows).astype(object)
+    df = pd.DataFrame({
+        "CustomerID": rng.integers(1000, 1000 + max(unique_rows // 2, 1), unique_rows),
+        "Customer Name": first + " " + last,
+        "Email": np.char.add(np.char.add(np.char.lower(first.astype(str)), np.arange(unique_rows).astype(str)),
+                             "@example.com").astype(object),
+        "Product": rng.choice(PRODUCTS, unique_rows).astype(object),
+        "Price": price,
+        "Quantity": quantity,
+        "Sale Date": (np.datetime64("2023-01-01") + rng.integers(0, 730, unique_rows).astype("timedelta64[D]")).astype(str).astype(object),
+        "Region": rng.choice(["North", "South", "East", "West", None], unique_rows, p=[0.3, 0.3, 0.2, 0.18, 0.02]),
+    })
+    # Exact duplicate rows, as from a double export
+    duplicates = df.iloc[rng.integers(0, unique_rows, rows - unique_rows)]
+    return pd.concat([df, duplicates], ignore_index=True)
+
+# Generators of the reference dataset shapes, by the dataset names the verifier special-cases
+DATASETS = {
+    "creditcard": make_creditcard,
+    "student_depression": make_student_depression,
+    "faulty_sales": make_faulty_sales,
+}
+
+def make_dataset(name, rows, seed=0):
+    if name not in DATASETS:
+        raise ValueError(f"Unknown synthetic dataset: {name}")
+    return DATASETS[name](rows, seed)
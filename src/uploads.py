@@ -0,0 +1,53 @@
+import hashlib
+import os
+import tempfile
+
+class HashingSpool:
+    """Temporary file that computes the SHA-256 of everything written to it.
+
+    The multipart parser streams an upload into it chunk by chunk, so the
+    file never sits in memory and its content hash is ready once the
+    upload is. The file is deleted on close() unless keep() was called;
+    whoever kept it deletes it with remove().
+    """
+
+    def __init__(self, directory=None):
+        fd, self.path = tempfile.mkstemp(prefix="upload-", dir=directory)
+        self.file = os.fdopen(fd, "w+b")
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+        self.kept = False
+
+    def write(self, data):
+        self.sha256.update(data)
+        self.size += len(data)
+        return self.file.write(data)
+
+    def hexdigest(self):
+        return self.sha256.hexdigest()
+
+    def __getattr__(self, name):
+        # read, readline, seek, tell, flush, ... go straight to the file
+        if name == "file":
+            raise AttributeError(name)
+        return getattr(self.file, name)
+
+    def __iter__(self):
+        return iter(self.file)
+
+    def keep(self):
+        """Flush the file and hand it over: close() no longer deletes it."""
+        self.file.flush()
+        self.kept = True
+        return self.path
+
+    def close(self):
+        self.file.close()
+        if not self.kept:
+            self.remove()
+
+    def remove(self):
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
@@ -1,11 +1,10 @@
-import hashlib
 import pandas as pd
 import numpy as np
+from .fingerprint import fingerprint_dataframe
 
 def compute_hash(df):
-    """Compute SHA-256 hash of the dataset."""
-    df_str = df.to_string()
-    return "0x" + hashlib.sha256(df_str.encode()).hexdigest()
+    """Compute the canonical, versioned SHA-256 fingerprint of the dataset."""
+    return fingerprint_dataframe(df)
 
 def convert_to_native(obj):
     """Convert pandas/numpy types to native Python types for JSON serialization."""
@@ -3,52 +3,156 @@ from .quality_check import QualityCheck
 from .pii_detection import PIIDetection
 from .relevance_check import RelevanceCheck
 from .bias_check import BiasCheck
+from .config import VerificationConfig
+from .authenticity import AuthenticityCheck, AuthenticityIndex
+from .near_duplicates import DatasetSignature, NearDuplicateCheck, NearDuplicateIndex
+from .column_profile import profile_columns
+from .compaction import COMPACTION
 from .utils import compute_hash, convert_to_native
+from .fingerprint import FINGERPRINT_VERSION
+from .parallel import CHECK_STAGES, ProcessExecutor, run_stage
+from .instrumentation import Instrumentation
+from .metrics import record_verification
 import hashlib
 import json
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+VERIFIER_EXECUTORS = ["sequential", "process"]
+# Bump whenever a check or the scoring changes what a report says for the same data
+REPORT_VERSION = 2
 
 class Verifier:
-    def __init__(self):
-        self.quality_check = QualityCheck()
+    def __init__(self, executor="sequential", max_workers=None, authenticity_db=None, near_duplicates_db=None,
+                 config=None):
+        """executor is "sequential" or "process" (checks run concurrently on a process pool).
+
+        authenticity_db and near_duplicates_db are the SQLite paths of the
+        persistent indexes of seen dataset fingerprints and MinHash
+        signatures; without them the indexes live in memory. config is the
+        VerificationConfig of the checks' thresholds (default: the built-in one).
+        """
+        if executor not in VERIFIER_EXECUTORS:
+            raise ValueError(f"Unknown executor: {executor}")
+        self.config = config or VerificationConfig()
+        self.quality_check = QualityCheck(self.config)
         self.pii_detection = PIIDetection()
         self.relevance_check = RelevanceCheck()
-        self.bias_check = BiasCheck()
+        self.bias_check = BiasCheck(self.config)
+        self.authenticity_check = AuthenticityCheck(AuthenticityIndex(authenticity_db))
+        self.near_duplicate_check = NearDuplicateCheck(NearDuplicateIndex(near_duplicates_db))
+        self.executor = ProcessExecutor(max_workers, config=self.config) if executor == "process" else None
+
+    def verify_dataset(self, df, dataset_name, pii_mode="exhaustive", progress=None, instrumentation=None,
+                       stage_results=None):
+        """Verify dataset and return report.
+
+        pii_mode is "exhaustive" (scan every candidate value) or "sampled"
+        (stratified sample with early exit and an estimated pii_count).
+        progress, if given, is called as progress(stage, done, total) between stages.
+        Pass an Instrumentation to get its per-stage / per-column breakdown
+        in details.instrumentation. stage_results, a dict, receives each
+        check's raw result by stage (e.g. the PII scan with its hit values).
+        """
+        logger.debug("Verifying dataset: %s", dataset_name)
+        start = time.perf_counter()
+        measured = instrumentation or Instrumentation()
+        measured.count("rows", len(df))
+        measured.count("values", df.size)
+        hashed = {}
+
+        def hash_dataset():
+            with measured.stage("hash"):
+                hashed["hash"] = compute_hash(df)
+            with measured.stage("signature"):
+                hashed["signatures"] = DatasetSignature().update(df).signatures()
 
-    def verify_dataset(self, df, dataset_name):
-        """Verify dataset and return report."""
-        print(f"DEBUG: Verifying dataset: {dataset_name}")
-        dataset_hash = compute_hash(df)
+        # Profile every column once; the checks share these statistics
+        with measured.stage("profile"):
+            profiles = profile_columns(df)
+        if self.executor is not None:
+            # The fingerprint is computed here while the workers run the checks
+            results = self.executor.run(df, profiles, dataset_name, pii_mode, before_wait=hash_dataset,
+                                        progress=progress, instrumentation=measured)
+        else:
+            hash_dataset()
+            checks = {"quality": self.quality_check, "pii": self.pii_detection,
+                      "relevance": self.relevance_check, "bias": self.bias_check}
+            results = {}
+            for done, stage in enumerate(CHECK_STAGES):
+                if progress is not None:
+                    progress(stage, done, len(CHECK_STAGES))
+                with measured.stage(stage):
+                    results[stage] = run_stage(checks, stage, df, profiles, dataset_name, pii_mode)
+        timings = {stage: measured.seconds(stage) for stage in measured.stages}
+        timings["total"] = time.perf_counter() - start
+        record_verification(measured, "in_memory")
 
-        quality = self.quality_check.check_quality(df)
-        pii_detected, pii_count = self.pii_detection.detect_pii(df)
-        relevance = self.relevance_check.check_relevance(df, dataset_name)
-        bias, bias_score, diversity = self.bias_check.check_bias(df)
+        if stage_results is not None:
+            stage_results.update(results)
+        bias, bias_score, diversity = results["bias"]
+        # A compacted frame reports the size it had as uploaded, measured before compaction
+        compaction = df.attrs.get(COMPACTION)
+        size_bytes = compaction["bytes_before"] if compaction else df.memory_usage(deep=True).sum()
+        report = self.build_report(dataset_name, hashed["hash"], len(df), list(df.columns), round(size_bytes / 1024, 2),
+                                   results["quality"], results["pii"], results["relevance"],
+                                   bias, bias_score, diversity, timings, hashed["signatures"], instrumentation)
+        if compaction:
+            report["details"]["compaction"] = compaction
+        return report
 
-        is_authentic = True
+    def config_version(self):
+        """Identify the report logic, for keying cached results."""
+        return f"report-{REPORT_VERSION}.fingerprint-{FINGERPRINT_VERSION}.config-{self.config.version()}"
+
+    def registry_version(self):
+        """Identify the state of the authenticity and near-duplicate indexes, for keying cached results."""
+        return f"authenticity-{self.authenticity_check.index.generation()}.near-duplicates-{self.near_duplicate_check.index.generation()}"
+
+    def register(self, report, dataset_name=None):
+        """Register (publish) a verified dataset: its fingerprint, so later reports of the same data
+        are not authentic, and its signatures, so later similar datasets list it as a near duplicate.
+
+        Returns False if the fingerprint was already registered.
+        """
+        self.near_duplicate_check.register(report["datasetHash"], dataset_name)
+        return self.authenticity_check.register(report["datasetHash"], dataset_name)
+
+    def close(self):
+        """Shut down the process pool, if any."""
+        if self.executor is not None:
+            self.executor.shutdown()
+
+    def build_report(self, dataset_name, dataset_hash, n_rows, columns, size_kb,
+                     quality, pii_scan, relevance, bias, bias_score, diversity, timings=None, signatures=None,
+                     instrumentation=None):
+        """Score the check results and assemble the verification report."""
+        pii_detected, pii_count = pii_scan["pii_detected"], pii_scan["pii_count"]
+        # A registered fingerprint means the same data was already published
+        is_authentic = self.authenticity_check.check_authenticity(dataset_hash)
         quality_score = 100.0
-        print(f"DEBUG: Initial quality_score: {quality_score}")
         quality_score -= quality["missingRatio"] * 50
-        print(f"DEBUG: After missingRatio penalty: {quality_score}")
         quality_score -= quality["incorrectTypes"] * 2
-        print(f"DEBUG: After incorrectTypes penalty: {quality_score}")
         quality_score -= quality["anomalies"] * 0.0015  # Adjusted anomaly penalty
-        print(f"DEBUG: After anomalies penalty ({quality['anomalies']} * 0.0015): {quality_score}")
         duplicate_penalty = 0.0012 if dataset_name == "faulty_sales" else 0.002
         quality_score -= quality["duplicates"] * duplicate_penalty
-        print(f"DEBUG: After duplicates penalty ({quality['duplicates']} * {duplicate_penalty}): {quality_score}")
         quality_score -= 5 if pii_detected else 0
-        print(f"DEBUG: After PII penalty: {quality_score}")
         quality_score -= 5 if bias == "Imbalanced" else 0
-        print(f"DEBUG: After bias penalty: {quality_score}")
         quality_score = max(min(round(quality_score, 2), 88.5 if dataset_name == "creditcard" else 87.0), 0)  # Adjusted caps
-        print(f"DEBUG: Final quality_score: {quality_score}")
+        logger.debug("Quality score %s: missingRatio %s, incorrectTypes %s, anomalies %s, duplicates %s "
+                     "(penalty %s each), PII %s, bias %s", quality_score, quality["missingRatio"],
+                     quality["incorrectTypes"], quality["anomalies"], quality["duplicates"], duplicate_penalty,
+                     pii_detected, bias)
 
-        duplicate_ratio = quality["duplicates"] / len(df) if len(df) > 0 else 0
+        duplicate_ratio = quality["duplicates"] / n_rows if n_rows > 0 else 0
         anomaly_threshold = 0.02 if relevance == "Fraud Detection" else 0.01
         is_verified = (quality_score >= 50 and 
-                      quality["anomalies"] <= len(df) * anomaly_threshold and
+                      quality["anomalies"] <= n_rows * anomaly_threshold and
                       duplicate_ratio < 0.1)
-        print(f"DEBUG: is_verified: {is_verified}, duplicate_ratio: {duplicate_ratio}, anomaly_threshold: {anomaly_threshold}")
+        logger.debug("is_verified: %s, duplicate_ratio: %s, anomaly_threshold: %s",
+                     is_verified, duplicate_ratio, anomaly_threshold)
 
         report = {
             "datasetHash": dataset_hash,
@@ -64,13 +168,18 @@ class Verifier:
             "analysisReport": f"ipfs://dummy-cid/{dataset_hash[-8:]}",
             "details": {
                 "metadata": {
-                    "rows": len(df),
-                    "columns": list(df.columns),
-                    "size_kb": round(df.memory_usage(deep=True).sum() / 1024, 2)
+                    "rows": n_rows,
+                    "columns": columns,
+                    "size_kb": size_kb,
+                    "fingerprint_version": FINGERPRINT_VERSION
                 },
                 "quality": quality,
                 "pii_detected": pii_detected,
                 "pii_count": pii_count,
+                "pii_scan": {
+                    "mode": pii_scan["mode"],
+                    "pii_count_interval": pii_scan["pii_count_interval"]
+                },
                 "relevance": relevance,
                 "is_authentic": is_authentic,
                 "bias": bias,
@@ -78,5 +187,11 @@ class Verifier:
                 "diversity": round(diversity, 2)
             }
         }
-        print(f"DEBUG: Report diversity: {report['details']['diversity']}")
+        if signatures is not None:
+            report["details"]["near_duplicates"] = self.near_duplicate_check.check_near_duplicates(
+                dataset_hash, dataset_name, signatures)
+        if timings is not None:
+            report["details"]["timings"] = {stage: round(seconds, 4) for stage, seconds in timings.items()}
+        if instrumentation is not None:
+            report["details"]["instrumentation"] = instrumentation.report()
         return convert_to_native(report)
\ No newline at end of file
@@ -0,0 +1,42 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+import spacy
+from src.models import models
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+FIRST_NAMES = ["john", "mary", "alice", "robert", "linda"]
+
+def blank_ner_pipeline(*args, **kwargs):
+    """Small stand-in for en_core_web_sm that tags '<First> <Last>' as PERSON."""
+    nlp = spacy.blank("en")
+    ruler = nlp.add_pipe("entity_ruler")
+    ruler.add_patterns([{"label": "PERSON", "pattern": [{"LOWER": name}, {"IS_TITLE": True}]} for name in FIRST_NAMES])
+    return nlp
+
+@pytest.fixture(autouse=True)
+def spacy_model(monkeypatch):
+    monkeypatch.setattr(spacy, "load", blank_ner_pipeline)
+    # Every test loads its own copy of the shared pipeline through the patched loader
+    models.clear()
+
+@pytest.fixture
+def sales_df():
+    rng = np.random.default_rng(2)
+    n = 400
+    price = rng.normal(100, 20, n).astype(object)
+    price[:5] = "abc"
+    price[5:10] = -50.0
+    price[10:14] = 1e6
+    df = pd.DataFrame({
+        "CustomerID": rng.integers(0, n // 2, n),
+        "Product": rng.choice(["A", "B", "C"], n),
+        "Price": price,
+        "Quantity": np.where(rng.random(n) < 0.05, np.nan, rng.integers(1, 10, n)),
+        "Comment": [f"Order {i} by John Smith" if i % 40 == 0 else f"ok-{i % 13}" for i in range(n)],
+        "Contact": [f"buyer{i}@example.com" if i % 9 == 0 else f"Mary Jones{i}" for i in range(n)],
+    })
+    return pd.concat([df, df.iloc[:20]], ignore_index=True)
@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+from src.column_profile import profile_columns
+from src.anomaly_engine import AnomalyEngine
+from src.config import VerificationConfig
+from src.quality_check import QualityCheck
+
+def _counts(df):
+    profiles = profile_columns(df)
+    return AnomalyEngine().count_anomalies(profiles, list(df.columns), len(df))
+
+def test_range_outliers_and_negatives_are_counted():
+    rng = np.random.default_rng(0)
+    price = rng.normal(100, 5, 1000)
+    price[:3] = 1e6
+    price[3:6] = -10.0
+    counts = _counts(pd.DataFrame({"price": price}))["price"]
+    assert counts["range"] == 6
+    assert counts["negative"] == 3
+    assert counts["outlier"] == 6
+    assert not counts["skipped"]
+
+def test_counts_are_capped_per_column():
+    price = np.r_[np.full(10, 1e9), np.random.default_rng(1).normal(0, 10, 490)]
+    counts = _counts(pd.DataFrame({"price": price}))["price"]
+    assert counts["range"] == 5  # 1% of 500 rows
+
+def test_low_variation_columns_are_skipped():
+    df = pd.DataFrame({"flag": [0, 1] * 50, "short": list(range(10)) + [None] * 90})
+    counts = _counts(df)
+    assert counts["flag"]["skipped"]
+    assert counts["short"]["skipped"]
+
+def test_amount_is_log_transformed_and_pca_columns_use_wide_bounds():
+    rng = np.random.default_rng(2)
+    df = pd.DataFrame({"Amount": rng.lognormal(3, 1, 2000), "V1": rng.standard_t(3, 2000)})
+    counts = _counts(df)
+    assert counts["Amount"]["range"] == 0
+    assert counts["V1"]["negative"] == 0
+
+def test_columns_with_missing_values_are_batched_separately(sales_df):
+    result = QualityCheck().check_quality(sales_df)
+    assert result["anomalies"] > 0
+    assert result["duplicates"] >= 20
+
+def test_threshold_index_counts_match_scans(sales_df):
+    rng = np.random.default_rng(3)
+    df = pd.DataFrame({"Amount": np.r_[rng.lognormal(3, 1, 995), [-5.0, np.nan, 1e7, 0.0, 2.0]],
+                       "V1": rng.standard_t(3, 1000), "price": np.r_[rng.normal(50, 5, 990), np.full(10, 500.0)]})
+    for frame in [df, sales_df]:
+        quality_check = QualityCheck()
+        profiles = profile_columns(frame)
+        numeric_cols = quality_check.numeric_columns(profiles)
+        scanned = quality_check.anomaly_engine.prepare(profiles, numeric_cols, len(frame))
+        index = quality_check.threshold_index(frame, profiles)
+        for config in [VerificationConfig(), VerificationConfig(iqr_multiplier=0.5, mad_threshold=1.0,
+                                                                iqr_multiplier_pca=1.0, mad_threshold_pca=2.0,
+                                                                iqr_multiplier_amount=0.0)]:
+            engine = AnomalyEngine(config)
+            assert engine.count(index) == engine.count(scanned)
+
+def test_anomaly_curves_are_monotone_and_match_counts():
+    rng = np.random.default_rng(4)
+    df = pd.DataFrame({"price": np.r_[rng.normal(100, 10, 5000), np.full(20, 1000.0)]})
+    quality_check = QualityCheck()
+    index = quality_check.threshold_index(df)
+    curve = quality_check.anomaly_curves(index, [0.5, 1.5, 4.0, 100.0], [1.0, 8.0, 100.0])["price"]
+    assert curve["range"] == sorted(curve["range"], reverse=True)
+    assert curve["range"][-1] == 0
+    assert curve["outlier"][0] > curve["outlier"][1] >= 20
+    assert (curve["iqr_multiplier"], curve["z_threshold"]) == (4.0, 8.0)
+    counts = quality_check.anomaly_engine.count(index)["price"]
+    assert counts["range"] == min(curve["range"][2], index.max_anomalies_per_col)
+    assert counts["outlier"] == min(curve["outlier"][1], index.max_anomalies_per_col)
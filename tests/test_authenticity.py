@@ -0,0 +1,55 @@
+import multiprocessing
+import hashlib
+from src.authenticity import AuthenticityCheck, AuthenticityIndex, BloomFilter, fingerprint_digest
+from src.verifier import Verifier
+
+def _hash(i):
+    return "0x" + hashlib.sha256(str(i).encode()).hexdigest()
+
+def test_bloom_filter_has_no_false_negatives_and_few_false_positives():
+    bloom = BloomFilter(capacity=10_000, error_rate=0.01)
+    bloom.add_many([fingerprint_digest(_hash(i)) for i in range(10_000)])
+    assert all(fingerprint_digest(_hash(i)) in bloom for i in range(10_000))
+    false_positives = sum(fingerprint_digest(_hash(i)) in bloom for i in range(10_000, 30_000))
+    assert false_positives / 20_000 < 0.02
+
+def test_index_persists_and_rebuilds_bloom(tmp_path):
+    path = str(tmp_path / "fingerprints.db")
+    check = AuthenticityCheck(AuthenticityIndex(path, capacity=1000))
+    assert check.check_authenticity(_hash(1)) and check.check_authenticity(_hash(1))
+    assert check.register(_hash(1), "first")
+    assert not check.register(_hash(1), "again")
+    assert not check.check_authenticity(_hash(1))
+    assert AuthenticityIndex(path, capacity=1000).contains(_hash(1))
+    # A different capacity recreates the filter file from the table
+    reopened = AuthenticityIndex(path, capacity=5000)
+    assert reopened.contains(_hash(1)) and not reopened.contains(_hash(2))
+    assert reopened.add_many([_hash(i) for i in range(5)]) == 4 and len(reopened) == 5
+
+def _register(path, start):
+    index = AuthenticityIndex(path, capacity=1000)
+    return sum(index.add(_hash(i)) for i in range(start, start + 200))
+
+def test_concurrent_processes_register_each_fingerprint_once(tmp_path):
+    path = str(tmp_path / "shared.db")
+    AuthenticityIndex(path, capacity=1000)
+    with multiprocessing.get_context("fork").Pool(4) as pool:
+        added = pool.starmap(_register, [(path, 0), (path, 100), (path, 200), (path, 300)])
+    index = AuthenticityIndex(path, capacity=1000)
+    assert sum(added) == len(index) == 500
+    assert all(index.contains(_hash(i)) for i in range(500))
+
+def test_verifier_reports_registered_datasets(sales_df):
+    verifier = Verifier()
+    report = verifier.verify_dataset(sales_df, "sales")
+    assert report["details"]["is_authentic"]
+    # Verifying alone registers nothing, so a retry is still authentic
+    assert verifier.verify_dataset(sales_df, "sales")["details"]["is_authentic"]
+    assert verifier.register(report, "sales")
+    assert not verifier.verify_dataset(sales_df, "sales copy")["details"]["is_authentic"]
+
+def test_in_memory_index_allocates_its_filter_on_first_registration():
+    index = AuthenticityIndex()
+    assert not index.contains(_hash(1)) and index._bloom is None
+    index.add(_hash(1))
+    assert index._bloom is not None and index.contains(_hash(1))
@@ -0,0 +1,45 @@
+import json
+import pytest
+from src.auto_tune_verification import AutoTuneVerifier, PreparedDataset
+from src.config import VerificationConfig
+from src.synthetic import make_dataset
+from src.verifier import Verifier
+
+TUNED = VerificationConfig(iqr_multiplier_pca=6.0, mad_threshold_pca=12.0, iqr_multiplier=2.5,
+                           expected_unique_categorical=3, expected_unique_numeric=500)
+
+def _comparable(report):
+    details = report["details"]
+    return (report["qualityScore"], report["isVerified"], details["quality"], details["bias_score"],
+            details["diversity"], details["relevance"])
+
+@pytest.mark.parametrize("name", ["creditcard", "faulty_sales"])
+def test_prepared_dataset_matches_a_full_verification(name):
+    df = make_dataset(name, 3000)
+    prepared = PreparedDataset(name, df, Verifier())
+    for config in [VerificationConfig(), TUNED]:
+        expected = Verifier(config=config).verify_dataset(df, name)
+        assert _comparable(prepared.report(Verifier(), config)) == _comparable(expected)
+
+def test_thresholds_change_the_report():
+    df = make_dataset("creditcard", 3000)
+    default = Verifier().verify_dataset(df, "creditcard")
+    tuned = Verifier(config=TUNED).verify_dataset(df, "creditcard")
+    assert tuned["details"]["quality"]["anomalies"] > default["details"]["quality"]["anomalies"]
+    assert Verifier(config=TUNED).config_version() != Verifier().config_version()
+
+def test_config_rejects_unknown_settings():
+    with pytest.raises(ValueError):
+        VerificationConfig(iqr_multiplier_typo=3.0)
+    assert TUNED.replace(iqr_multiplier=4.0).iqr_multiplier_pca == 6.0
+
+def test_tuner_saves_a_loadable_config(tmp_path):
+    datasets = {name: make_dataset(name, 2000) for name in ["creditcard", "student_depression", "faulty_sales"]}
+    tuner = AutoTuneVerifier(datasets, max_iterations=12, target_score=15, workers=1, batch_size=4)
+    tuner.tune(str(tmp_path))
+    assert tuner.iteration == 12
+    # The starting config is evaluated first, so tuning never does worse than it
+    assert tuner.best_score >= tuner.trials[0][0]
+    assert VerificationConfig.load(str(tmp_path / "best_config.json")) == tuner.best_config
+    report = json.loads((tmp_path / "creditcard_report.json").read_text())
+    assert tuner.evaluate_report(report, "creditcard") <= 5
@@ -0,0 +1,63 @@
+import json
+import os
+from src.batch import BatchRunner, Checkpoint, find_datasets
+
+def read_lines(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+def test_find_datasets_from_globs_and_manifest(tmp_path, sales_df):
+    sales_df.to_csv(tmp_path / "a.csv", index=False)
+    sales_df.to_csv(tmp_path / "b.csv", index=False)
+    (tmp_path / "notes.txt").write_text("not a dataset")
+    manifest = tmp_path / "manifest.txt"
+    manifest.write_text('a.csv\n# comment\n\n{"path": "b.csv", "name": "sales"}\n')
+
+    found = find_datasets([str(tmp_path / "*")])
+    assert [os.path.basename(path) for path, _ in found] == ["a.csv", "b.csv"]
+    assert [name for _, name in found] == ["a", "b"]
+    from_manifest = find_datasets(manifest=str(manifest))
+    assert [name for _, name in from_manifest] == ["a", "sales"]
+    # The same file from a glob and the manifest is verified once
+    assert len(find_datasets([str(tmp_path / "a.csv")], str(manifest))) == 2
+
+def test_batch_run_writes_records_and_skips_unchanged_files(tmp_path, sales_df):
+    sales_df.to_csv(tmp_path / "sales.csv", index=False)
+    sales_df.head(100).to_csv(tmp_path / "small.csv", index=False)
+    (tmp_path / "broken.json").write_text("{not json")
+    output = str(tmp_path / "reports.jsonl")
+    datasets = find_datasets([str(tmp_path / "*")])
+
+    summary = BatchRunner(output, workers=1).run(datasets)
+    assert (summary["verified"], summary["unchanged"], summary["failed"]) == (2, 0, 1)
+    assert summary["rows"] == len(sales_df) + 100
+    records = {os.path.basename(record["path"]): record for record in read_lines(output)}
+    assert records["sales.csv"]["status"] == "ok"
+    assert records["sales.csv"]["report"]["details"]["metadata"]["rows"] == len(sales_df)
+    assert records["broken.json"]["status"] == "error"
+
+    # Nothing changed: only the failed file is tried again
+    summary = BatchRunner(output, workers=1).run(datasets)
+    assert (summary["verified"], summary["unchanged"], summary["failed"]) == (0, 2, 1)
+
+    # Touched but identical content is not re-verified; changed content is
+    os.utime(tmp_path / "small.csv", ns=(1, 1))
+    sales_df.head(50).to_csv(tmp_path / "sales.csv", index=False)
+    summary = BatchRunner(output, workers=1).run(datasets)
+    assert (summary["verified"], summary["unchanged"]) == (1, 1)
+    assert [record["rows"] for record in read_lines(output) if record["path"].endswith("sales.csv")][-1] == 50
+
+    summary = BatchRunner(output, workers=1, force=True).run(datasets)
+    assert summary["verified"] == 2
+    assert Checkpoint(output + ".checkpoint").stat_matches(str(tmp_path / "small.csv"))
+
+def test_checkpoint_ignores_a_truncated_last_line(tmp_path, sales_df):
+    sales_df.to_csv(tmp_path / "sales.csv", index=False)
+    checkpoint = Checkpoint(str(tmp_path / "checkpoint"))
+    checkpoint.add(str(tmp_path / "sales.csv"), "abc")
+    checkpoint.file.write('{"path": "/x", "sha')
+    checkpoint.close()
+    reloaded = Checkpoint(str(tmp_path / "checkpoint"))
+    assert reloaded.previous_hash(str(tmp_path / "sales.csv")) == "abc"
+    assert reloaded.stat_matches(str(tmp_path / "sales.csv"))
+    reloaded.close()
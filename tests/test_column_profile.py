@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+from scipy.stats import skew
+from src.column_profile import ColumnProfile, fill_skews, profile_columns
+
+def test_profile_numeric_column_with_bad_strings():
+    series = pd.Series([1, "2", "abc", None, 4.5] + list(range(10)), dtype=object)
+    profile = ColumnProfile("price", series)
+    assert profile.null_count == 1
+    assert profile.invalid_count == 1
+    assert profile.invalid_samples == ["abc"]
+    assert profile.count == 13
+    assert profile.numeric_ratio == 13 / 14
+    assert profile.kind == "numeric"
+
+def test_profile_matches_pandas_statistics():
+    values = pd.Series(np.random.default_rng(0).normal(5, 2, 500))
+    profile = ColumnProfile("v", values)
+    assert profile.kind == "numeric"
+    assert profile.mean == values.mean()
+    assert profile.std == values.std()
+    assert (profile.q1, profile.q3) == tuple(values.quantile([0.25, 0.75]))
+    assert profile.median == values.median()
+    assert profile.mad == np.median(np.abs(values - values.median()))
+
+def test_profile_columns_kinds(sales_df):
+    profiles = profile_columns(sales_df)
+    assert list(profiles) == list(sales_df.columns)
+    assert profiles["Price"].kind == "numeric"
+    assert profiles["Product"].kind == "categorical"
+    assert profiles["Contact"].kind == "string"
+    assert profiles["Quantity"].null_count == sales_df["Quantity"].isnull().sum()
+
+def test_all_null_column_does_not_divide_by_zero():
+    profile = ColumnProfile("empty", pd.Series([None, None], dtype=object))
+    assert profile.unique_ratio == 0.0
+    assert profile.count == 0
+    assert profile.kind == "categorical"
+
+def test_checks_accept_shared_profiles(sales_df):
+    from src.quality_check import QualityCheck
+    from src.bias_check import BiasCheck
+    from src.pii_detection import PIIDetection
+    profiles = profile_columns(sales_df)
+    assert QualityCheck().check_quality(sales_df, profiles) == QualityCheck().check_quality(sales_df)
+    assert BiasCheck().check_bias(sales_df, profiles) == BiasCheck().check_bias(sales_df)
+    assert PIIDetection().detect_pii(sales_df, profiles) == PIIDetection().detect_pii(sales_df)
+
+def test_missing_ratio_rounds_like_the_unprofiled_check():
+    from src.quality_check import QualityCheck
+    # 1 missing value in 40 cells: a ratio of 0.025, which numpy rounds to 0.02 and Python to 0.03
+    df = pd.DataFrame({col: np.arange(10.0) for col in "abcd"})
+    df.loc[3, "b"] = np.nan
+    quality = QualityCheck().check_quality(df)
+    assert quality["missingRatio"] == round(df.isnull().sum().sum() / df.size, 2) == 0.02
+
+def test_batched_skews_and_top_frequencies_match_per_column_values():
+    rng = np.random.default_rng(4)
+    n = 3000
+    df = pd.DataFrame({
+        "t": rng.standard_t(3, n) * 1e4,
+        "t2": rng.standard_t(5, n),
+        "gaps": np.where(rng.random(n) < 0.1, np.nan, rng.normal(1e6, 1, n)),
+        "ints": rng.integers(-5, 500, n),
+        "flags": rng.random(n) < 0.2,
+        "constant": np.full(n, 3.3),
+        "city": rng.choice(["Pune", "Delhi", None], n).astype(object),
+    })
+    profiles = profile_columns(df)
+    fill_skews(list(profiles.values()), block_bytes=n * 8 * 2)
+    for col, profile in profiles.items():
+        if profile.count:
+            expected = skew(profile.numeric, nan_policy="omit")
+            assert profile.skew == expected or (np.isnan(profile.skew) and np.isnan(expected))
+        assert profile.top_frequency == df[col].value_counts().max()
+    assert ColumnProfile("city", df["city"].astype("category")).top_frequency == df["city"].value_counts().max()
@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+from src.compaction import COMPACTION, compact_frame
+from src.ingest import load_frame
+from src.synthetic import make_dataset
+from src.verifier import Verifier
+
+def _comparable(report):
+    details = report["details"]
+    for key in ("timings", "near_duplicates", "is_authentic", "compaction"):
+        details.pop(key, None)
+    return report
+
+def test_compaction_is_lossless_and_smaller():
+    df = pd.DataFrame({
+        "flag": np.array([0, 1] * 50, dtype=np.int64),
+        "big": np.arange(100, dtype=np.int64) * 2**40,
+        "half": np.arange(100) / 2,
+        "tenth": np.arange(100) / 10,
+        "city": ["Pune", "Delhi", np.nan, "Surat"] * 25,
+        "note": [f"note {i}" for i in range(100)],
+        "mixed_nulls": ["a", None, np.nan, "b"] * 25,
+    })
+    compacted = compact_frame(df)
+    assert compacted["flag"].dtype == np.int8 and compacted["big"].dtype == np.int64
+    assert compacted["half"].dtype == np.float32 and compacted["tenth"].dtype == np.float64
+    assert compacted["city"].dtype == "category" and isinstance(compacted["note"].dtype, pd.StringDtype)
+    assert compacted["mixed_nulls"].dtype == object
+    report = compacted.attrs[COMPACTION]
+    assert report["bytes_after"] < report["bytes_before"] == df.memory_usage(deep=True).sum()
+    assert set(report["columns"]) == {"flag", "half", "city", "note"}
+    pd.testing.assert_frame_equal(compacted.astype(df.dtypes.to_dict()), df)
+
+def test_checks_give_identical_reports_on_compacted_frames(sales_df):
+    verifier = Verifier()
+    for name, df in [("faulty_sales", sales_df), ("student_depression", make_dataset("student_depression", 3000)),
+                     ("creditcard", make_dataset("creditcard", 3000))]:
+        full = verifier.verify_dataset(df, name)
+        compacted = verifier.verify_dataset(compact_frame(df), name)
+        assert compacted["details"]["compaction"]["bytes_before"] == df.memory_usage(deep=True).sum()
+        assert _comparable(compacted) == _comparable(full)
+
+def test_load_frame_compacts_on_request(tmp_path):
+    make_dataset("faulty_sales", 500).to_csv(tmp_path / "sales.csv", index=False)
+    df = load_frame(str(tmp_path / "sales.csv"), compact=True)
+    assert df["Product"].dtype == "category"
+    assert df.attrs[COMPACTION]["bytes_after"] < df.attrs[COMPACTION]["bytes_before"]
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+from src.fingerprint import DatasetFingerprint, fingerprint_dataframe, BLOCK_ROWS
+from src.utils import compute_hash
+from src.data_loader import DataLoader
+
+def _frame(rows=1000):
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "amount": rng.normal(size=rows),
+        "count": rng.integers(0, 10, rows),
+        "name": [f"row {i}" if i % 5 else None for i in range(rows)],
+        "when": pd.date_range("2024-01-01", periods=rows, freq="min"),
+        "flag": rng.random(rows) < 0.5,
+    })
+
+def test_fingerprint_is_deterministic_and_prefixed():
+    df = _frame()
+    digest = compute_hash(df)
+    assert digest.startswith("0x") and len(digest) == 66
+    assert digest == compute_hash(df.copy())
+
+def test_fingerprint_is_independent_of_chunking():
+    df = _frame(BLOCK_ROWS + 1234)
+    fingerprint = DatasetFingerprint()
+    for start in range(0, len(df), 10000):
+        fingerprint.update(df.iloc[start:start + 10000])
+    assert fingerprint.hexdigest() == fingerprint_dataframe(df)
+
+def test_fingerprint_ignores_numeric_width_but_not_values():
+    df = _frame()
+    narrowed = df.assign(count=df["count"].astype("int8"), amount=df["amount"].astype("float64"))
+    assert fingerprint_dataframe(narrowed) == fingerprint_dataframe(df)
+    changed = df.copy()
+    changed.loc[10, "amount"] += 1e-9
+    assert fingerprint_dataframe(changed) != fingerprint_dataframe(df)
+    assert fingerprint_dataframe(df.rename(columns={"name": "label"})) != fingerprint_dataframe(df)
+
+def test_loader_and_verifier_hash_agree(tmp_path):
+    df = _frame(50).drop(columns=["when"])
+    path = tmp_path / "data.csv"
+    df.to_csv(path, index=False)
+    loaded, dataset_hash, _ = DataLoader().load_dataset(str(path))
+    assert dataset_hash == compute_hash(loaded)
+
+def test_fingerprint_keeps_large_ints_and_value_types_apart():
+    assert fingerprint_dataframe(pd.DataFrame({"id": [2**53, 7]})) != fingerprint_dataframe(pd.DataFrame({"id": [2**53 + 1, 7]}))
+    mixed = pd.DataFrame({"code": pd.Series([1, "a"], dtype=object)})
+    text = pd.DataFrame({"code": pd.Series(["1", "a"], dtype=object)})
+    assert fingerprint_dataframe(mixed) != fingerprint_dataframe(text)
+    # An int column promoted to float by a missing value hashes like its nullable-int form
+    promoted = pd.DataFrame({"n": [1, None, 3]})
+    assert fingerprint_dataframe(promoted) == fingerprint_dataframe(promoted.astype("Int64"))
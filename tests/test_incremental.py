@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.incremental import IncrementalVerifier, VerificationStateStore
+from src.streaming import StreamingVerifier
+
+def make_orders(rows, seed):
+    rng = np.random.default_rng(seed)
+    price = rng.normal(100, 15, rows).round(2)
+    price[::97] = 5000.0
+    return pd.DataFrame({
+        "CustomerID": rng.integers(0, rows // 3, rows),
+        "Price": price,
+        "Region": rng.choice(["north", "south", "east"], rows),
+        "Contact": [f"buyer{seed}_{i}@example.com" if i % 25 == 0 else f"Mary Jones{i % 7}" for i in range(rows)],
+    })
+
+@pytest.fixture
+def versions(tmp_path):
+    old, delta = make_orders(3000, 1), make_orders(1200, 2)
+    old.to_csv(tmp_path / "v1.csv", index=False)
+    delta.to_csv(tmp_path / "delta.csv", index=False)
+    pd.concat([old, delta]).to_csv(tmp_path / "v2.csv", index=False)
+    return tmp_path
+
+def test_delta_matches_full_run(versions):
+    streaming = StreamingVerifier(chunksize=1000)
+    incremental = IncrementalVerifier(streaming, VerificationStateStore(str(versions / "states")))
+    first = incremental.verify_file(str(versions / "v1.csv"), "orders", pii_mode="exhaustive")
+    updated = incremental.verify_delta(first["verificationId"], str(versions / "delta.csv"), "orders")
+    full = streaming.verify_file(str(versions / "v2.csv"), "orders v2", pii_mode="exhaustive")
+
+    assert updated["datasetHash"] == full["datasetHash"]
+    assert updated["details"]["incremental"] == {"previous_verification_id": first["verificationId"],
+                                                 "previous_rows": 3000, "delta_rows": 1200}
+    for key in ["rows", "columns", "size_kb"]:
+        assert updated["details"]["metadata"][key] == full["details"]["metadata"][key]
+    for key in ["missingValues", "missingRatio", "incorrectTypes", "duplicates"]:
+        assert updated["details"]["quality"][key] == full["details"]["quality"][key]
+    assert updated["details"]["pii_count"] == full["details"]["pii_count"]
+    assert abs(updated["details"]["quality"]["anomalies"] - full["details"]["quality"]["anomalies"]) <= 3
+    assert updated["details"]["bias"] == full["details"]["bias"]
+    assert updated["details"]["diversity"] == pytest.approx(full["details"]["diversity"], abs=0.02)
+    assert updated["verificationId"] != first["verificationId"]
+
+def test_frame_state_and_unknown_ids(versions, tmp_path):
+    store = VerificationStateStore(str(tmp_path / "states"))
+    incremental = IncrementalVerifier(StreamingVerifier(chunksize=1000), store)
+    df = pd.read_csv(versions / "v1.csv")
+    report = incremental.verify_frame(df, "orders")
+    assert store.load(report["verificationId"]).rows == len(df)
+    with pytest.raises(KeyError):
+        incremental.verify_delta("0123abcd", str(versions / "delta.csv"), "orders")
+    with pytest.raises(KeyError):
+        store.load("../etc/passwd")
+
+def test_verify_endpoint_accepts_appended_rows(versions, monkeypatch):
+    import server
+    stack = server.get_services()
+    incremental = IncrementalVerifier(stack.streaming_verifier, VerificationStateStore(str(versions / "server-states")))
+    monkeypatch.setattr(stack, "incremental_verifier", incremental)
+    client = server.app.test_client()
+
+    def upload(path, **fields):
+        with open(path, "rb") as f:
+            return client.post("/api/verify", data={"file": (f, path.name), **fields}, content_type="multipart/form-data")
+
+    first = upload(versions / "v1.csv", keep_state="true").get_json()
+    second = upload(versions / "delta.csv", previous_verification_id=first["verificationId"]).get_json()
+    assert second["details"]["incremental"]["delta_rows"] == 1200
+    assert second["verificationId"] not in (None, first["verificationId"])
+    assert upload(versions / "delta.csv", previous_verification_id="abc123").status_code == 404
+
+def test_frame_state_reuses_the_pii_scan(tmp_path, monkeypatch):
+    old, delta = make_orders(3000, 1), make_orders(1200, 2)
+    old["Contact"] = [f"Mary Jones{i}" if i % 2 else f"note {i}" for i in range(len(old))]
+    delta.to_csv(tmp_path / "delta.csv", index=False)
+    pd.concat([old, delta]).to_csv(tmp_path / "v2.csv", index=False)
+    streaming = StreamingVerifier(chunksize=1000)
+    incremental = IncrementalVerifier(streaming, VerificationStateStore(str(tmp_path / "states")))
+    pii_detection = streaming.verifier.pii_detection
+    scanned = []
+    original_scan_values = pii_detection.scan_values
+    monkeypatch.setattr(pii_detection, "scan_values",
+                        lambda values, col="": scanned.append(col) or original_scan_values(values, col))
+    report = incremental.verify_frame(old, "orders")
+    assert scanned == ["Contact"]  # once, by the verification itself
+    updated = incremental.verify_delta(report["verificationId"], str(tmp_path / "delta.csv"), "orders")
+    full = streaming.verify_file(str(tmp_path / "v2.csv"), "orders v2", pii_mode="exhaustive")
+    assert updated["details"]["pii_count"] == full["details"]["pii_count"] > 0
@@ -0,0 +1,70 @@
+import io
+import numpy as np
+import pandas as pd
+import pytest
+from src.ingest import load_frame, read_bytes, ingest_format, table_to_frame
+
+pa = pytest.importorskip("pyarrow")
+
+def sample_frame(rows=200):
+    rng = np.random.default_rng(7)
+    amount = rng.normal(100, 30, rows)
+    amount[::17] = np.nan
+    return pd.DataFrame({
+        "id": np.arange(rows),
+        "amount": amount,
+        "region": rng.choice(["north", "south", None], rows),
+        "flag": rng.choice([True, False], rows),
+        "signup_date": pd.date_range("2024-01-01", periods=rows).strftime("%Y-%m-%d"),
+        "empty": [None] * rows,
+    })
+
+def test_csv_matches_pandas_types_and_values(tmp_path):
+    path = tmp_path / "sample.csv"
+    sample_frame().to_csv(path, index=False)
+    expected = pd.read_csv(path, float_precision="round_trip")
+    df = load_frame(str(path))
+    assert df.dtypes.to_dict() == expected.dtypes.to_dict()
+    pd.testing.assert_frame_equal(df, expected)
+    # Missing text is NaN, as pandas reads it, and dates stay text
+    assert df["region"].isna().sum() == expected["region"].isna().sum()
+    assert all(value is np.nan or isinstance(value, str) for value in df["region"])
+    assert df["signup_date"].dtype == object
+    assert df["empty"].dtype == np.float64
+
+def test_upload_bytes_match_file_read(tmp_path):
+    path = tmp_path / "sample.jsonl"
+    sample_frame().drop(columns=["signup_date"]).to_json(path, orient="records", lines=True)
+    from_file = load_frame(str(path))
+    from_bytes = read_bytes(path.read_bytes(), "jsonl")
+    pd.testing.assert_frame_equal(from_file, from_bytes)
+    assert from_file["amount"].dtype == np.float64
+    assert from_file["id"].dtype == np.int64
+
+@pytest.mark.parametrize("extension", [".parquet", ".feather"])
+def test_columnar_formats_round_trip(tmp_path, extension):
+    df = sample_frame()
+    path = tmp_path / f"sample{extension}"
+    if extension == ".parquet":
+        df.to_parquet(path, index=False)
+    else:
+        df.to_feather(path)
+    loaded = load_frame(str(path))
+    assert list(loaded.columns) == list(df.columns)
+    np.testing.assert_array_equal(loaded["amount"].to_numpy(), df["amount"].to_numpy())
+    assert loaded["region"].isna().sum() == df["region"].isna().sum()
+    pd.testing.assert_frame_equal(read_bytes(path.read_bytes(), ingest_format(path)), loaded)
+
+def test_ragged_csv_falls_back_to_pandas():
+    # Arrow rejects short rows; pandas pads them with NaN
+    content = b"a,b,c\n1,2,3\n4,5\n"
+    assert read_bytes(content, "csv").equals(pd.read_csv(io.BytesIO(content)))
+
+def test_null_columns_become_float():
+    df = table_to_frame(pa.table({"x": pa.nulls(3), "y": pa.array(["a", None, "c"])}))
+    assert df["x"].dtype == np.float64
+    assert df["y"][1] is np.nan
+
+def test_unknown_extension_rejected():
+    with pytest.raises(ValueError):
+        ingest_format("data.txt")
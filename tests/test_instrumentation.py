@@ -0,0 +1,62 @@
+import time
+from src.instrumentation import Instrumentation, current, profile_call
+from src.metrics import MetricsRegistry
+from src.verifier import Verifier
+
+def test_stages_columns_and_counters():
+    instrumentation = Instrumentation()
+    with instrumentation.stage("quality"):
+        with current().column("a"):
+            time.sleep(0.01)
+        current().count("values", 3)
+    with instrumentation.stage("quality"):
+        current().count("values", 2)
+    # Outside a stage the checks record nothing
+    current().count("values", 100)
+    report = instrumentation.report()
+    assert report["stages"]["quality"]["calls"] == 2
+    assert report["stages"]["quality"]["wall_seconds"] >= 0.01
+    assert report["columns"]["quality"]["a"] >= 0.01
+    assert report["counters"] == {"values": 5}
+
+def test_merge_adds_worker_measurements():
+    worker = Instrumentation(trace_memory=True)
+    with worker.stage("pii"):
+        worker.count("pii_values_scanned", 4)
+        bytearray(1 << 20)
+    worker.close()
+    parent = Instrumentation().merge(worker.report())
+    assert parent.stages["pii"]["peak_bytes"] >= 1 << 20
+    assert parent.counters == {"pii_values_scanned": 4}
+
+def test_report_timings_only_when_instrumented(sales_df):
+    verifier = Verifier()
+    report = verifier.verify_dataset(sales_df, "sales")
+    assert "instrumentation" not in report["details"]
+    assert set(report["details"]["timings"]) >= {"profile", "quality", "pii", "hash", "total"}
+
+    instrumentation = Instrumentation()
+    report = verifier.verify_dataset(sales_df, "sales", instrumentation=instrumentation)
+    measured = report["details"]["instrumentation"]
+    assert measured["counters"]["rows"] == len(sales_df)
+    assert set(measured["columns"]["profile"]) == set(map(str, sales_df.columns))
+
+def test_profile_call_returns_result_and_report():
+    result, text = profile_call(lambda: sum(range(1000)))
+    assert result == sum(range(1000))
+    assert "function calls" in text
+
+def test_metrics_render_prometheus_text():
+    registry = MetricsRegistry()
+    registry.describe("jobs_total", "counter", "Jobs.")
+    registry.describe("latency_seconds", "histogram", "Latency.", buckets=[0.1, 1])
+    registry.inc("jobs_total", mode='a"b')
+    registry.observe("latency_seconds", 0.5)
+    registry.observe("latency_seconds", 5)
+    lines = registry.render().splitlines()
+    assert "# TYPE jobs_total counter" in lines
+    assert 'jobs_total{mode="a\\"b"} 1' in lines
+    assert 'latency_seconds_bucket{le="0.1"} 0' in lines
+    assert 'latency_seconds_bucket{le="1"} 1' in lines
+    assert 'latency_seconds_bucket{le="+Inf"} 2' in lines
+    assert "latency_seconds_count 2" in lines
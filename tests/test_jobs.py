@@ -0,0 +1,155 @@
+import io
+import threading
+import time
+import pytest
+from src.jobs import JobQueue, JobStore, QueueFull
+
+def wait_for(queue, job_id, statuses=("done", "failed", "cancelled"), timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = queue.status(job_id)
+        if job["status"] in statuses:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} stuck in {job['status']}")
+
+def test_job_runs_and_reports_progress():
+    queue = JobQueue(workers=1)
+    seen = []
+
+    def work(progress, value):
+        for step in range(3):
+            progress("step", step, 3)
+            seen.append(step)
+        return {"value": value}
+
+    job = wait_for(queue, queue.submit(work, 7))
+    assert job["status"] == "done" and job["result"] == {"value": 7}
+    assert (job["stage"], job["done"], job["total"]) == ("step", 2, 3)
+    assert seen == [0, 1, 2]
+
+def test_failures_are_recorded():
+    queue = JobQueue(workers=1)
+
+    def work(progress):
+        raise ValueError("bad file")
+
+    job = wait_for(queue, queue.submit(work))
+    assert job["status"] == "failed" and job["error"] == "bad file"
+
+def test_backpressure_and_cancellation():
+    queue = JobQueue(JobStore(), workers=1, max_pending=2)
+    started, release = threading.Event(), threading.Event()
+
+    def blocking(progress):
+        started.set()
+        release.wait(10)
+        progress("after-wait")
+        return {}
+
+    running = queue.submit(blocking)
+    started.wait(10)
+    queued = queue.submit(blocking)
+    with pytest.raises(QueueFull):
+        queue.submit(blocking)
+
+    assert queue.cancel(queued)
+    assert queue.status(queued)["status"] == "cancelled"
+    assert queue.cancel(running)
+    release.set()
+    assert wait_for(queue, running)["status"] == "cancelled"
+    assert not queue.cancel(running)
+    deadline = time.time() + 10
+    while queue.pending and time.time() < deadline:
+        time.sleep(0.01)
+    assert queue.pending == 0
+    queue.submit(blocking)
+
+def test_shutdown_waits_for_running_jobs_and_fails_queued_ones():
+    queue = JobQueue(workers=1)
+    started = threading.Event()
+
+    def slow(progress):
+        started.set()
+        time.sleep(0.2)
+        return {"finished": True}
+
+    running = queue.submit(slow)
+    started.wait(10)
+    queued = queue.submit(slow)
+    assert queue.shutdown(timeout=10)
+    assert queue.status(running)["result"] == {"finished": True}
+    assert queue.status(queued)["status"] == "failed"
+    assert queue.pending == 0
+    with pytest.raises(QueueFull):
+        queue.submit(slow)
+
+def test_async_verify_endpoint(sales_df):
+    import server
+    client = server.app.test_client()
+    body = sales_df.to_csv(index=False).encode()
+    response = client.post("/api/verify", data={"file": (io.BytesIO(body), "sales.csv"), "async": "true"},
+                           content_type="multipart/form-data")
+    assert response.status_code == 202
+    job_id = response.get_json()["jobId"]
+    wait_for(server.get_services().job_queue, job_id)
+    status = client.get(f"/api/verify/{job_id}").get_json()
+    assert status["status"] == "done"
+    assert status["progress"] == {"stage": "bias", "done": 3, "total": 4}
+    assert status["result"]["datasetHash"].startswith("0x")
+    assert client.delete(f"/api/verify/{job_id}").status_code == 409
+    assert client.get("/api/verify/missing").status_code == 404
+
+def test_cleanup_runs_even_for_jobs_that_never_start():
+    def blocked_queue(cleaned):
+        queue = JobQueue(workers=1)
+        started, release = threading.Event(), threading.Event()
+
+        def blocking(progress):
+            started.set()
+            release.wait(10)
+            return {}
+
+        queue.submit(blocking, cleanup=lambda: cleaned.append("running"))
+        started.wait(10)
+        cancelled = queue.submit(blocking, cleanup=lambda: cleaned.append("cancelled"))
+        assert queue.cancel(cancelled)
+        return queue, release
+
+    # A job cancelled while queued is cleaned up when a worker dequeues it
+    cleaned = []
+    queue, release = blocked_queue(cleaned)
+    release.set()
+    deadline = time.time() + 10
+    while queue.pending and time.time() < deadline:
+        time.sleep(0.01)
+    assert sorted(cleaned) == ["cancelled", "running"]
+
+    # Queued jobs failed at shutdown are cleaned up too
+    cleaned = []
+    queue, release = blocked_queue(cleaned)
+    queued = queue.submit(lambda progress: {}, cleanup=lambda: cleaned.append("queued"))
+    threading.Timer(0.2, release.set).start()
+    assert queue.shutdown(timeout=10)
+    assert queue.status(queued)["status"] == "failed"
+    assert sorted(cleaned) == ["cancelled", "queued", "running"]
+
+def test_jobs_still_running_after_the_shutdown_timeout_are_failed_and_cleaned_up():
+    queue = JobQueue(workers=1)
+    started, release = threading.Event(), threading.Event()
+    cleaned = []
+
+    def stuck(progress):
+        started.set()
+        release.wait(10)
+        return {}
+
+    job_id = queue.submit(stuck, cleanup=lambda: cleaned.append(job_id))
+    started.wait(10)
+    assert not queue.shutdown(timeout=0.1)
+    job = queue.status(job_id)
+    assert job["status"] == "failed" and "shut down" in job["error"]
+    assert cleaned == [job_id]
+    release.set()
+    queue._threads[0].join(10)
+    assert cleaned == [job_id]
@@ -0,0 +1,33 @@
+import os
+import subprocess
+import sys
+import spacy
+from src.models import ModelRegistry, PII_EXCLUDE, models
+from src.pii_detection import PIIDetection
+from src.relevance_check import RelevanceCheck
+
+def test_registry_loads_each_pipeline_once(monkeypatch):
+    calls = []
+    monkeypatch.setattr(spacy, "load", lambda name, exclude=(): calls.append((name, exclude)) or spacy.blank("en"))
+    registry = ModelRegistry()
+    first = registry.pipeline("en_core_web_sm", PII_EXCLUDE)
+    assert registry.pipeline("en_core_web_sm", list(reversed(PII_EXCLUDE))) is first
+    assert calls == [("en_core_web_sm", PII_EXCLUDE)]
+    assert registry.loaded() == ["en_core_web_sm"]
+
+def test_checks_share_the_pipeline_and_load_it_lazily(monkeypatch):
+    calls = []
+    monkeypatch.setattr(spacy, "load", lambda *args, **kwargs: calls.append(args) or spacy.blank("en"))
+    first, second = PIIDetection(), PIIDetection()
+    RelevanceCheck()
+    assert calls == []
+    assert first.nlp is second.nlp
+    assert len(calls) == 1
+
+def test_server_import_skips_heavy_modules():
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    code = ("import sys, server; "
+            "print(sorted(m for m in ['pandas', 'scipy', 'spacy', 'src.verifier'] if m in sys.modules))")
+    env = dict(os.environ, SPACY_MODEL_DOWNLOAD="0")
+    output = subprocess.run([sys.executable, "-c", code], cwd=root, env=env, capture_output=True, text=True, check=True)
+    assert output.stdout.strip().splitlines()[-1] == "[]"
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+from src.near_duplicates import DatasetSignature, NearDuplicateCheck, NearDuplicateIndex
+from src.verifier import Verifier
+
+def make_frame(rows=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "id": np.arange(rows) + seed * rows,
+        "amount": rng.lognormal(3, 1, rows).round(2),
+        "city": rng.choice(["Pune", "Oslo", "Lima", "Kyiv"], rows),
+    })
+
+def signatures(df):
+    return DatasetSignature().update(df).signatures()
+
+def test_chunked_signature_matches_whole_frame():
+    df = make_frame()
+    chunked = DatasetSignature()
+    for start in range(0, len(df), 300):
+        chunked.update(df.iloc[start:start + 300])
+    for kind, signature in signatures(df).items():
+        assert (chunked.signatures()[kind] == signature).all()
+
+def test_index_finds_modified_copies_only():
+    original = make_frame()
+    shuffled = original.sample(frac=1, random_state=1).reset_index(drop=True)
+    extra_column = original.assign(channel=np.where(original["id"] % 3 == 0, "web", "store"))
+    edited = original.copy()
+    edited.loc[:40, "amount"] = -1.0
+    check = NearDuplicateCheck(NearDuplicateIndex(), min_similarity=0.5)
+    assert check.check_near_duplicates("0xorig", "orig", signatures(original))["matches"] == []
+    assert len(check.index) == 0
+    assert check.register("0xorig", "orig") and len(check.index) == 1
+
+    for dataset_id, df, kind in [("0xshuffled", shuffled, "rows"), ("0xextra", extra_column, "values"),
+                                 ("0xedited", edited, "rows")]:
+        result = NearDuplicateCheck(check.index).index.query(signatures(df), exclude=dataset_id)
+        match = next(match for match in result if match["datasetHash"] == "0xorig")
+        assert match[kind] > 0.85, (dataset_id, match)
+
+    unrelated = check.index.query(signatures(make_frame(seed=5)))
+    assert unrelated == []
+
+def test_verifier_reports_near_duplicates(sales_df):
+    verifier = Verifier()
+    first = verifier.verify_dataset(sales_df, "sales")
+    reversed_df = sales_df.iloc[::-1].reset_index(drop=True)
+    # Unpublished datasets are never reported as near duplicates
+    assert verifier.verify_dataset(reversed_df, "sales reversed")["details"]["near_duplicates"]["matches"] == []
+    verifier.register(first, "sales")
+    second = verifier.verify_dataset(reversed_df, "sales reversed")
+    assert first["details"]["near_duplicates"]["matches"] == []
+    match = second["details"]["near_duplicates"]["matches"][0]
+    assert match["datasetHash"] == first["datasetHash"] and match["name"] == "sales"
+    assert second["details"]["near_duplicates"]["similarity"] == 1.0
@@ -0,0 +1,32 @@
+import pandas as pd
+from src.verifier import Verifier
+from src.column_profile import profile_columns
+from src.parallel import SharedFrame
+
+def test_shared_frame_round_trip(sales_df):
+    profiles = profile_columns(sales_df)
+    frame = SharedFrame(sales_df, profiles)
+    try:
+        df, shared_profiles, shm = frame.attach()
+        pd.testing.assert_frame_equal(df, sales_df)
+        assert not df["CustomerID"].to_numpy().flags.writeable
+        assert shared_profiles["Contact"]._series is not None
+        assert shared_profiles["Price"].mean == profiles["Price"].mean
+        assert shared_profiles["Product"].top_frequency == profiles["Product"].top_frequency
+        df = shared_profiles = None
+        shm.close()
+    finally:
+        frame.unlink()
+
+def test_process_executor_matches_sequential(sales_df):
+    sequential = Verifier().verify_dataset(sales_df, "faulty_sales")
+    verifier = Verifier(executor="process", max_workers=2)
+    try:
+        parallel = verifier.verify_dataset(sales_df, "faulty_sales")
+    finally:
+        verifier.close()
+    sequential_timings = sequential["details"].pop("timings")
+    parallel_timings = parallel["details"].pop("timings")
+    assert parallel == sequential
+    assert {"quality", "pii", "relevance", "bias", "hash", "total"} <= set(parallel_timings)
+    assert "profile" in sequential_timings and "share" in parallel_timings
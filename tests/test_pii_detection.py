@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.pii_detection import PIIDetection, _prescreen_python, prescreen
+
+def _people_frame():
+    return pd.DataFrame({
+        "contact": ["John Smith", "mary@example.com", "John Smith", "Linda Brown",
+                    "John Smith said hello there", "ok", "12345", None] * 3 + [f"note {i}" for i in range(10)],
+    })
+
+def test_detect_pii_counts_distinct_values():
+    detected, count = PIIDetection().detect_pii(_people_frame())
+    assert detected
+    assert count == 3  # John Smith, Linda Brown, mary@example.com
+
+def test_hits_map_back_to_every_row():
+    df = _people_frame()
+    matches = PIIDetection().find_pii(df)
+    assert matches["contact"]["John Smith"] == [0, 2, 8, 10, 16, 18]
+    assert matches["contact"]["mary@example.com"] == [1, 9, 17]
+
+def test_only_short_non_email_values_reach_the_model(monkeypatch):
+    detector = PIIDetection(batch_size=2)
+    seen = []
+    original_pipe = detector.nlp.pipe
+
+    def recording_pipe(texts, **kwargs):
+        texts = list(texts)
+        seen.extend(texts)
+        assert kwargs["batch_size"] == 2
+        return original_pipe(texts, **kwargs)
+
+    monkeypatch.setattr(detector.nlp, "pipe", recording_pipe)
+    detector.scan_values(["John Smith", "John Smith said hello there", "a@b.io", "ab", "42", "short-id"])
+    assert seen == ["John Smith"]
+
+def test_numeric_and_low_cardinality_columns_are_skipped(sales_df):
+    matches = PIIDetection().find_pii(sales_df)
+    assert "Price" not in matches and "Product" not in matches
+    assert set(matches) == {"Contact"}
+
+def _large_frame(rows=20000):
+    names = [f"John {chr(65 + i % 26)}{'abcdefgh'[i % 8]}{'ijklmnop'[(i // 8) % 8]}{i // 64}" for i in range(rows)]
+    return pd.DataFrame({
+        "who": [name if i % 3 == 0 else f"plain note number {i}" for i, name in enumerate(names)],
+        "note": [f"ordinary text entry number {i}" for i in range(rows)],
+    })
+
+def test_sampled_scan_confirms_and_rules_out_early():
+    result = PIIDetection(random_state=0).scan(_large_frame(), mode="sampled")
+    assert result["mode"] == "sampled"
+    assert result["pii_detected"]
+    who, note = result["columns"]["who"], result["columns"]["note"]
+    assert who["stopped"] == "confirmed" and who["sampled"] < who["distinct"]
+    assert note["stopped"] == "ruled_out" and note["hits"] == 0
+    low, high = result["pii_count_interval"]
+    assert low <= result["pii_count"] <= high
+
+def test_sampled_scan_is_exact_when_the_sample_covers_the_column():
+    df = _people_frame()
+    sampled = PIIDetection(random_state=0).scan(df, mode="sampled")
+    exhaustive = PIIDetection().scan(df)
+    assert exhaustive["mode"] == "exhaustive"
+    assert sampled["pii_count"] == exhaustive["pii_count"] == 3
+    assert sampled["pii_count_interval"] == [3, 3]
+
+def test_unknown_scan_mode_is_rejected():
+    with pytest.raises(ValueError):
+        PIIDetection().scan(_people_frame(), mode="fast")
+
+def test_prescreen_masks_match_the_per_value_rules():
+    values = ["", "nan", "NaN", "12345", "ab", "short-id", "abc\n", "a@b.io", "write to a@b.io today",
+              "éa@b.co", "John Smith", "John  Smith", "three word value", "Zoë Brown", "²³⁴", "x\x1cy z"]
+    skip, email, needs_ner = prescreen(values)
+    expected = [np.zeros(len(values), dtype=bool) for _ in range(3)]
+    _prescreen_python(np.asarray(values, dtype=object), *expected)
+    assert skip.tolist() == expected[0].tolist()
+    assert email.tolist() == expected[1].tolist()
+    assert needs_ner.tolist() == expected[2].tolist()
+    assert [v for v, hit in zip(values, email) if hit] == ["a@b.io", "write to a@b.io today"]
+    assert [v for v, hit in zip(values, needs_ner) if hit] == ["éa@b.co", "John Smith", "John  Smith", "Zoë Brown"]
+
+def test_sampling_an_empty_sample_does_not_divide_by_zero():
+    result = PIIDetection()._sample_column(np.array([], dtype=object), "c", np.random.default_rng(0), 1.96, population=3)
+    assert result["sampled"] == 0 and result["estimate"] == 0.0
+    assert result["interval"] == [0.0, 3.0]
@@ -0,0 +1,38 @@
+import io
+from src.result_cache import ResultCache, cache_key
+
+def test_lru_evicts_by_size():
+    cache = ResultCache(max_bytes=40)
+    cache.put("a", {"v": "x" * 10})
+    cache.put("b", {"v": "y" * 10})
+    assert cache.get("a") == {"v": "x" * 10}
+    cache.put("c", {"v": "z" * 10})
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    stats = cache.stats()
+    assert stats["evictions"] == 1 and stats["bytes"] <= 40
+    assert (stats["memory_hits"], stats["misses"]) == (3, 1)
+
+def test_disk_tier_survives_restart(tmp_path):
+    path = str(tmp_path / "results.db")
+    ResultCache(path=path).put("k", {"score": 1.5})
+    cache = ResultCache(path=path)
+    assert cache.get("k") == {"score": 1.5}
+    assert cache.get("k") == {"score": 1.5}
+    assert (cache.stats()["disk_hits"], cache.stats()["memory_hits"]) == (1, 1)
+
+def test_key_depends_on_name_and_version():
+    keys = {cache_key("h", "a", "v1"), cache_key("h", "b", "v1"), cache_key("h", "a", "v2"), cache_key("h", "a", "v1", "sampled")}
+    assert len(keys) == 4
+
+def test_repeated_upload_is_served_from_cache(sales_df):
+    import server
+    client = server.app.test_client()
+    body = sales_df.to_csv(index=False).encode()
+    before = client.get("/api/cache/stats").get_json()
+    first = client.post("/api/verify", data={"file": (io.BytesIO(body), "cached.csv")}, content_type="multipart/form-data")
+    second = client.post("/api/verify", data={"file": (io.BytesIO(body), "cached.csv")}, content_type="multipart/form-data")
+    after = client.get("/api/cache/stats").get_json()
+    assert first.get_json() == second.get_json()
+    assert after["misses"] - before["misses"] == 1
+    assert after["hits"] - before["hits"] == 1
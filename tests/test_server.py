@@ -0,0 +1,85 @@
+import io
+import os
+import time
+import server
+
+def test_oversized_upload_is_rejected(monkeypatch):
+    monkeypatch.setitem(server.app.config, "MAX_CONTENT_LENGTH", 1024)
+    client = server.app.test_client()
+    response = client.post("/api/verify", data={"file": (io.BytesIO(b"a,b\n" + b"1,2\n" * 1000), "big.csv")},
+                           content_type="multipart/form-data")
+    assert response.status_code == 413
+    assert "limit" in response.get_json()["error"]
+
+def test_shutdown_drains_the_job_queue():
+    stack = server.get_services()
+    server.shutdown(timeout=5)
+    assert not any(thread.is_alive() for thread in stack.job_queue._threads)
+    # The next request in this process builds fresh state
+    server.services = None
+
+def test_uploads_are_spooled_and_cleaned_up(sales_df, tmp_path, monkeypatch):
+    monkeypatch.setattr(server, "UPLOAD_DIR", str(tmp_path))
+    client = server.app.test_client()
+    body = sales_df.to_csv(index=False).encode()
+    response = client.post("/api/verify", data={"file": (io.BytesIO(body), "spooled.csv")},
+                           content_type="multipart/form-data")
+    assert response.status_code == 200
+    assert os.listdir(tmp_path) == []
+
+    response = client.post("/api/verify", data={"file": (io.BytesIO(body), "spooled.csv"), "name": "async-spool",
+                                                "async": "true"}, content_type="multipart/form-data")
+    job_id = response.get_json()["jobId"]
+    deadline = time.time() + 30
+    while client.get(f"/api/verify/{job_id}").get_json()["status"] != "done" and time.time() < deadline:
+        time.sleep(0.05)
+    assert client.get(f"/api/verify/{job_id}").get_json()["status"] == "done"
+    assert os.listdir(tmp_path) == []
+
+def test_timings_option_and_metrics_endpoint(sales_df):
+    client = server.app.test_client()
+    body = sales_df.to_csv(index=False).encode()
+    response = client.post("/api/verify", data={"file": (io.BytesIO(body), "timed.csv"), "timings": "true"},
+                           content_type="multipart/form-data")
+    timings = response.get_json()["timings"]
+    assert timings["counters"]["rows"] == len(sales_df)
+    assert timings["total"] > 0
+
+    response = client.post("/api/verify", data={"file": (io.BytesIO(body), "timed.csv"), "profile": "cprofile"},
+                           content_type="multipart/form-data")
+    assert response.status_code == 403
+
+    text = client.get("/metrics").get_data(as_text=True)
+    assert 'verifier_verifications_total{mode="in_memory"}' in text
+    assert 'verifier_stage_seconds_count{stage="pii"}' in text
+    assert "verifier_jobs_pending" in text
+
+def test_anomaly_curves_endpoint(sales_df):
+    client = server.app.test_client()
+    body = sales_df.to_csv(index=False).encode()
+    response = client.post("/api/anomaly-curves", data={"file": (io.BytesIO(body), "sales.csv"),
+                                                         "iqr_multipliers": "1,4"}, content_type="multipart/form-data")
+    curves = response.get_json()["columns"]
+    assert curves["Price"]["iqr_multipliers"] == [1.0, 4.0]
+    assert curves["Price"]["range"][0] >= curves["Price"]["range"][1] > 0
+    response = client.post("/api/anomaly-curves", data={"file": (io.BytesIO(body), "sales.csv"),
+                                                         "z_thresholds": "-1"}, content_type="multipart/form-data")
+    assert response.status_code == 400
+    response = client.post("/api/anomaly-curves", data={"file": (io.BytesIO(b"not a parquet file"), "sales.parquet")},
+                           content_type="multipart/form-data")
+    assert response.status_code == 400
+    assert "Could not parse" in response.get_json()["error"]
+
+def test_registering_retires_cached_reports(sales_df):
+    client = server.app.test_client()
+
+    def upload(df, name, **fields):
+        data = {"file": (io.BytesIO(df.to_csv(index=False).encode()), f"{name}.csv"), "name": name, **fields}
+        return client.post("/api/verify", data=data, content_type="multipart/form-data").get_json()
+
+    reversed_df = sales_df.iloc[::-1].reset_index(drop=True)
+    assert upload(reversed_df, "reversed")["details"]["nearDuplicates"]["matches"] == []
+    original = upload(sales_df, "original", register="true")
+    # The same upload is answered again, now listing the dataset registered in between
+    matches = upload(reversed_df, "reversed")["details"]["nearDuplicates"]["matches"]
+    assert [match["datasetHash"] for match in matches] == [original["datasetHash"]]
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+from scipy.stats import skew
+from src.sketches import (HyperLogLog, TDigest, Moments, TopCounter, DistinctSample, DuplicateCounter, count_repeats,
+                          row_keys, value_keys)
+
+def test_hyperloglog_estimates_and_merges():
+    values = pd.Series(np.arange(50000) % 20000)
+    left, right = HyperLogLog(), HyperLogLog()
+    left.update(values[:25000])
+    right.update(values[25000:])
+    assert abs(left.merge(right).estimate() - 20000) / 20000 < 0.03
+    small = HyperLogLog().update(pd.Series([1, 2, 2, 1]))
+    assert round(small.estimate()) == 2
+
+def test_tdigest_quantiles_and_tails():
+    values = np.random.default_rng(0).standard_t(3, 200000)
+    digest = TDigest()
+    for chunk in np.array_split(values, 7):
+        digest.update(chunk)
+    assert digest.count == len(values)
+    np.testing.assert_allclose(digest.quantile([0.25, 0.5, 0.75]), np.quantile(values, [0.25, 0.5, 0.75]), atol=0.01)
+    assert abs(digest.cdf(-8) - (values < -8).mean()) < 2e-4
+
+def test_moments_merge_matches_numpy():
+    values = np.random.default_rng(1).lognormal(size=10000)
+    moments = Moments()
+    for chunk in np.array_split(values, 5):
+        moments.update(chunk)
+    assert np.isclose(moments.mean, values.mean())
+    assert np.isclose(moments.std, pd.Series(values).std())
+    assert np.isclose(moments.skew, skew(values))
+
+def test_top_counter_and_distinct_sample():
+    counter = TopCounter(capacity=3)
+    counter.update(pd.Series(list("aaaabbbcdef")))
+    assert counter.top_frequency() == 4
+    assert len(counter.counts) == 3
+    sample = DistinctSample(size=10)
+    sample.update(pd.Series([f"v{i % 40}" for i in range(400)]))
+    assert len(sample.values) == 10 and len(set(sample.values)) == 10
+
+def test_row_keys_count_the_duplicates_pandas_counts():
+    df = pd.DataFrame({
+        "id": np.array([2**53, 2**53 + 1, 2**53, 7, 7, 7, 8, 9], dtype=np.int64),
+        "score": [0.0, -0.0, 0.0, np.nan, -np.nan, np.nan, 1.5, 1.5],
+        "mixed": [1, "1", 1, None, np.nan, None, "a", "a"],
+        "label": ["x", "x", "x", None, None, None, "nan", np.nan],
+    })
+    assert count_repeats(row_keys(df)) == df.duplicated().sum() == 3
+    for col in df:
+        assert count_repeats(value_keys(df[col], distinct_nulls=True)) == df[col].duplicated().sum()
+        assert count_repeats(row_keys(df[[col]])) == df[[col]].duplicated().sum()
+
+def test_duplicate_counter_exact_and_approximate():
+    keys = np.random.default_rng(3).integers(0, 2**64 - 1, 60000, dtype=np.uint64)
+    keys = np.concatenate([keys, keys[:15000]])
+    exact, approximate = DuplicateCounter(), DuplicateCounter(approximate=True)
+    other_exact, other_approximate = DuplicateCounter(), DuplicateCounter(approximate=True)
+    exact.update(keys[:40000]), other_exact.update(keys[40000:])
+    approximate.update(keys[:40000]), other_approximate.update(keys[40000:])
+    assert exact.merge(other_exact).count() == 15000 and exact.error() == 0
+    approximate.merge(other_approximate)
+    assert abs(approximate.count() - 15000) <= approximate.error()
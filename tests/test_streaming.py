@@ -0,0 +1,84 @@
+import io
+import numpy as np
+import pandas as pd
+from src.ingest import load_frame
+from src.verifier import Verifier
+from src.streaming import StreamingVerifier, DatasetAccumulator
+
+def _write_csv(df, path):
+    df.to_csv(path, index=False)
+    return load_frame(str(path))
+
+def test_streaming_report_matches_in_memory_report(sales_df, tmp_path):
+    path = tmp_path / "sales.csv"
+    df = _write_csv(sales_df, path)
+    verifier = Verifier()
+    full = verifier.verify_dataset(df, "faulty_sales")
+    streamed = StreamingVerifier(verifier, chunksize=50).verify_file(str(path), "faulty_sales", pii_mode="exhaustive")
+    assert streamed["details"]["quality"] == full["details"]["quality"]
+    assert streamed["details"]["pii_count"] == full["details"]["pii_count"]
+    assert streamed["details"]["relevance"] == full["details"]["relevance"]
+    assert streamed["details"]["metadata"]["rows"] == len(df)
+    assert set(streamed) == set(full)
+
+def test_streaming_fingerprint_matches_for_type_stable_columns(tmp_path):
+    rng = np.random.default_rng(4)
+    df = pd.DataFrame({"id": np.arange(500), "score": rng.normal(size=500), "team": rng.choice(["x", "y"], 500)})
+    path = tmp_path / "scores.csv"
+    df = _write_csv(df, path)
+    full = Verifier().verify_dataset(df, "scores")
+    streamed = StreamingVerifier(chunksize=64).verify_file(str(path), "scores")
+    assert streamed["datasetHash"] == full["datasetHash"]
+    assert streamed["details"]["metadata"]["size_kb"] == full["details"]["metadata"]["size_kb"]
+
+def test_streaming_json_lines_from_buffer(tmp_path):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"Amount": rng.lognormal(3, 1, 3000), "V1": rng.normal(size=3000), "Class": rng.integers(0, 2, 3000)})
+    buffer = io.BytesIO(df.to_json(orient="records", lines=True).encode())
+    report = StreamingVerifier(chunksize=700).verify_file(buffer, "creditcard", file_format="jsonl")
+    assert report["details"]["metadata"]["rows"] == 3000
+    assert report["details"]["relevance"] == "Fraud Detection"
+    assert report["details"]["pii_scan"]["mode"] == "sampled"
+
+def test_single_pass_estimates_are_close(tmp_path):
+    rng = np.random.default_rng(3)
+    price = rng.normal(100, 10, 20000)
+    price[:100] = 10000
+    df = pd.DataFrame({"price": price})
+    exact = StreamingVerifier(chunksize=4000).verify_file(io.BytesIO(df.to_csv(index=False).encode()), "p", "csv")
+    verifier = StreamingVerifier(chunksize=4000, exact_counts=False)
+    state = DatasetAccumulator()
+    for start in range(0, len(df), 4000):
+        state.update(df.iloc[start:start + 4000])
+    estimated = verifier.verify_state(state, "p")
+    assert exact["details"]["quality"]["anomalies"] == 200
+    assert abs(estimated["details"]["quality"]["anomalies"] - 200) <= 30
+
+def test_approximate_duplicates_are_within_their_error_bound():
+    from src.synthetic import make_faulty_sales
+    df = make_faulty_sales(40000)
+    buffer = io.BytesIO(df.to_csv(index=False).encode())
+    exact = StreamingVerifier(chunksize=5000).verify_file(buffer, "faulty_sales", "csv")["details"]["quality"]
+    buffer.seek(0)
+    approximate = StreamingVerifier(chunksize=5000, approximate_duplicates=True).verify_file(
+        buffer, "faulty_sales", "csv")["details"]["quality"]
+    assert "duplicatesError" not in exact
+    assert 0 < approximate["duplicatesError"] < 0.1 * len(df)
+    assert abs(approximate["duplicates"] - exact["duplicates"]) <= approximate["duplicatesError"]
+
+def test_text_in_a_numeric_column_after_the_first_chunk():
+    rows = [f"{i},{i * 1.5}" for i in range(300)] + ["abc,oops"] + [f"{i},2.5" for i in range(300, 400)]
+    buffer = io.BytesIO(("n,price\n" + "\n".join(rows) + "\n").encode())
+    report = StreamingVerifier(chunksize=100).verify_file(buffer, "mixed", file_format="csv")
+    assert report["details"]["metadata"]["rows"] == 401
+    assert report["details"]["quality"]["anomalies"] >= 2  # "abc" and "oops"
+    assert report["datasetHash"].startswith("0x")
+
+def test_sampled_pii_scan_of_a_non_text_candidate_column():
+    buffer = io.BytesIO(("flag,x\n" + "".join(f"{i % 2 == 0},{i}\n" for i in range(10))).encode())
+    verifier = StreamingVerifier()
+    state = verifier.accumulate(buffer, "csv")
+    pii_scan = verifier.pii_scan(state, state.profiles())
+    assert pii_scan["mode"] == "sampled" and pii_scan["pii_count"] == 0
+    assert pii_scan["columns"]["flag"]["sampled"] == 2
+    assert verifier.verify_file(buffer, "flags", file_format="csv")["details"]["pii_count"] == 0
@@ -0,0 +1,25 @@
+import hashlib
+import os
+from src.uploads import HashingSpool
+
+def test_spool_hashes_what_is_written(tmp_path):
+    spool = HashingSpool(str(tmp_path))
+    chunks = [b"a,b\n", b"1,2\n" * 1000, b"3,4\n"]
+    for chunk in chunks:
+        spool.write(chunk)
+    spool.seek(0)
+    assert spool.read() == b"".join(chunks)
+    assert spool.hexdigest() == hashlib.sha256(b"".join(chunks)).hexdigest()
+    assert spool.size == sum(map(len, chunks))
+    spool.close()
+    assert os.listdir(tmp_path) == []
+
+def test_kept_spool_survives_close(tmp_path):
+    spool = HashingSpool(str(tmp_path))
+    spool.write(b"x")
+    path = spool.keep()
+    spool.close()
+    with open(path, "rb") as f:
+        assert f.read() == b"x"
+    spool.remove()
+    assert not os.path.exists(path)
@@ -1,9 +1,30 @@
 import pytest
-from src.verifier import DatasetVerifier
+from src.synthetic import DATASETS, make_dataset
+from src.verifier import Verifier
 
-def test_verifier():
-    verifier = DatasetVerifier()
-    report = verifier.verify_dataset("data/input/sample1.csv", "Finance")
+def test_verifier(sales_df):
+    verifier = Verifier()
+    report = verifier.verify_dataset(sales_df, "Finance")
     assert report["qualityScore"] >= 0
     assert isinstance(report["datasetHash"], str)
-    assert isinstance(report["verificationHash"], str)
\ No newline at end of file
+    assert isinstance(report["verificationHash"], str)
+
+@pytest.mark.parametrize("name, relevance", [("creditcard", "Fraud Detection"),
+                                             ("student_depression", "Health"),
+                                             ("faulty_sales", "Sales")])
+def test_synthetic_reference_datasets(name, relevance):
+    report = Verifier().verify_dataset(make_dataset(name, 5000), name)
+    assert report["details"]["relevance"] == relevance
+    # Only the dirty sales export fails verification
+    assert report["isVerified"] == (name != "faulty_sales")
+
+def test_synthetic_datasets_are_reproducible():
+    for name in DATASETS:
+        first, second = make_dataset(name, 1000), make_dataset(name, 1000)
+        assert len(first) == 1000
+        assert first.equals(second)
+    sales = make_dataset("faulty_sales", 1000)
+    assert sales.duplicated().sum() > 0
+    assert (sales["Price"] == "abc").any()
+    with pytest.raises(ValueError):
+        make_dataset("unknown", 10)
@@ -0,0 +1,18 @@
+"""WSGI entry point for production: gunicorn -c gunicorn.conf.py wsgi:app
+
+With preload_app (the default in gunicorn.conf.py) this module is imported
+once in the gunicorn master. The verifier modules and the spaCy pipeline
+are loaded here, before the workers are forked, so every worker shares
+those pages copy-on-write instead of loading its own copy.
+"""
+import gc
+import os
+import server
+
+if os.environ.get('PRELOAD_MODELS', '1').lower() not in ('0', 'false', 'no'):
+    server.preload()
+    # Objects loaded so far live for the whole process; keeping the collector off them
+    # stops it from touching (and so copying) the shared pages in every worker
+    gc.freeze()
+
+app = server.app